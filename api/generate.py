@@ -1,208 +1,308 @@
-import cgi
-import io
+import base64
 import json
+import os
 import sys
 import tempfile
-import zipfile
-from datetime import datetime
+import re
+import time
+from dataclasses import replace
+from functools import lru_cache
 from http.server import BaseHTTPRequestHandler
 from pathlib import Path
+from typing import Callable
+from urllib.parse import parse_qs, urlsplit
 
 ROOT = Path(__file__).resolve().parents[1]
-sys.path.insert(0, str(ROOT))
-sys.path.insert(0, str(ROOT / "generateur_questionnaire"))
-sys.path.insert(0, str(ROOT / "attestations_formation"))
+for _path in (ROOT, ROOT / "generateur_questionnaire", ROOT / "attestations_formation"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
 
-from generateur_feuilles import create_presence_sheet  # noqa: E402
-from questionnaire_core import QuestionnaireData, render_questionnaire, split_full_name  # noqa: E402
-from app.config import get_settings  # noqa: E402
-from app.generate_attestation import generate_attestation  # noqa: E402
-from app.utils import map_to_attestation_fields, sanitize_filename  # noqa: E402
+from documents_formation import (DOCUMENT_TYPES, TrainingSession, build_archive_parts,  # noqa: E402
+                                 session_fingerprint, session_from_payload)
+from multipart_form import MultipartError, UploadLimits, parse_multipart  # noqa: E402
 
+# reportlab, pypdf and pydantic-settings are only imported by the POST path, so
+# health checks and cold starts don't pay for them. The caches below live for
+# the lifetime of the worker process and are reused by every later invocation.
 
-def _extract_lines(value: str) -> list[str]:
-    tokens = [item.strip() for item in value.replace(",", "\n").splitlines()]
-    return [token for token in tokens if token]
 
+@lru_cache(maxsize=1)
+def _settings():
+    from app.config import get_settings
 
-def _parse_date(raw_value: str) -> datetime | None:
-    if not raw_value:
-        return None
-    for fmt in ("%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d"):
-        try:
-            return datetime.strptime(raw_value.strip(), fmt)
-        except ValueError:
-            continue
-    return None
+    return get_settings()
 
 
-def _normalize_dates(raw_dates: list[str]) -> list[str]:
-    normalized = []
-    for raw in raw_dates:
-        parsed = _parse_date(raw)
-        if parsed:
-            normalized.append(parsed.strftime("%d/%m/%Y"))
-        else:
-            normalized.append(raw.strip())
-    return normalized
-
-
-def _select_date_bounds(dates_list: list[str]) -> tuple[str, str]:
-    first = ""
-    last = ""
-    for value in dates_list:
-        parsed = _parse_date(value)
-        if parsed:
-            formatted = parsed.strftime("%d/%m/%Y")
-            if not first:
-                first = formatted
-            last = formatted
-        else:
-            if not first:
-                first = value
-            last = value
-    return first, last
+@lru_cache(maxsize=1)
+def _attestation_layout():
+    return _settings().compiled_attestation_layout.warm()
+
+
+@lru_cache(maxsize=1)
+def _flight():
+    from app.single_flight import SingleFlight
+
+    return SingleFlight(
+        ttl=float(os.environ.get("GENERATE_RESULT_TTL", "30")),
+        max_entries=int(os.environ.get("GENERATE_RESULT_CACHE_SIZE", "8")),
+    )
+
+
+def warm() -> None:
+    """Import the rendering modules and fill the settings/layout/template caches."""
+    import generateur_feuilles  # noqa: F401
+    import questionnaire_core  # noqa: F401
+    import app.generate_attestation  # noqa: F401
+
+    _attestation_layout()
+
+
+def _upload_limits() -> UploadLimits:
+    defaults = UploadLimits()
+    return UploadLimits(
+        max_total_bytes=int(os.environ.get("GENERATE_MAX_BODY_BYTES", defaults.max_total_bytes)),
+        max_field_bytes=int(os.environ.get("GENERATE_MAX_FIELD_BYTES", defaults.max_field_bytes)),
+        max_file_bytes=int(os.environ.get("GENERATE_MAX_FILE_BYTES", defaults.max_file_bytes)),
+    )
+
+
+ARCHIVE_NAME = "documents_formation.zip"
+LARGE_DELIVERIES = ("parts", "blob")
+
+
+def _max_response_bytes() -> int:
+    # Vercel rejects function responses above 4.5 MB, headers included.
+    return int(os.environ.get("GENERATE_MAX_RESPONSE_BYTES", "4000000"))
+
+
+def _large_delivery() -> str:
+    delivery = os.environ.get("GENERATE_LARGE_DELIVERY", "parts")
+    if delivery not in LARGE_DELIVERIES:
+        raise ValueError(f"GENERATE_LARGE_DELIVERY must be one of {', '.join(LARGE_DELIVERIES)}.")
+    return delivery
+
+
+if os.environ.get("GENERATE_WARM_ON_IMPORT") == "1":
+    warm()
 
 
 def _send_text(handler: BaseHTTPRequestHandler, status: int, message: str) -> None:
+    body = message.encode("utf-8")
     handler.send_response(status)
     handler.send_header("Content-Type", "text/plain; charset=utf-8")
+    # Lets a keep-alive connection (serveur_local.py) read the next request.
+    handler.send_header("Content-Length", str(len(body)))
     handler.end_headers()
-    handler.wfile.write(message.encode("utf-8"))
+    handler.wfile.write(body)
 
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self) -> None:
+        query = parse_qs(urlsplit(self.path).query)
+        if "download" in query:
+            self._download(query["download"][0], query.get("filename", [ARCHIVE_NAME])[0])
+            return
         _send_text(self, 200, "OK")
 
+    def _download(self, key: str, filename: str) -> None:
+        from blob_store import load_blob_store
+
+        data = load_blob_store().get(key)
+        if data is None:
+            _send_text(self, 404, "Archive not found or expired.")
+            return
+        filename = re.sub(r"[^A-Za-z0-9_.-]", "_", filename) or ARCHIVE_NAME
+        self.send_response(200)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
     def do_POST(self) -> None:
         content_type = self.headers.get("Content-Type")
         if not content_type:
+            self.close_connection = True
             _send_text(self, 400, "Missing Content-Type header.")
             return
 
-        form = cgi.FieldStorage(
-            fp=self.rfile,
-            headers=self.headers,
-            environ={"REQUEST_METHOD": "POST", "CONTENT_TYPE": content_type},
-        )
+        try:
+            content_length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.close_connection = True
+            _send_text(self, 411, "Missing Content-Length header.")
+            return
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            try:
+                fields, files = parse_multipart(
+                    self.rfile, content_type, content_length, tmp_path, _upload_limits()
+                )
+            except MultipartError as exc:
+                # The rest of the body was not read: the connection can't be reused.
+                self.close_connection = True
+                _send_text(self, exc.status, str(exc))
+                return
+            self._generate(fields, files, tmp_path)
 
-        if "data" not in form:
+    def _generate(self, fields: dict, files: dict, tmp_path: Path) -> None:
+        if "data" not in fields:
             _send_text(self, 400, "Missing data payload.")
             return
 
         try:
-            payload = json.loads(form["data"].value)
+            payload = json.loads(fields["data"])
         except json.JSONDecodeError:
             _send_text(self, 400, "Invalid JSON payload.")
             return
 
-        company = (payload.get("company") or "").strip()
-        training = (payload.get("training") or "").strip()
-        duration = (payload.get("duration") or "").strip()
-        location = (payload.get("location") or "").strip()
-        dates_raw = payload.get("dates") or ""
-        participants_raw = payload.get("participants") or ""
-        provider = (payload.get("provider") or "Laurent-Serre-Developpement").strip()
-        signatory = (payload.get("signatory") or "Laurent Serre").strip()
-
-        participants = _extract_lines(participants_raw)
-        if not all([company, training, duration, location, dates_raw, participants]):
-            _send_text(self, 400, "Missing required fields.")
+        # The logo was streamed to disk (and hashed) by the multipart parser.
+        logo_file = files.get("logo")
+        try:
+            session, documents = session_from_payload(payload, str(logo_file.path) if logo_file is not None else None)
+        except ValueError as exc:
+            _send_text(self, 400, str(exc))
             return
+        session = _with_attestation_settings(session, documents)
+        fingerprint = session_fingerprint(session, documents, logo_file.sha256 if logo_file is not None else None)
 
-        dates_list = _normalize_dates(_extract_lines(dates_raw))
-        questionnaire_start, questionnaire_end = _select_date_bounds(dates_list)
-        attestation_start = questionnaire_start or (dates_list[0] if dates_list else "")
-        attestation_end = questionnaire_end or (dates_list[-1] if dates_list else "")
+        if "application/x-ndjson" in (self.headers.get("Accept") or ""):
+            self._generate_with_progress(fingerprint, session, documents)
+            return
 
-        logo_file = form["logo"] if "logo" in form else None
-        settings = get_settings()
-        attestation_layout = settings.attestation_layout
+        # Identical submissions (double clicks, colleagues sending the same
+        # session) share one rendering and then hit the short-lived cache.
+        (content_type, body), source = _flight().do(fingerprint, lambda: _deliver(fingerprint, session, documents))
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp_path = Path(tmpdir)
-            presence_output_dir = tmp_path / "feuilles_presence"
-            questionnaire_output_dir = tmp_path / "questionnaires_satisfaction"
-            attestation_output_dir = tmp_path / "attestations_formation"
-            presence_output_dir.mkdir(parents=True, exist_ok=True)
-            questionnaire_output_dir.mkdir(parents=True, exist_ok=True)
-            attestation_output_dir.mkdir(parents=True, exist_ok=True)
-
-            logo_path = None
-            if logo_file is not None and getattr(logo_file, "file", None):
-                logo_path = str(tmp_path / logo_file.filename)
-                with open(logo_path, "wb") as handle:
-                    handle.write(logo_file.file.read())
-
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as archive:
-                for participant in participants:
-                    create_presence_sheet(
-                        company,
-                        participant,
-                        duration,
-                        location,
-                        training,
-                        dates=dates_list if dates_list else None,
-                        output_dir=presence_output_dir,
-                    )
-
-                    first_name, last_name = split_full_name(participant)
-                    data = QuestionnaireData(
-                        participant_last_name=last_name,
-                        participant_first_name=first_name,
-                        company=company,
-                        training_program=training,
-                        training_center=location,
-                        start_date=questionnaire_start,
-                        end_date=questionnaire_end,
-                        logo_path=logo_path,
-                    )
-                    questionnaire_path = render_questionnaire(data, questionnaire_output_dir)
-
-                    attestation_fields = map_to_attestation_fields(
-                        {
-                            "signatory_name": signatory,
-                            "provider_name": provider,
-                            "beneficiary_name": participant,
-                            "company_name": company,
-                            "action_title": training,
-                            "date_start": attestation_start,
-                            "date_end": attestation_end,
-                            "duration": duration,
-                            "location": location,
-                        }
-                    )
-                    attestation_name = f"attestation_{sanitize_filename(participant)}.pdf"
-                    attestation_path = attestation_output_dir / attestation_name
-                    generate_attestation(attestation_fields, attestation_layout, attestation_path)
-
-                    presence_file = (
-                        presence_output_dir / f"Feuille_de_presence_{participant.replace(' ', '_')}.pdf"
-                    )
-                    if presence_file.exists():
-                        archive.write(
-                            presence_file, arcname=f"feuilles_presence/{presence_file.name}"
-                        )
-                    if questionnaire_path.exists():
-                        archive.write(
-                            questionnaire_path,
-                            arcname=f"questionnaires_satisfaction/{questionnaire_path.name}",
-                        )
-                    if attestation_path.exists():
-                        archive.write(
-                            attestation_path,
-                            arcname=f"attestations_formation/{attestation_path.name}",
-                        )
-
-            zip_bytes = zip_buffer.getvalue()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        if content_type == "application/zip":
+            self.send_header("Content-Disposition", f'attachment; filename="{ARCHIVE_NAME}"')
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Result-Source", source)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+    def _generate_with_progress(self, fingerprint: str, session: TrainingSession, documents: tuple[str, ...]) -> None:
+        """Stream NDJSON progress events, then a ``done`` event carrying the archive.
 
+        An archive that fits in the response (base64 included) is sent inline
+        in the ``done`` event, so no second request has to reach the same
+        instance. Larger archives go to the blob store and ``done`` lists the
+        URL(s) to download. A client that disconnects does not stop the
+        rendering: the result still lands in the single-flight cache for its
+        next attempt. A request that joins an identical rendering already in
+        progress only receives the ``done`` event.
+        """
         self.send_response(200)
-        self.send_header("Content-Type", "application/zip")
-        self.send_header(
-            "Content-Disposition", 'attachment; filename="documents_formation.zip"'
-        )
-        self.send_header("Content-Length", str(len(zip_bytes)))
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
         self.end_headers()
-        self.wfile.write(zip_bytes)
+        self.close_connection = True
+        started = time.perf_counter()
+        connected = True
+
+        def emit(event: dict) -> None:
+            nonlocal connected
+            if not connected:
+                return
+            try:
+                self.wfile.write(json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+            except OSError:
+                connected = False
+
+        # Base64 grows the archive by a third; the rest of the event is small.
+        inline_limit = _max_response_bytes() * 3 // 4 - 1024
+        try:
+            (content_type, body), source = _flight().do(
+                f"{fingerprint}:progress",
+                lambda: _deliver(fingerprint, session, documents, progress=emit, inline_limit=inline_limit),
+            )
+        except Exception as exc:  # the status line is already sent: report the failure in the stream
+            emit({"event": "error", "message": str(exc)})
+            return
+        if content_type == "application/zip":
+            result = {
+                "delivery": "inline",
+                "filename": ARCHIVE_NAME,
+                "size": len(body),
+                "archive": base64.b64encode(body).decode("ascii"),
+            }
+        else:
+            result = json.loads(body)
+        emit({"event": "done", "source": source, "seconds": round(time.perf_counter() - started, 4), **result})
+
+
+def _deliver(
+    fingerprint: str,
+    session: TrainingSession,
+    documents: tuple[str, ...],
+    progress: Callable[[dict], None] | None = None,
+    inline_limit: int | None = None,
+) -> tuple[str, bytes]:
+    """Return ``(content_type, body)``: the ZIP itself when it fits in a response.
+
+    ``inline_limit`` lowers the size returned as is (the NDJSON stream sends
+    it base64-encoded). Above it, the archive ("blob") or its numbered parts
+    ("parts", split while rendering) are written to the blob store and the
+    body is a JSON manifest listing the URLs to download. An archive
+    pre-rendered by ``pregeneration.py`` for the same inputs is used as is.
+    """
+    from artefact_store import PregeneratedArchives
+
+    limit = _max_response_bytes()
+    delivery = _large_delivery()
+    pregenerated = PregeneratedArchives().get(fingerprint)
+    if pregenerated is not None and (len(pregenerated) <= limit or delivery == "blob"):
+        parts = [pregenerated]
+    else:
+        parts = _build_parts(session, documents, limit if delivery == "parts" else None, progress)
+    if len(parts) == 1 and len(parts[0]) <= min(limit, inline_limit or limit):
+        return "application/zip", parts[0]
+    if len(parts) == 1 and len(parts[0]) <= limit:
+        delivery = "blob"
+
+    from blob_store import load_blob_store
+
+    store = load_blob_store()
+    stem = ARCHIVE_NAME.removesuffix(".zip")
+    names = [ARCHIVE_NAME] if len(parts) == 1 else [f"{stem}_partie{index}.zip" for index in range(1, len(parts) + 1)]
+    manifest = {
+        "delivery": delivery,
+        "filename": ARCHIVE_NAME,
+        "parts": [
+            {"filename": name, "size": len(part), "url": store.url(store.put(part), name)}
+            for name, part in zip(names, parts)
+        ],
+    }
+    return "application/json", json.dumps(manifest).encode("utf-8")
+
+
+def _build_parts(
+    session: TrainingSession,
+    documents: tuple[str, ...],
+    max_part_bytes: int | None,
+    progress: Callable[[dict], None] | None = None,
+) -> list[bytes]:
+    """Render the requested documents in memory and return the ZIP part(s)."""
+    from profiling import profiled_from_env
+
+    session = _with_attestation_settings(session, documents)
+    with profiled_from_env("api_generate"):
+        return build_archive_parts(session, documents, max_part_bytes, progress)
+
+
+def _with_attestation_settings(session: TrainingSession, documents: tuple[str, ...]) -> TrainingSession:
+    """Attach the worker's cached layout and settings when attestations are requested."""
+    if not any(DOCUMENT_TYPES[key].needs_attestation_module for key in documents):
+        return session
+    settings = _settings()
+    return replace(
+        session,
+        attestation_layout=_attestation_layout(),
+        attestation_backend=settings.attestation_backend,
+        attestation_flatten=settings.attestation_flatten,
+    )
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+FINGERPRINT = re.compile(r"^[0-9a-f]{64}$")
+
+
+def fingerprint_inputs(inputs: dict) -> str:
+    """Stable hash of generation inputs; bytes values (logos) are hashed separately."""
+    canonical = {}
+    for key, value in inputs.items():
+        if isinstance(value, (bytes, bytearray)):
+            value = {"sha256": hashlib.sha256(value).hexdigest()}
+        elif isinstance(value, tuple):
+            value = list(value)
+        canonical[key] = value
+    encoded = json.dumps(canonical, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class _Entry:
+    __slots__ = ("data", "path", "size")
+
+    def __init__(self, data: bytes):
+        self.data: bytes | None = data
+        self.path: Path | None = None
+        self.size = len(data)
+
+    def read(self) -> bytes | None:
+        if self.data is not None:
+            return self.data
+        if self.path is not None and self.path.exists():
+            return self.path.read_bytes()
+        return None
+
+
+class ArtefactStore:
+    """Bounded store of generated archives, scoped per session.
+
+    Sessions are kept in LRU order: past ``max_sessions`` the least recently
+    used one is dropped with all its artefacts. Each session keeps at most
+    ``max_entries_per_session`` archives. When the archives held in memory
+    exceed ``max_memory_bytes`` the oldest ones are written to ``spill_dir``
+    (or dropped when no spill directory is configured). Without a spill
+    directory the archive just stored is always kept, even when it alone
+    exceeds the budget.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 32,
+        max_entries_per_session: int = 4,
+        max_memory_bytes: int = 256 * 1024 * 1024,
+        spill_dir: str | Path | None = None,
+    ):
+        self.max_sessions = max_sessions
+        self.max_entries_per_session = max_entries_per_session
+        self.max_memory_bytes = max_memory_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self._sessions: OrderedDict[str, OrderedDict[str, _Entry]] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    def get(self, session_id: str, fingerprint: str | None) -> bytes | None:
+        if not fingerprint:
+            return None
+        with self._lock:
+            entries = self._sessions.get(session_id)
+            if entries is None or fingerprint not in entries:
+                return None
+            self._sessions.move_to_end(session_id)
+            entries.move_to_end(fingerprint)
+            data = entries[fingerprint].read()
+            if data is None:
+                self._discard(session_id, fingerprint)
+            return data
+
+    def put(self, session_id: str, fingerprint: str, data: bytes) -> None:
+        with self._lock:
+            entries = self._sessions.get(session_id)
+            if entries is None:
+                entries = self._sessions[session_id] = OrderedDict()
+            self._sessions.move_to_end(session_id)
+            previous = entries.pop(fingerprint, None)
+            if previous is not None:
+                self._release(previous)
+            entries[fingerprint] = _Entry(data)
+            self._memory_bytes += len(data)
+
+            while len(entries) > self.max_entries_per_session:
+                self._discard(session_id, next(iter(entries)))
+            while len(self._sessions) > self.max_sessions:
+                self._drop_session(next(iter(self._sessions)))
+            self._enforce_memory_budget(keep=(session_id, fingerprint))
+
+    def drop_session(self, session_id: str) -> None:
+        with self._lock:
+            self._drop_session(session_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._sessions.values())
+
+    def _enforce_memory_budget(self, keep: tuple[str, str]) -> None:
+        # Oldest sessions first, oldest artefacts first within a session.
+        for session_id in list(self._sessions):
+            for fingerprint in list(self._sessions.get(session_id, ())):
+                if self._memory_bytes <= self.max_memory_bytes:
+                    return
+                entry = self._sessions[session_id][fingerprint]
+                if entry.data is None:
+                    continue
+                if self.spill_dir is not None:
+                    self._spill(session_id, fingerprint, entry)
+                elif (session_id, fingerprint) != keep:
+                    self._discard(session_id, fingerprint)
+
+    def _spill(self, session_id: str, fingerprint: str, entry: _Entry) -> None:
+        session_dir = self.spill_dir / _safe_name(session_id)
+        session_dir.mkdir(parents=True, exist_ok=True)
+        path = session_dir / f"{fingerprint}.zip"
+        path.write_bytes(entry.data)
+        entry.path = path
+        entry.data = None
+        self._memory_bytes -= entry.size
+
+    def _discard(self, session_id: str, fingerprint: str) -> None:
+        entries = self._sessions.get(session_id)
+        if entries is None:
+            return
+        entry = entries.pop(fingerprint, None)
+        if entry is not None:
+            self._release(entry)
+        if not entries:
+            self._drop_session(session_id)
+
+    def _drop_session(self, session_id: str) -> None:
+        entries = self._sessions.pop(session_id, None)
+        if entries is None:
+            return
+        for entry in entries.values():
+            self._release(entry)
+        if self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir / _safe_name(session_id), ignore_errors=True)
+
+    def _release(self, entry: _Entry) -> None:
+        if entry.data is not None:
+            self._memory_bytes -= entry.size
+            entry.data = None
+        if entry.path is not None:
+            entry.path.unlink(missing_ok=True)
+            entry.path = None
+
+
+def _safe_name(value: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in value) or "session"
+
+
+class PregeneratedArchives:
+    """Archives rendered ahead of time, one ``<fingerprint>.zip`` file per set of inputs.
+
+    Filled by ``pregeneration.py`` and shared by every web process on the
+    machine: a generation whose fingerprint is found here is served without
+    rendering anything.
+    """
+
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root) if root else default_pregenerated_dir()
+
+    def get(self, fingerprint: str) -> bytes | None:
+        if not FINGERPRINT.match(fingerprint):
+            return None
+        path = self.root / f"{fingerprint}.zip"
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, fingerprint: str, data: bytes) -> Path:
+        if not FINGERPRINT.match(fingerprint):
+            raise ValueError(f"Invalid fingerprint '{fingerprint}'.")
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / f"{fingerprint}.zip"
+        # One temporary file per call, so concurrent writers never share it.
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, prefix=fingerprint, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            # Readable by the web processes, which may run as another user.
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return path
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return bool(FINGERPRINT.match(fingerprint)) and (self.root / f"{fingerprint}.zip").exists()
+
+    def prune(self, max_age: float) -> int:
+        """Remove archives written more than ``max_age`` seconds ago; return how many."""
+        deadline = time.time() - max_age
+        removed = 0
+        for path in self.root.glob("*.zip"):
+            try:
+                if path.stat().st_mtime < deadline:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+
+def default_pregenerated_dir() -> Path:
+    return Path(os.environ.get("PREGENERATED_DIR") or Path(tempfile.gettempdir()) / "documents_formation_pregenerated")
@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# profiling.py and zip_entries.py are shared with the other generators at the
+# repository root.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
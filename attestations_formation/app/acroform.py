@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import argparse
+import io
+from pathlib import Path
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    FloatObject,
+    NameObject,
+    NumberObject,
+    TextStringObject,
+)
+
+from app.layout import CompiledLayout, DrawOp, compile_layout
+from app.utils import add_indirect_object
+
+FONT_NAME = "/Helv"
+# The widget box starts slightly left of and below the text baseline used
+# by the overlay backend, so filled text lands where drawString puts it.
+HORIZONTAL_PADDING = 2.0
+DESCENT_RATIO = 0.3
+
+
+def form_field_name(field_id: str, page_index: int, page_count: int) -> str:
+    if page_count == 1:
+        return field_id
+    return f"{field_id}__p{page_index + 1}"
+
+
+def build_form_template(layout: dict | CompiledLayout) -> bytes:
+    """Return the template PDF with one text field per layout entry."""
+    compiled = layout if isinstance(layout, CompiledLayout) else compile_layout(layout)
+    writer = PdfWriter(clone_from=PdfReader(compiled.template_source()))
+    page_count = len(writer.pages)
+    fields = ArrayObject()
+
+    for page_index, page in enumerate(writer.pages):
+        ops = compiled.ops_for_page(page_index, float(page.mediabox.width), float(page.mediabox.height))
+        for op in ops:
+            widget = writer.add_annotation(page_index, _widget(op, form_field_name(op.field_id, page_index, page_count)))
+            fields.append(widget.indirect_reference)
+
+    writer.root_object[NameObject("/AcroForm")] = DictionaryObject(
+        {
+            NameObject("/Fields"): fields,
+            NameObject("/DA"): TextStringObject(f"{FONT_NAME} 0 Tf 0 g"),
+            NameObject("/DR"): DictionaryObject(
+                {
+                    NameObject("/Font"): DictionaryObject(
+                        {
+                            NameObject(FONT_NAME): DictionaryObject(
+                                {
+                                    NameObject("/Type"): NameObject("/Font"),
+                                    NameObject("/Subtype"): NameObject("/Type1"),
+                                    NameObject("/BaseFont"): NameObject("/Helvetica"),
+                                    NameObject("/Encoding"): NameObject("/WinAnsiEncoding"),
+                                }
+                            )
+                        }
+                    )
+                }
+            ),
+        }
+    )
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def form_template_bytes(compiled: CompiledLayout) -> bytes:
+    """Form template for ``compiled``, built on first use and kept on the layout."""
+    if compiled.form_template_data is None:
+        compiled.form_template_data = build_form_template(compiled)
+    return compiled.form_template_data
+
+
+def fill_form_template(fields: dict[str, str], layout: dict | CompiledLayout, flatten: bool = True) -> bytes:
+    """Fill the form template with ``fields``; flattened output has no form left."""
+    compiled = layout if isinstance(layout, CompiledLayout) else compile_layout(layout)
+    writer = PdfWriter(clone_from=PdfReader(io.BytesIO(form_template_bytes(compiled))))
+    page_count = len(writer.pages)
+
+    for page_index, page in enumerate(writer.pages):
+        values = {}
+        ops = compiled.ops_for_page(page_index, float(page.mediabox.width), float(page.mediabox.height))
+        for op in ops:
+            value = fields.get(op.field_id)
+            if op.kind == "checkbox":
+                value = "X" if value else ""
+            values[form_field_name(op.field_id, page_index, page_count)] = str(value or "")
+        if values:
+            writer.update_page_form_field_values(page, values, auto_regenerate=False)
+        if flatten:
+            _flatten_page(writer, page)
+
+    if flatten:
+        del writer.root_object["/AcroForm"]
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def _widget(op: DrawOp, name: str) -> DictionaryObject:
+    left = op.x - HORIZONTAL_PADDING
+    bottom = op.y - op.font_size * DESCENT_RATIO
+    width = max(op.width, op.font_size) + HORIZONTAL_PADDING
+    height = op.font_size * (1 + DESCENT_RATIO)
+    return DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Annot"),
+            NameObject("/Subtype"): NameObject("/Widget"),
+            NameObject("/FT"): NameObject("/Tx"),
+            NameObject("/T"): TextStringObject(name),
+            NameObject("/V"): TextStringObject(""),
+            NameObject("/F"): NumberObject(4),
+            NameObject("/DA"): TextStringObject(f"{FONT_NAME} {op.font_size} Tf 0 g"),
+            NameObject("/Rect"): ArrayObject(
+                [FloatObject(left), FloatObject(bottom), FloatObject(left + width), FloatObject(bottom + height)]
+            ),
+        }
+    )
+
+
+def _flatten_page(writer: PdfWriter, page) -> None:
+    annotations = page.get("/Annots")
+    if not annotations:
+        return
+    resources = page["/Resources"].get_object()
+    xobjects = resources.get("/XObject")
+    if xobjects is None:
+        xobjects = resources[NameObject("/XObject")] = DictionaryObject()
+    xobjects = xobjects.get_object()
+
+    drawing = []
+    kept = ArrayObject()
+    for index, reference in enumerate(annotations):
+        annotation = reference.get_object()
+        if annotation.get("/Subtype") != "/Widget" or annotation.get("/FT") != "/Tx":
+            kept.append(reference)
+            continue
+        appearance = annotation.get("/AP", {}).get("/N")
+        if appearance is None or not annotation.get("/V"):
+            continue
+        name = f"/FlatField{index}"
+        xobjects[NameObject(name)] = appearance if appearance.indirect_reference is None else appearance.indirect_reference
+        left, bottom = (float(value) for value in annotation["/Rect"][:2])
+        drawing.append(f"q 1 0 0 1 {left:.2f} {bottom:.2f} cm {name} Do Q")
+
+    if drawing:
+        # Isolate the template's graphics state before stamping the fields.
+        contents = page.get("/Contents")
+        streams = list(contents.get_object()) if isinstance(contents.get_object(), ArrayObject) else [contents]
+        prefix = DecodedStreamObject()
+        prefix.set_data(b"q\n")
+        suffix = DecodedStreamObject()
+        suffix.set_data(("Q\n" + "\n".join(drawing) + "\n").encode("latin-1"))
+        page[NameObject("/Contents")] = ArrayObject(
+            [add_indirect_object(writer, prefix), *streams, add_indirect_object(writer, suffix)]
+        )
+
+    if kept:
+        page[NameObject("/Annots")] = kept
+    else:
+        del page["/Annots"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the fillable (AcroForm) attestation template.")
+    parser.add_argument("--output", default=None, help="Output PDF path (default: <template>_form.pdf)")
+    args = parser.parse_args()
+
+    from app.config import get_settings
+
+    compiled = get_settings().compiled_attestation_layout
+    output = Path(args.output) if args.output else Path(compiled.template_pdf).with_name(
+        f"{Path(compiled.template_pdf).stem}_form.pdf"
+    )
+    output.write_bytes(build_form_template(compiled))
+    print(f"Form template written to {output}")
+
+
+if __name__ == "__main__":
+    main()
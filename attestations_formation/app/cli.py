@@ -5,10 +5,12 @@ from pathlib import Path
 
 import zipfile
 
-from app.config import load_attestation_layout, load_convention_config
-from app.extract_convention import extract_convention_data, extract_form_fields, extract_text
-from app.generate_attestation import generate_attestation
+from app.config import get_settings
+from app.extract_convention import EXTRACTION_BACKENDS, extract_convention, extract_form_fields, extract_text
+from app.generate_attestation import generate_attestation, generate_attestations_bytes
 from app.utils import map_to_attestation_fields, sanitize_filename
+from profiling import DEFAULT_PROFILE_DIR, profiled
+from zip_entries import write_zip_entry
 
 
 def main() -> None:
@@ -16,13 +18,41 @@ def main() -> None:
     parser.add_argument("pdf", help="Path to the convention PDF")
     parser.add_argument("--output", default="certificats_output/attestation.pdf", help="Output PDF path")
     parser.add_argument("--debug", action="store_true", help="Print extracted text and form fields")
+    parser.add_argument(
+        "--extraction",
+        choices=EXTRACTION_BACKENDS,
+        default=None,
+        help="Text extraction backend (default: EXTRACTION_BACKEND setting)",
+    )
+    parser.add_argument(
+        "--combined",
+        action="store_true",
+        help="Write every attestation into a single PDF instead of one file per participant",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=DEFAULT_PROFILE_DIR,
+        default=None,
+        metavar="DIR",
+        help=f"Profile the run: write .pstats and .collapsed files in DIR (default: {DEFAULT_PROFILE_DIR}/) "
+        "and print the top functions by cumulative time",
+    )
     args = parser.parse_args()
 
+    with profiled("attestations_cli", args.profile):
+        _run(args)
+
+
+def _run(args: argparse.Namespace) -> None:
     pdf_path = Path(args.pdf)
     output_path = Path(args.output)
 
+    settings = get_settings()
+    backend = args.extraction or settings.extraction_backend
+
     if args.debug:
-        text = extract_text(str(pdf_path))
+        text = extract_text(str(pdf_path), "fast" if backend == "fast" else "layout")
         form_fields = extract_form_fields(str(pdf_path))
         print("---- DEBUG TEXT (first 800 chars) ----")
         print(text[:800] if text else "[no text extracted]")
@@ -34,19 +64,39 @@ def main() -> None:
                 print(f"{name} = {value}")
         return
 
-    convention_config = load_convention_config()
-    extracted_fields, participants = extract_convention_data(str(pdf_path), convention_config)
-    layout = load_attestation_layout()
+    extraction = extract_convention(str(pdf_path), settings.convention_config, backend)
+    extracted_fields, participants = extraction.fields, extraction.participants
+    print(
+        f"Text extracted with the {extraction.report.backend} backend and the "
+        f"{extraction.report.profile or 'generic'} profile "
+        f"in {extraction.report.seconds * 1000:.0f} ms (tried: {', '.join(extraction.report.attempts)})"
+    )
+    layout = settings.compiled_attestation_layout
 
-    files: list[Path] = []
     beneficiaries = participants or [extracted_fields.get("beneficiary_name", "beneficiaire")]
+    attestations = []
     for beneficiary in beneficiaries:
         fields = dict(extracted_fields)
         fields["beneficiary_name"] = beneficiary
-        attestation_fields = map_to_attestation_fields(fields)
+        attestations.append((beneficiary, map_to_attestation_fields(fields)))
+
+    if args.combined:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(generate_attestations_bytes([fields for _, fields in attestations], layout))
+        print(f"{len(attestations)} attestations generated in {output_path}")
+        return
+
+    files: list[Path] = []
+    for beneficiary, attestation_fields in attestations:
         safe_name = sanitize_filename(beneficiary)
         output_file = output_path.with_name(f"{output_path.stem}_{safe_name}.pdf")
-        generate_attestation(attestation_fields, layout, output_file)
+        generate_attestation(
+            attestation_fields,
+            layout,
+            output_file,
+            backend=settings.attestation_backend,
+            flatten=settings.attestation_flatten,
+        )
         files.append(output_file)
 
     if len(files) == 1:
@@ -56,7 +106,7 @@ def main() -> None:
     zip_path = output_path.with_suffix(".zip")
     with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as archive:
         for pdf in files:
-            archive.write(pdf, arcname=pdf.name)
+            write_zip_entry(archive, pdf.name, pdf.read_bytes())
     print(f"{len(files)} attestations generated, zip saved at {zip_path}")
 
 
@@ -1,7 +1,13 @@
+import hashlib
+from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import json
 
+from app.layout import CompiledLayout, compile_layout
+from app.patterns import validate_convention_config
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 CONFIG_DIR = BASE_DIR / "config"
 
@@ -10,20 +16,36 @@ class Settings(BaseSettings):
     config_dir: Path = CONFIG_DIR
     convention_patterns_file: Path = CONFIG_DIR / "convention_patterns.json"
     attestation_layout_file: Path = CONFIG_DIR / "attestation_layout.json"
+    # "overlay" merges a reportlab overlay per page, "acroform" fills a form template,
+    # "xobject" draws the template as a shared Form XObject under the field text.
+    attestation_backend: Literal["overlay", "acroform", "xobject"] = "overlay"
+    attestation_flatten: bool = True
+    # "fast" (pypdf), "layout" (pdfplumber) or "auto": fast, then layout if required fields are missing.
+    extraction_backend: Literal["fast", "layout", "auto"] = "auto"
+    # Seconds a generated document is served again to identical uploads.
+    generation_result_ttl: float = 30.0
 
     @property
     def convention_config(self) -> dict:
-        with self.convention_patterns_file.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        """Validated pattern config, loaded again only when the file changes. Treat it as read-only."""
+        path = self.convention_patterns_file
+        return _load_convention_config(str(path), path.stat().st_mtime_ns)
+
+    @property
+    def convention_config_fingerprint(self) -> str:
+        """SHA-256 of the pattern file, hashed again only when the file changes."""
+        path = self.convention_patterns_file
+        return _file_sha256(str(path), path.stat().st_mtime_ns)
 
     @property
     def attestation_layout(self) -> dict:
-        layout = self._load_json(self.attestation_layout_file)
-        # Resolve absolute path for template if necessary
-        template_path = Path(layout["template_pdf"])
-        if not template_path.is_absolute():
-            layout["template_pdf"] = str(self.base_dir / template_path)
-        return layout
+        return _resolve_template(self._load_json(self.attestation_layout_file), self.base_dir)
+
+    @property
+    def compiled_attestation_layout(self) -> CompiledLayout:
+        """Compiled once per version of the layout file, so renders share its caches."""
+        path = self.attestation_layout_file
+        return _load_compiled_layout(str(path), path.stat().st_mtime_ns, str(self.base_dir))
 
     def _load_json(self, path: Path) -> dict:
         with path.open("r", encoding="utf-8") as f:
@@ -31,5 +53,35 @@ class Settings(BaseSettings):
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+
+@lru_cache(maxsize=4)
+def _load_convention_config(path: str, mtime_ns: int) -> dict:
+    """Parse and lint the pattern file once per modification time."""
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    validate_convention_config(config)
+    return config
+
+
+@lru_cache(maxsize=4)
+def _load_compiled_layout(path: str, mtime_ns: int, base_dir: str) -> CompiledLayout:
+    with open(path, "r", encoding="utf-8") as f:
+        layout = json.load(f)
+    return compile_layout(_resolve_template(layout, Path(base_dir)))
+
+
+def _resolve_template(layout: dict, base_dir: Path) -> dict:
+    # Resolve absolute path for template if necessary
+    template_path = Path(layout["template_pdf"])
+    if not template_path.is_absolute():
+        layout["template_pdf"] = str(base_dir / template_path)
+    return layout
+
+
+@lru_cache(maxsize=4)
+def _file_sha256(path: str, mtime_ns: int) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
 def get_settings() -> Settings:
     return Settings()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+ARTICLE_HEADER = re.compile(r"Article\s+(?P<number>\d+(?:\.\d+)*)\s*(?:[–:.-]\s*)?(?P<title>.*)", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Section:
+    number: str
+    title: str
+    start: int
+    end: int
+
+
+class ConventionDocument:
+    """Convention text normalized once, with its lines and article offsets.
+
+    ``sections`` is built in a single pass over the lines: every line that
+    starts with ``Article <n>`` opens a section, which runs until the next
+    article that is not one of its sub-articles (``4.2`` stays inside ``4``).
+    Resolvers search the slice of the article they target instead of the
+    whole convention.
+    """
+
+    def __init__(self, text: str):
+        self.text = text.replace("\r\n", "\n")
+        self.lines: list[str] = []
+        headers: list[tuple[str, str, int]] = []
+        offset = 0
+        for raw_line in self.text.split("\n"):
+            line = re.sub(r"\s+", " ", raw_line).strip()
+            if line:
+                self.lines.append(line)
+                if line[:7].lower() == "article":
+                    match = ARTICLE_HEADER.match(line)
+                    if match:
+                        headers.append((match.group("number"), match.group("title").strip(), offset))
+            offset += len(raw_line) + 1
+        self.sections = _close_sections(headers, len(self.text))
+        self._by_number: dict[str, Section] = {}
+        for section in self.sections:
+            self._by_number.setdefault(section.number, section)
+
+    @classmethod
+    def coerce(cls, value: str | ConventionDocument) -> ConventionDocument:
+        return value if isinstance(value, ConventionDocument) else cls(value)
+
+    @property
+    def preamble(self) -> str:
+        """Text before the first article (parties, provider and client)."""
+        return self.text[: self.sections[0].start] if self.sections else self.text
+
+    def section(self, number: str) -> str | None:
+        section = self._by_number.get(number)
+        return self.text[section.start : section.end] if section else None
+
+    def section_titled(self, keyword: str) -> str | None:
+        keyword = keyword.lower()
+        for section in self.sections:
+            if keyword in section.title.lower():
+                return self.text[section.start : section.end]
+        return None
+
+    def search(self, pattern: str, numbers: tuple[str, ...] = (), flags: int = 0) -> re.Match | None:
+        """Search the given articles first, then the whole text if they do not match."""
+        for number in numbers:
+            text = self.section(number)
+            if text is not None:
+                match = re.search(pattern, text, flags)
+                if match:
+                    return match
+        return re.search(pattern, self.text, flags)
+
+
+def _close_sections(headers: list[tuple[str, str, int]], text_end: int) -> list[Section]:
+    sections: list[Section] = []
+    open_sections: list[tuple[str, str, int]] = []
+    for number, title, start in headers:
+        while open_sections and not number.startswith(f"{open_sections[-1][0]}."):
+            parent_number, parent_title, parent_start = open_sections.pop()
+            sections.append(Section(parent_number, parent_title, parent_start, start))
+        open_sections.append((number, title, start))
+    while open_sections:
+        number, title, start = open_sections.pop()
+        sections.append(Section(number, title, start, text_end))
+    sections.sort(key=lambda section: section.start)
+    return sections
@@ -1,14 +1,48 @@
 from __future__ import annotations
 
+import logging
 import re
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Iterable
 
 import pdfplumber
 from pypdf import PdfReader
 
+from app.document import ConventionDocument
+from app.patterns import SlowPattern, time_budget, timed_search
+from app.profiles import match_profile, profile_config
 
-def extract_text(pdf_path: str) -> str:
+logger = logging.getLogger(__name__)
+
+# "fast" reads the text layer with pypdf, "layout" runs pdfplumber's character
+# level analysis, "auto" tries fast first and falls back to layout.
+EXTRACTION_BACKENDS = ("fast", "layout", "auto")
+
+
+@dataclass
+class ExtractionReport:
+    backend: str
+    seconds: float
+    attempts: list[str] = field(default_factory=list)
+    slow_patterns: list[SlowPattern] = field(default_factory=list)
+    profile: str | None = None
+
+
+@dataclass
+class ConventionExtraction:
+    fields: dict[str, str]
+    participants: list[str]
+    report: ExtractionReport
+
+
+def extract_text(pdf_path: str, backend: str = "layout") -> str:
+    if backend == "fast":
+        reader = PdfReader(pdf_path)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    if backend != "layout":
+        raise ValueError(f"Unknown text extraction backend '{backend}'.")
     chunks: list[str] = []
     with pdfplumber.open(pdf_path) as pdf:
         for page in pdf.pages:
@@ -62,15 +96,21 @@ def find_from_form_fields(form_fields: dict[str, str], labels: Iterable[str], pa
     return None
 
 
-def extract_fields(text: str, config: dict, form_fields: dict[str, str] | None = None) -> dict[str, str | None]:
-    lines = normalize_lines(text)
+def extract_fields(
+    text: str | ConventionDocument,
+    config: dict,
+    form_fields: dict[str, str] | None = None,
+    slow_patterns: list[SlowPattern] | None = None,
+) -> dict[str, str | None]:
+    document = ConventionDocument.coerce(text)
+    text, lines = document.text, document.lines
+    budget = time_budget(config)
     fields: dict[str, str | None] = {}
     for field_id, spec in config.get("fields", {}).items():
         value = None
         for pattern in spec.get("patterns", []):
-            match = re.search(pattern, text, flags=re.IGNORECASE | re.MULTILINE)
-            if match:
-                value = match.groupdict().get("value") or match.group(1)
+            value = timed_search(field_id, pattern, text, budget, slow_patterns)
+            if value:
                 break
         if not value and spec.get("labels"):
             value = find_after_label(lines, spec["labels"])
@@ -90,15 +130,16 @@ def extract_fields(text: str, config: dict, form_fields: dict[str, str] | None =
     return fields
 
 
-def extract_convention_fields(pdf_path: str, config: dict) -> dict[str, str]:
-    text = extract_text(pdf_path)
+def extract_convention_fields(pdf_path: str, config: dict, backend: str = "layout") -> dict[str, str]:
+    text = extract_text(pdf_path, backend)
     form_fields = extract_form_fields(pdf_path)
     if not text.strip() and not form_fields:
         raise ValueError("Aucun texte ou champ de formulaire detecte dans le PDF.")
-    fields = extract_fields(text, config, form_fields)
+    document = ConventionDocument(text)
+    fields = extract_fields(document, config, form_fields)
     missing = [field for field in config.get("required", []) if not fields.get(field)]
     if missing:
-        fixed_fields = extract_fixed_fields(text)
+        fixed_fields = extract_fixed_fields(document)
         fields.update({key: value for key, value in fixed_fields.items() if value})
         missing = [field for field in config.get("required", []) if not fields.get(field)]
     if missing:
@@ -106,15 +147,86 @@ def extract_convention_fields(pdf_path: str, config: dict) -> dict[str, str]:
     return {key: value for key, value in fields.items() if value}
 
 
-def extract_convention_data(pdf_path: str, config: dict) -> tuple[dict[str, str], list[str]]:
-    text = extract_text(pdf_path)
+def extract_convention_data(pdf_path: str, config: dict, backend: str = "auto") -> tuple[dict[str, str], list[str]]:
+    extraction = extract_convention(pdf_path, config, backend)
+    return extraction.fields, extraction.participants
+
+
+def extract_convention(pdf_path: str, config: dict, backend: str = "auto") -> ConventionExtraction:
+    """Extract the convention fields and participants, reporting which text backend was used.
+
+    With ``backend="auto"`` the pypdf text is tried first; pdfplumber only runs
+    when required fields are still missing afterwards.
+    """
+    if backend not in EXTRACTION_BACKENDS:
+        raise ValueError(f"Unknown text extraction backend '{backend}'.")
+    attempts = ["fast", "layout"] if backend == "auto" else [backend]
     form_fields = extract_form_fields(pdf_path)
-    if not text.strip() and not form_fields:
-        raise ValueError("Aucun texte ou champ de formulaire detecte dans le PDF.")
-    fields = extract_fields(text, config, form_fields)
-    fixed_fields = extract_fixed_fields(text)
-    participants = extract_participants(text)
-    client_contact = extract_client_contact(text)
+    report = ExtractionReport(backend=attempts[0], seconds=0.0)
+    started = time.perf_counter()
+
+    for position, attempt in enumerate(attempts):
+        report.backend = attempt
+        report.attempts.append(attempt)
+        text = extract_text(pdf_path, attempt)
+        if not text.strip() and not form_fields:
+            if position + 1 < len(attempts):
+                continue
+            raise ValueError("Aucun texte ou champ de formulaire detecte dans le PDF.")
+        document = ConventionDocument(text)
+        fields, participants = _resolve_convention_fields(document, config, form_fields, report)
+        missing = [name for name in config.get("required", []) if not fields.get(name)]
+        if not missing:
+            break
+        if position + 1 == len(attempts):
+            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+    report.seconds = time.perf_counter() - started
+    logger.info(
+        "Convention %s extracted with the %s backend and the %s profile in %.3fs (tried: %s)",
+        pdf_path,
+        report.backend,
+        report.profile or "generic",
+        report.seconds,
+        ", ".join(report.attempts),
+    )
+    return ConventionExtraction(
+        fields={key: value for key, value in fields.items() if value},
+        participants=participants,
+        report=report,
+    )
+
+
+def _resolve_convention_fields(
+    document: ConventionDocument, config: dict, form_fields: dict[str, str], report: ExtractionReport
+) -> tuple[dict[str, str | None], list[str]]:
+    """Route the document to its fingerprinted profile, or try every pattern when none matches."""
+    matched = match_profile(document.lines, config)
+    if matched is not None:
+        name, profile = matched
+        restricted = profile_config(config, profile)
+        fields, participants = _resolve_with_config(
+            document, restricted, form_fields, report.slow_patterns, profile.get("fixed_fields", True)
+        )
+        if all(fields.get(required) for required in restricted.get("required", [])):
+            report.profile = name
+            return fields, participants
+        logger.info("Convention matched profile %s but required fields are missing, trying every pattern", name)
+    report.profile = None
+    return _resolve_with_config(document, config, form_fields, report.slow_patterns, True)
+
+
+def _resolve_with_config(
+    document: ConventionDocument,
+    config: dict,
+    form_fields: dict[str, str],
+    slow_patterns: list[SlowPattern],
+    fixed: bool,
+) -> tuple[dict[str, str | None], list[str]]:
+    fields = extract_fields(document, config, form_fields, slow_patterns)
+    fixed_fields = extract_fixed_fields(document) if fixed else {}
+    participants = extract_participants(document)
+    client_contact = extract_client_contact(document)
     for key, value in fixed_fields.items():
         if value:
             fields[key] = value
@@ -122,16 +234,13 @@ def extract_convention_data(pdf_path: str, config: dict) -> tuple[dict[str, str]
         fields["beneficiary_name"] = participants[0]
     if not participants and client_contact:
         fields["beneficiary_name"] = client_contact
-    missing = [field for field in config.get("required", []) if not fields.get(field)]
-    if missing:
-        raise ValueError(f"Missing required fields: {', '.join(missing)}")
-    return {key: value for key, value in fields.items() if value}, participants
+    return fields, participants
 
 
-def extract_fixed_fields(text: str) -> dict[str, str | None]:
+def extract_fixed_fields(text: str | ConventionDocument) -> dict[str, str | None]:
+    document = ConventionDocument.coerce(text)
     fields: dict[str, str | None] = {}
-    normalized = text.replace("\r\n", "\n")
-    header = normalized.split("Article 1", 1)[0]
+    header = document.preamble
 
     provider_match = re.findall(r"Ci-apr[eè]s d[ée]sign[ée] [«\"]([^»\"]+)[»\"]", header, flags=re.IGNORECASE)
     if provider_match:
@@ -141,15 +250,15 @@ def extract_fixed_fields(text: str) -> dict[str, str | None]:
     if company_match:
         fields["company_name"] = company_match.group(1).strip()
 
-    signatory_match = re.search(r"Pour\s+le\s+Prestataire\s*:\s*(?:Nom\s*:\s*)?([^\n]+)", normalized, flags=re.IGNORECASE)
+    signatory_match = document.search(r"Pour\s+le\s+Prestataire\s*:\s*(?:Nom\s*:\s*)?([^\n]+)", flags=re.IGNORECASE)
     if signatory_match:
         fields["signatory_name"] = signatory_match.group(1).strip()
 
-    action_match = re.search(r"formation\s+intitul[ée]e\s*:\s*([^\n]+)", normalized, flags=re.IGNORECASE)
+    action_match = document.search(r"formation\s+intitul[ée]e\s*:\s*([^\n]+)", ("1",), flags=re.IGNORECASE)
     if action_match:
         fields["action_title"] = action_match.group(1).strip()
 
-    duration_match = re.search(r"Dur[eé]e\s+de\s+la\s+formation\s*:\s*([^\n\.]+)", normalized, flags=re.IGNORECASE)
+    duration_match = document.search(r"Dur[eé]e\s+de\s+la\s+formation\s*:\s*([^\n\.]+)", ("2",), flags=re.IGNORECASE)
     if duration_match:
         duration = duration_match.group(1).strip()
         duration = re.split(r"\s+soit\s+", duration, flags=re.IGNORECASE)[0].strip()
@@ -160,22 +269,21 @@ def extract_fixed_fields(text: str) -> dict[str, str | None]:
         else:
             fields["duration"] = duration
 
-    dates_match = re.search(
+    dates_match = document.search(
         r"Dates?\s+de\s+formation\s*:\s*(\d{2}/\d{2}/\d{4})\s+au\s+(\d{2}/\d{2}/\d{4})",
-        normalized,
+        ("2",),
         flags=re.IGNORECASE,
     )
     if dates_match:
         fields["date_start"] = dates_match.group(1)
         fields["date_end"] = dates_match.group(2)
 
-    location_match = re.search(r"Lieu\s+de\s+la\s+formation\s*:\s*([^\n\.]+)", normalized, flags=re.IGNORECASE)
+    location_match = document.search(r"Lieu\s+de\s+la\s+formation\s*:\s*([^\n\.]+)", ("2",), flags=re.IGNORECASE)
     if location_match:
         fields["location"] = location_match.group(1).strip()
 
-    signature_match = re.search(
+    signature_match = document.search(
         r"Fait\s+en\s+\d+\s+exemplaires?,\s+à\s+([^,\n]+),\s+le\s+(\d{4}-\d{2}-\d{2})",
-        normalized,
         flags=re.IGNORECASE,
     )
     if signature_match:
@@ -185,12 +293,12 @@ def extract_fixed_fields(text: str) -> dict[str, str | None]:
     return fields
 
 
-def extract_participants(text: str) -> list[str]:
-    normalized = text.replace("\r\n", "\n")
-    match = re.search(r"Article\s+3\s+[–-]\s+Participants(.*?)(Article\s+4|$)", normalized, flags=re.IGNORECASE | re.DOTALL)
-    if not match:
+def extract_participants(text: str | ConventionDocument) -> list[str]:
+    section = ConventionDocument.coerce(text).section_titled("Participants")
+    if section is None:
         return []
-    block = match.group(1)
+    # The article title line is not part of the list.
+    block = section.split("\n", 1)[1] if "\n" in section else ""
     names: list[str] = []
     for line in block.splitlines():
         if "•" not in line and "Participants" not in line:
@@ -209,13 +317,13 @@ def extract_participants(text: str) -> list[str]:
     return filtered
 
 
-def extract_client_contact(text: str) -> str | None:
-    normalized = text.replace("\r\n", "\n")
-    match = re.search(r"Pour\s+le\s+Client\s*:\s*(?:Nom\s*:\s*)?([^\n]+)", normalized, flags=re.IGNORECASE)
+def extract_client_contact(text: str | ConventionDocument) -> str | None:
+    match = ConventionDocument.coerce(text).search(
+        r"Pour\s+le\s+Client\s*:\s*(?:Nom\s*:\s*)?([^\n]+)", flags=re.IGNORECASE
+    )
     if match:
         return match.group(1).strip()
     return None
-    return names
 
 
 def format_date(value: str) -> str:
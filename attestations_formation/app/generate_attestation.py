@@ -6,13 +6,11 @@ from pathlib import Path
 from pypdf import PdfReader, PdfWriter
 from reportlab.pdfgen import canvas
 
+from app.acroform import fill_form_template
+from app.layout import CompiledLayout, DrawOp, compile_layout
+from app.xobject import render_attestation, render_attestations
 
-def _map_bbox_to_pdf(bbox: list[int], image_width: int, image_height: int, page_width: float, page_height: float, y_offset: int = 0) -> tuple[float, float]:
-    left, top, right, bottom = bbox
-    x = left / image_width * page_width
-    y_center = (top + bottom) / 2 + y_offset
-    y = page_height - (y_center / image_height * page_height)
-    return x, y
+BACKENDS = ("overlay", "acroform", "xobject")
 
 
 def _draw_text(c: canvas.Canvas, text: str, x: float, y: float, font_size: int) -> None:
@@ -25,40 +23,50 @@ def _draw_checkbox(c: canvas.Canvas, x: float, y: float, font_size: int) -> None
     c.drawString(x, y, "X")
 
 
-def generate_attestation_bytes(fields: dict[str, str], layout: dict) -> bytes:
-    template_path = Path(layout["template_pdf"])
+def _resolve_ops(ops: tuple[DrawOp, ...], fields: dict[str, str]) -> list[tuple[DrawOp, str]]:
+    resolved = []
+    for op in ops:
+        value = fields.get(op.field_id)
+        if op.kind == "checkbox":
+            value = "X" if value else ""
+        if not value:
+            continue
+        resolved.append((op, str(value)))
+    return resolved
+
+
+def generate_attestation_bytes(
+    fields: dict[str, str],
+    layout: dict | CompiledLayout,
+    backend: str = "overlay",
+    flatten: bool = True,
+) -> bytes:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown attestation backend '{backend}'.")
+    compiled = layout if isinstance(layout, CompiledLayout) else compile_layout(layout)
+    if backend == "acroform":
+        return fill_form_template(fields, compiled, flatten=flatten)
+    if backend == "xobject":
+        return render_attestation(fields, compiled)
     # Template path resolution is now handled by config settings
-    reader = PdfReader(str(template_path))
+    reader = PdfReader(compiled.template_source())
     writer = PdfWriter()
 
-    image_width = layout["image_width"]
-    image_height = layout["image_height"]
-
     for page_index, page in enumerate(reader.pages):
-        packet = io.BytesIO()
         page_width = float(page.mediabox.width)
         page_height = float(page.mediabox.height)
-        c = canvas.Canvas(packet, pagesize=(page_width, page_height))
+        draws = _resolve_ops(compiled.ops_for_page(page_index, page_width, page_height), fields)
+        if not draws:
+            writer.add_page(page)
+            continue
 
-        for entry in layout["fields"]:
-            field_id = entry["field_id"]
-            value = fields.get(field_id)
-            if entry.get("type") == "checkbox":
-                value = "X" if value else ""
-            if not value:
-                continue
-            x, y = _map_bbox_to_pdf(
-                entry["bbox"],
-                image_width,
-                image_height,
-                page_width,
-                page_height,
-                entry.get("y_offset", 0),
-            )
-            if entry.get("type") == "checkbox":
-                _draw_checkbox(c, x, y, entry.get("font_size", 12))
+        packet = io.BytesIO()
+        c = canvas.Canvas(packet, pagesize=(page_width, page_height))
+        for op, value in draws:
+            if op.kind == "checkbox":
+                _draw_checkbox(c, op.x, op.y, op.font_size)
             else:
-                _draw_text(c, str(value), x, y, entry.get("font_size", 12))
+                _draw_text(c, value, op.x, op.y, op.font_size)
 
         c.save()
         packet.seek(0)
@@ -71,7 +79,19 @@ def generate_attestation_bytes(fields: dict[str, str], layout: dict) -> bytes:
     return output.getvalue()
 
 
-def generate_attestation(fields: dict[str, str], layout: dict, output_path: Path) -> None:
-    data = generate_attestation_bytes(fields, layout)
+def generate_attestations_bytes(fields_list: list[dict[str, str]], layout: dict | CompiledLayout) -> bytes:
+    """All attestations in one PDF; the template is embedded once and shared by every page."""
+    compiled = layout if isinstance(layout, CompiledLayout) else compile_layout(layout)
+    return render_attestations(fields_list, compiled)
+
+
+def generate_attestation(
+    fields: dict[str, str],
+    layout: dict | CompiledLayout,
+    output_path: Path,
+    backend: str = "overlay",
+    flatten: bool = True,
+) -> None:
+    data = generate_attestation_bytes(fields, layout, backend=backend, flatten=flatten)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_bytes(data)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import hashlib
+import io
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+FIELD_TYPES = ("text", "checkbox")
+DEFAULT_FONT_SIZE = 12
+
+
+@dataclass(frozen=True)
+class LayoutField:
+    field_id: str
+    kind: str
+    x_ratio: float
+    y_ratio: float
+    font_size: int
+    page_index: int | None = None
+    width_ratio: float = 0.0
+    height_ratio: float = 0.0
+
+
+@dataclass(frozen=True)
+class DrawOp:
+    field_id: str
+    kind: str
+    x: float
+    y: float
+    font_size: int
+    width: float = 0.0
+    height: float = 0.0
+
+
+class CompiledLayout:
+    """Validated attestation layout, with field positions resolved per page."""
+
+    def __init__(self, template_pdf: str, fields: tuple[LayoutField, ...]):
+        self.template_pdf = template_pdf
+        self.fields = fields
+        self.template_data: bytes | None = None
+        self.form_template_data: bytes | None = None
+        self.template_forms = None
+        # Opens the template from memory shared with other processes (see shared_assets.py).
+        self.template_stream: Callable[[], BinaryIO] | None = None
+        self._ops: dict[tuple[int, float, float], tuple[DrawOp, ...]] = {}
+        self._fingerprint: str | None = None
+
+    def __getstate__(self) -> dict:
+        # Template bytes and parsed templates stay in the process that loaded them.
+        return {"template_pdf": self.template_pdf, "fields": self.fields}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["template_pdf"], state["fields"])
+
+    def warm(self) -> CompiledLayout:
+        """Keep the template bytes in memory so later renders skip the disk read."""
+        if self.template_data is None:
+            self.template_data = Path(self.template_pdf).read_bytes()
+        return self
+
+    def fingerprint(self) -> str:
+        """SHA-256 of the template bytes and the field positions: it changes whenever the output can.
+
+        Kept once the template is in memory; until then the file is hashed on
+        each call, since renders read it from disk too.
+        """
+        if self._fingerprint is not None:
+            return self._fingerprint
+        template = self.template_data if self.template_data is not None else Path(self.template_pdf).read_bytes()
+        digest = hashlib.sha256(template)
+        digest.update(repr(self.fields).encode("utf-8"))
+        if self.template_data is not None:
+            self._fingerprint = digest.hexdigest()
+        return digest.hexdigest()
+
+    def template_source(self) -> str | BinaryIO:
+        if self.template_stream is not None:
+            return self.template_stream()
+        if self.template_data is None:
+            return self.template_pdf
+        return io.BytesIO(self.template_data)
+
+    def fields_for_page(self, page_index: int) -> tuple[LayoutField, ...]:
+        return tuple(field for field in self.fields if field.page_index in (None, page_index))
+
+    def ops_for_page(self, page_index: int, page_width: float, page_height: float) -> tuple[DrawOp, ...]:
+        key = (page_index, page_width, page_height)
+        ops = self._ops.get(key)
+        if ops is None:
+            ops = tuple(
+                DrawOp(
+                    field_id=field.field_id,
+                    kind=field.kind,
+                    x=field.x_ratio * page_width,
+                    y=field.y_ratio * page_height,
+                    font_size=field.font_size,
+                    width=field.width_ratio * page_width,
+                    height=field.height_ratio * page_height,
+                )
+                for field in self.fields_for_page(page_index)
+            )
+            self._ops[key] = ops
+        return ops
+
+
+def compile_layout(layout: dict) -> CompiledLayout:
+    """Validate ``layout`` and resolve its fields; not cached, see ``Settings.compiled_attestation_layout``."""
+    template_pdf = layout.get("template_pdf")
+    if not template_pdf:
+        raise ValueError("Invalid layout: missing 'template_pdf'.")
+    image_width = _positive_number(layout.get("image_width"), "image_width")
+    image_height = _positive_number(layout.get("image_height"), "image_height")
+
+    fields: list[LayoutField] = []
+    seen: set[tuple[str, int | None]] = set()
+    for position, entry in enumerate(layout.get("fields", [])):
+        field_id = entry.get("field_id")
+        if not field_id:
+            raise ValueError(f"Invalid layout: field #{position} has no 'field_id'.")
+        kind = entry.get("type", "text")
+        if kind not in FIELD_TYPES:
+            raise ValueError(f"Invalid layout: unknown type '{kind}' for field '{field_id}'.")
+        bbox = entry.get("bbox")
+        if not isinstance(bbox, (list, tuple)) or len(bbox) != 4:
+            raise ValueError(f"Invalid layout: 'bbox' of field '{field_id}' must be [left, top, right, bottom].")
+        left, top, right, bottom = (float(value) for value in bbox)
+        if right <= left or bottom <= top:
+            raise ValueError(f"Invalid layout: 'bbox' of field '{field_id}' must have right > left and bottom > top.")
+        font_size = entry.get("font_size", DEFAULT_FONT_SIZE)
+        _positive_number(font_size, f"font_size of field '{field_id}'")
+        page = entry.get("page")
+        if page is not None and (not isinstance(page, int) or page < 1):
+            raise ValueError(f"Invalid layout: 'page' of field '{field_id}' must be a page number starting at 1.")
+        page_index = page - 1 if page is not None else None
+        if (field_id, page_index) in seen:
+            raise ValueError(f"Invalid layout: field '{field_id}' is declared twice on the same page.")
+        seen.add((field_id, page_index))
+
+        y_center = (top + bottom) / 2 + entry.get("y_offset", 0)
+        fields.append(
+            LayoutField(
+                field_id=field_id,
+                kind=kind,
+                x_ratio=left / image_width,
+                y_ratio=1 - y_center / image_height,
+                font_size=font_size,
+                page_index=page_index,
+                width_ratio=(right - left) / image_width,
+                height_ratio=(bottom - top) / image_height,
+            )
+        )
+    return CompiledLayout(str(template_pdf), tuple(fields))
+
+
+def _positive_number(value, name: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError(f"Invalid layout: '{name}' must be a positive number.")
+    return float(value)
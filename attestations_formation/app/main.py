@@ -1,4 +1,8 @@
+import io
+from functools import lru_cache
+
 from fastapi import FastAPI, File, HTTPException, UploadFile, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
@@ -6,13 +10,29 @@ from pydantic import ValidationError
 
 from app.config import get_settings, Settings
 from app.services import AttestationService
+from app.single_flight import SingleFlight
+from profiling import profiled_from_env
 
 app = FastAPI(title="Attestations Automatiques")
 
+
+@lru_cache(maxsize=1)
+def get_generation_flight() -> SingleFlight:
+    """Shared by every request of the worker: identical uploads are rendered once."""
+    return SingleFlight(ttl=get_settings().generation_result_ttl)
+
+
+def _render(service: AttestationService, content: bytes) -> tuple[bytes, str, str]:
+    with profiled_from_env("fastapi_generate"):
+        file_stream, filename, media_type = service.process_pdf(content)
+    return file_stream.getvalue(), filename, media_type
+
+
 @app.post("/generate")
 async def generate(
     file: UploadFile = File(...),
-    settings: Settings = Depends(get_settings)
+    settings: Settings = Depends(get_settings),
+    flight: SingleFlight = Depends(get_generation_flight),
 ):
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Le fichier doit etre un PDF.")
@@ -21,12 +41,14 @@ async def generate(
     
     try:
         content = await file.read()
-        file_stream, filename, media_type = service.process_pdf(content)
+        (data, filename, media_type), source = await run_in_threadpool(
+            flight.do, service.fingerprint(content), lambda: _render(service, content)
+        )
         
         return StreamingResponse(
-            file_stream,
+            io.BytesIO(data),
             media_type=media_type,
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            headers={"Content-Disposition": f'attachment; filename="{filename}"', "X-Result-Source": source},
         )
             
     except ValidationError as ve:
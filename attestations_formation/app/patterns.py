@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+
+PATTERN_FLAGS = re.IGNORECASE | re.MULTILINE
+DEFAULT_TIME_BUDGET_MS = 200
+
+_REPEATS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+_ANCHORS = (sre_parse.LITERAL, sre_parse.NOT_LITERAL, sre_parse.IN, sre_parse.AT)
+
+
+@dataclass(frozen=True)
+class PatternIssue:
+    field_id: str
+    pattern: str
+    severity: str  # "error" rejects the configuration, "warning" runs the pattern under guard
+    message: str
+
+
+@dataclass(frozen=True)
+class SlowPattern:
+    field_id: str
+    pattern: str
+    seconds: float
+    timed_out: bool
+
+
+class PatternTimeout(Exception):
+    pass
+
+
+def lint_pattern(pattern: str) -> list[tuple[str, str]]:
+    """Return ``(severity, message)`` pairs for a convention pattern."""
+    try:
+        parsed = sre_parse.parse(pattern, PATTERN_FLAGS)
+    except re.error as exc:
+        return [("error", f"invalid regular expression: {exc}")]
+    issues: list[tuple[str, str]] = []
+    _walk(list(parsed), following=None, inside_repeat=False, issues=issues)
+    return issues
+
+
+def validate_convention_config(config: dict) -> list[PatternIssue]:
+    """Lint every pattern of ``convention_patterns.json``.
+
+    Invalid or nested-quantifier patterns raise ``ValueError``; the other
+    findings are logged and returned as warnings.
+    """
+    issues = [
+        PatternIssue(field_id, pattern, severity, message)
+        for field_id, pattern in iter_patterns(config)
+        for severity, message in _cached_lint(pattern)
+    ]
+    errors = [issue for issue in issues if issue.severity == "error"]
+    if errors:
+        details = "; ".join(f"{issue.field_id}: {issue.pattern!r} ({issue.message})" for issue in errors)
+        raise ValueError(f"Invalid convention patterns: {details}")
+    for issue in issues:
+        logger.warning("Convention pattern for %s %r: %s", issue.field_id, issue.pattern, issue.message)
+    return issues
+
+
+def iter_patterns(config: dict):
+    """``(field_id, pattern)`` pairs of the generic fields and of every profile."""
+    sections = [config.get("fields", {})]
+    sections += [profile.get("fields", {}) for profile in config.get("profiles", {}).values()]
+    for fields in sections:
+        for field_id, spec in fields.items():
+            for pattern in spec.get("patterns", []):
+                yield field_id, pattern
+
+
+def time_budget(config: dict) -> float:
+    return config.get("pattern_time_budget_ms", DEFAULT_TIME_BUDGET_MS) / 1000
+
+
+def search_value(pattern: str, text: str, budget: float) -> str | None:
+    """Search ``pattern`` in ``text`` and return its ``value`` group (or group 1).
+
+    Patterns flagged by the linter run in a separate worker process that is
+    terminated after ``budget`` seconds (``PatternTimeout``); the others run
+    inline.
+    """
+    if _cached_lint(pattern):
+        return _guarded.search(pattern, text, budget)
+    return _search_value(pattern, text)
+
+
+def timed_search(field_id: str, pattern: str, text: str, budget: float, slow: list[SlowPattern] | None) -> str | None:
+    """``search_value`` with reporting: patterns over ``budget`` are logged and recorded in ``slow``."""
+    started = time.perf_counter()
+    try:
+        value = search_value(pattern, text, budget)
+        timed_out = False
+    except PatternTimeout:
+        value = None
+        timed_out = True
+    elapsed = time.perf_counter() - started
+    if timed_out or elapsed > budget:
+        logger.warning(
+            "Convention pattern for %s %r took %.3fs (budget %.3fs)%s",
+            field_id,
+            pattern,
+            elapsed,
+            budget,
+            ", skipped" if timed_out else "",
+        )
+        if slow is not None:
+            slow.append(SlowPattern(field_id, pattern, elapsed, timed_out))
+    return value
+
+
+def _search_value(pattern: str, text: str) -> str | None:
+    match = re.search(pattern, text, flags=PATTERN_FLAGS)
+    if not match:
+        return None
+    return match.groupdict().get("value") or match.group(1)
+
+
+@lru_cache(maxsize=512)
+def _cached_lint(pattern: str) -> tuple[tuple[str, str], ...]:
+    return tuple(lint_pattern(pattern))
+
+
+def _walk(items: list, following, inside_repeat: bool, issues: list[tuple[str, str]]) -> None:
+    for index, (op, av) in enumerate(items):
+        after = items[index + 1] if index + 1 < len(items) else following
+        if op in _REPEATS:
+            low, high, body = av
+            unbounded = high == sre_parse.MAXREPEAT
+            if unbounded and inside_repeat:
+                issues.append(("error", "nested quantifiers can backtrack catastrophically"))
+            if op == sre_parse.MIN_REPEAT and unbounded and not _is_anchor(after):
+                issues.append(("warning", "lazy span is not followed by a literal anchor"))
+            _walk(list(body), after, inside_repeat or high > 1, issues)
+        elif op == sre_parse.SUBPATTERN:
+            _walk(list(av[-1]), after, inside_repeat, issues)
+        elif op == sre_parse.BRANCH:
+            for branch in av[1]:
+                _walk(list(branch), after, inside_repeat, issues)
+
+
+def _is_anchor(item) -> bool:
+    if item is None:
+        return False
+    op, av = item
+    if op == sre_parse.SUBPATTERN:
+        body = list(av[-1])
+        return bool(body) and _is_anchor(body[0])
+    return op in _ANCHORS
+
+
+class _GuardedSearch:
+    """Single worker process for flagged patterns, restarted after a timeout."""
+
+    def __init__(self):
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def search(self, pattern: str, text: str, budget: float) -> str | None:
+        with self._lock:
+            if self._pool is None:
+                self._pool = multiprocessing.get_context().Pool(processes=1)
+            pending = self._pool.apply_async(_search_value, (pattern, text))
+            try:
+                return pending.get(timeout=budget)
+            except multiprocessing.TimeoutError:
+                self._pool.terminate()
+                self._pool = None
+                raise PatternTimeout(pattern) from None
+
+
+_guarded = _GuardedSearch()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lint the convention patterns file.")
+    parser.add_argument("path", nargs="?", default=None, help="Patterns file (default: CONVENTION_PATTERNS_FILE setting)")
+    args = parser.parse_args()
+
+    if args.path is None:
+        from app.config import get_settings
+
+        path = get_settings().convention_patterns_file
+    else:
+        path = args.path
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+
+    severities = []
+    for field_id, pattern in iter_patterns(config):
+        for severity, message in lint_pattern(pattern):
+            severities.append(severity)
+            print(f"[{severity}] {field_id}: {pattern} -> {message}")
+    if not severities:
+        print(f"No issue found in {path}")
+    raise SystemExit(1 if "error" in severities else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+
+FINGERPRINT_LINES = 20
+
+
+def header_fingerprint(lines: list[str], count: int = 1) -> str:
+    """Hash of the first ``count`` lines, case and digits ignored (reference numbers change per convention)."""
+    header = "\n".join(re.sub(r"\d", "#", line.lower()) for line in lines[:count])
+    return hashlib.sha256(header.encode("utf-8")).hexdigest()
+
+
+def match_profile(lines: list[str], config: dict) -> tuple[str, dict] | None:
+    """Return the first profile whose fingerprint matches the start of the document."""
+    head = lines[:FINGERPRINT_LINES]
+    head_text = "\n".join(head).lower()
+    for name, profile in config.get("profiles", {}).items():
+        fingerprint = profile.get("fingerprint", {})
+        keywords = fingerprint.get("keywords", [])
+        hashes = fingerprint.get("header_sha256", [])
+        if not keywords and not hashes:
+            continue
+        if keywords and not all(keyword.lower() in head_text for keyword in keywords):
+            continue
+        if hashes and header_fingerprint(head, fingerprint.get("header_lines", 1)) not in hashes:
+            continue
+        return name, profile
+    return None
+
+
+def profile_config(config: dict, profile: dict) -> dict:
+    """Extraction config restricted to ``profile``: only its fields are searched."""
+    derived = {key: value for key, value in config.items() if key not in ("fields", "profiles")}
+    derived["fields"] = profile.get("fields", {})
+    if "required" in profile:
+        derived["required"] = profile["required"]
+    return derived
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show the fingerprint of a convention and the profile it routes to.")
+    parser.add_argument("pdf", help="Path to the convention PDF")
+    parser.add_argument("--header-lines", type=int, default=1, help="Lines hashed for header_sha256")
+    args = parser.parse_args()
+
+    from app.config import get_settings
+    from app.extract_convention import extract_text, normalize_lines
+
+    lines = normalize_lines(extract_text(args.pdf, "fast"))
+    config = get_settings().convention_config
+    print("---- HEADER ----")
+    print("\n".join(lines[: args.header_lines]))
+    print(f"header_sha256: {header_fingerprint(lines, args.header_lines)}")
+    matched = match_profile(lines, config)
+    print(f"profile: {matched[0] if matched else '[none, every pattern is tried]'}")
+    if matched:
+        print(json.dumps(matched[1].get("fingerprint", {}), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import hashlib
 import tempfile
 from pathlib import Path
 import io
@@ -10,11 +11,30 @@ from app.schemas import ConventionData
 from app.extract_convention import extract_convention_data
 from app.generate_attestation import generate_attestation_bytes
 from app.utils import map_to_attestation_fields, sanitize_filename
+from zip_entries import write_zip_entry
 
 class AttestationService:
     def __init__(self, settings: Settings):
         self.settings = settings
 
+    def fingerprint(self, pdf_content: bytes) -> str:
+        """Key of a generation: the uploaded PDF plus the settings and files that change the output.
+
+        The layout (template and field positions) and the pattern config are
+        included, so editing either one stops identical uploads from being
+        served the previous result.
+        """
+        digest = hashlib.sha256(pdf_content)
+        options = (
+            self.settings.attestation_backend,
+            str(self.settings.attestation_flatten),
+            self.settings.extraction_backend,
+            self.settings.compiled_attestation_layout.fingerprint(),
+            self.settings.convention_config_fingerprint,
+        )
+        digest.update("|".join(options).encode("utf-8"))
+        return digest.hexdigest()
+
     def process_pdf(self, pdf_content: bytes) -> Tuple[io.BytesIO, str, str]:
         """
         Process the PDF content and return a tuple of (file_stream, filename, media_type).
@@ -23,7 +43,11 @@ class AttestationService:
             temp_pdf = Path(tmp_dir) / "convention.pdf"
             temp_pdf.write_bytes(pdf_content)
 
-            extracted_fields, participants = extract_convention_data(str(temp_pdf), self.settings.convention_config)
+            extracted_fields, participants = extract_convention_data(
+                str(temp_pdf),
+                self.settings.convention_config,
+                backend=self.settings.extraction_backend,
+            )
             
             # Validate shared data
             # If we have participants, 'beneficiary_name' is not yet in extracted_fields
@@ -36,14 +60,19 @@ class AttestationService:
             ConventionData(**validation_data)
 
             beneficiaries = participants or [extracted_fields.get("beneficiary_name", "beneficiaire")]
-            layout = self.settings.attestation_layout
+            layout = self.settings.compiled_attestation_layout
 
             if len(beneficiaries) == 1:
                 beneficiary = beneficiaries[0]
                 fields = dict(extracted_fields)
                 fields["beneficiary_name"] = beneficiary
                 attestation_fields = map_to_attestation_fields(fields)
-                pdf_bytes = generate_attestation_bytes(attestation_fields, layout)
+                pdf_bytes = generate_attestation_bytes(
+                    attestation_fields,
+                    layout,
+                    backend=self.settings.attestation_backend,
+                    flatten=self.settings.attestation_flatten,
+                )
                 filename = f"attestation_{sanitize_filename(beneficiary)}.pdf"
                 return io.BytesIO(pdf_bytes), filename, "application/pdf"
 
@@ -53,8 +82,13 @@ class AttestationService:
                     fields = dict(extracted_fields)
                     fields["beneficiary_name"] = beneficiary
                     attestation_fields = map_to_attestation_fields(fields)
-                    pdf_bytes = generate_attestation_bytes(attestation_fields, layout)
+                    pdf_bytes = generate_attestation_bytes(
+                        attestation_fields,
+                        layout,
+                        backend=self.settings.attestation_backend,
+                        flatten=self.settings.attestation_flatten,
+                    )
                     filename = f"attestation_{sanitize_filename(beneficiary)}.pdf"
-                    archive.writestr(filename, pdf_bytes)
+                    write_zip_entry(archive, filename, pdf_bytes)
             zip_buffer.seek(0)
             return zip_buffer, "attestations.zip", "application/zip"
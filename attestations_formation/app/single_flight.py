@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+COMPUTED = "computed"
+SHARED = "shared"
+CACHED = "cache"
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce concurrent computations that share a key.
+
+    The first caller for a key runs ``fn``; callers arriving while it runs
+    wait for that result instead of starting their own. Successful results
+    are then served from a small cache for ``ttl`` seconds (at most
+    ``max_entries`` of them). Errors are propagated to every waiter and are
+    never cached.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 16, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self._results: OrderedDict[str, tuple[float, T]] = OrderedDict()
+
+    def do(self, key: str, fn: Callable[[], T]) -> tuple[T, str]:
+        """Return ``(result, source)``, ``source`` being "computed", "shared" or "cache"."""
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                expires_at, value = cached
+                if expires_at > self._clock():
+                    self._results.move_to_end(key)
+                    return value, CACHED
+                del self._results[key]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, SHARED
+
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None and self.ttl > 0:
+                    self._results[key] = (self._clock() + self.ttl, call.value)
+                    while len(self._results) > self.max_entries:
+                        self._results.popitem(last=False)
+            call.done.set()
+        return call.value, COMPUTED
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
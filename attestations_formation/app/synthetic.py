@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from itertools import product
+from pathlib import Path
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+# "sls" mimics the shipped convention (matched by the "sls" profile), "generic"
+# uses the labels of the generic patterns, "acroform" has no text layer at all:
+# every value is in a form field.
+LAYOUTS = ("sls", "generic", "acroform")
+
+FIRST_NAMES = (
+    "Aurélia", "Sandra", "Eva", "Elaura", "Dimitri", "Laurent", "Chloé", "Hugo", "Manon", "Lucas", "Inès", "Théo",
+    "Camille", "Nathan", "Léa", "Jules", "Sarah", "Louis", "Emma", "Gabriel", "Zoé", "Arthur", "Jade", "Raphaël",
+    "Louise", "Noah", "Alice", "Adam", "Lina", "Paul",
+)
+LAST_NAMES = (
+    "Spinosi", "Cuny", "Thierry", "Lefevre", "De Cruz", "Martin", "Bernard", "Dubois", "Durand", "Moreau", "Laurent",
+    "Simon", "Michel", "Garcia", "David", "Bertrand", "Roux", "Vincent", "Fournier", "Morel", "Girard", "André",
+    "Mercier", "Dupont", "Lambert", "Bonnet", "François", "Martinez", "Legrand", "Garnier",
+)
+COMPANIES = ("Mon Coach Brico", "Atelier Dumas", "Boulangerie Roux", "Garage du Pic", "Optique Lunel", "Cave Saint-Jean")
+CITIES = ("MONTPELLIER", "LUNEL", "SÈTE", "NÎMES", "BÉZIERS", "MAUGUIO")
+TITLES = ("Bootcamp Commercial", "Manager son équipe", "Négociation avancée", "Relation client", "Prise de parole")
+ANNEX_WORDS = (
+    "formation", "stagiaire", "client", "prestataire", "convention", "facturation", "annulation", "report", "session",
+    "règlement", "présent", "document", "conditions", "générales", "applicables", "modalités", "délai", "jours",
+    "ouvrés", "remboursement", "propriété", "intellectuelle", "supports", "pédagogiques", "responsabilité",
+)
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+MARGIN = 56
+LEADING = 14
+# Embedded TrueType font shipped with reportlab: the standard Helvetica
+# encoding has no "•", which pypdf would extract as "\x7f".
+FONT = "Vera"
+# Participants per "•" line in the "sls" layout, so that no line wraps.
+NAMES_PER_LINE = 4
+
+
+@dataclass(frozen=True)
+class SyntheticConvention:
+    """A generated convention and the values extraction is expected to return for it."""
+
+    reference: str
+    provider_name: str
+    signatory_name: str
+    company_name: str
+    client_contact: str
+    action_title: str
+    duration: int
+    date_start: date
+    date_end: date
+    location: str
+    signature_date: date
+    participants: tuple[str, ...]
+    layout: str = "sls"
+    annex_pages: int = 0
+
+    def expected(self) -> dict:
+        """``fields`` and ``participants`` as returned by ``extract_convention``."""
+        fields = {
+            "provider_name": self.provider_name,
+            "signatory_name": self.signatory_name,
+            "company_name": self.company_name,
+            "action_title": self.action_title,
+            "date_start": f"{self.date_start:%d/%m/%Y}",
+            "date_end": f"{self.date_end:%d/%m/%Y}",
+            "location": self.location,
+            "signature_date": f"{self.signature_date:%d/%m/%Y}",
+            "beneficiary_name": self.participants[0],
+        }
+        if self.layout == "sls":
+            fields["duration"] = str(self.duration)
+            participants = list(self.participants)
+        else:
+            fields["duration"] = f"{self.duration} heures"
+            # Without a text layer there is no roster: only the first participant is in a field.
+            participants = list(self.participants) if self.layout == "generic" else []
+        return {"fields": fields, "participants": participants}
+
+
+def make_convention(
+    seed: int = 0, participants: int = 5, layout: str = "sls", annex_pages: int = 0
+) -> SyntheticConvention:
+    """Random but reproducible convention: the same arguments give the same convention."""
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown synthetic layout '{layout}'.")
+    if not 1 <= participants <= len(FIRST_NAMES) * len(LAST_NAMES):
+        raise ValueError(f"participants must be between 1 and {len(FIRST_NAMES) * len(LAST_NAMES)}.")
+    rng = random.Random(seed)
+    names = [f"{first} {last}" for first, last in rng.sample(list(product(FIRST_NAMES, LAST_NAMES)), participants)]
+    date_start = date(2025, 1, 6) + timedelta(days=rng.randrange(700))
+    return SyntheticConvention(
+        reference=f"SLS-{date_start:%Y%m%d}{rng.randrange(1, 10)}",
+        provider_name="Laurent Serre Développement",
+        signatory_name="Laurent Serre",
+        company_name=rng.choice(COMPANIES),
+        client_contact=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        action_title=rng.choice(TITLES),
+        duration=rng.choice((7, 14, 21, 35, 40)),
+        date_start=date_start,
+        date_end=date_start + timedelta(days=rng.randrange(1, 15)),
+        location=rng.choice(CITIES),
+        signature_date=date_start - timedelta(days=rng.randrange(5, 40)),
+        participants=tuple(names),
+        layout=layout,
+        annex_pages=annex_pages,
+    )
+
+
+def render_convention(convention: SyntheticConvention) -> bytes:
+    """PDF of the convention in its layout, followed by ``annex_pages`` pages of general conditions."""
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4, invariant=1)
+    if convention.layout == "acroform":
+        _draw_form(pdf, convention)
+        lines: list[str] = []
+    elif convention.layout == "generic":
+        lines = _generic_lines(convention)
+    else:
+        lines = _sls_lines(convention)
+    lines += _annex_lines(convention)
+    if lines:
+        _draw_lines(pdf, lines, f"CONVENTION DE FORMATION SLS - {convention.reference}" if convention.layout == "sls" else "")
+    pdf.save()
+    return buffer.getvalue()
+
+
+def write_convention(convention: SyntheticConvention, output_dir: str | Path, stem: str) -> tuple[Path, Path]:
+    """Write ``<stem>.pdf`` and the expected values in ``<stem>.json``."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    pdf_path = output_dir / f"{stem}.pdf"
+    json_path = output_dir / f"{stem}.json"
+    pdf_path.write_bytes(render_convention(convention))
+    expected = {"layout": convention.layout, "annex_pages": convention.annex_pages, **convention.expected()}
+    json_path.write_text(json.dumps(expected, ensure_ascii=False, indent=2), encoding="utf-8")
+    return pdf_path, json_path
+
+
+def _sls_lines(convention: SyntheticConvention) -> list[str]:
+    c = convention
+    lines = [
+        "CONDITIONS PARTICULIÈRES – TARIF EN VIGUEUR",
+        "Entre l'organisme de formation : la société SARL LAURENT SERRE, ayant son activité",
+        "au 259 rue de la Lavande, 34130 MAUGUIO, exerçant sous l'enseigne",
+        "LAURENT SERRE DÉVELOPPEMENT, et représentée par Laurent SERRE.",
+        f"Ci-après désigné « {c.provider_name} »",
+        f"Et : {c.company_name}, dont le siège social est situé à 12 rue du Commerce, 34400 Lunel",
+        "Représenté par",
+        f"{c.client_contact} en qualité de Dirigeant.",
+        "Ci-après désigné « le Client »",
+        "Article 1 – Objet de la convention",
+        "La présente convention a pour objet la réalisation d'une formation intitulée :",
+        c.action_title,
+        "Article 2 – Modalités d'exécution",
+        f"• Durée de la formation : {c.duration} heures de formation par personne.",
+        f"• Dates de formation : {c.date_start:%d/%m/%Y} au {c.date_end:%d/%m/%Y}.",
+        "• Lieu de la formation : Sur Site.",
+        "Article 3 – Participants",
+    ]
+    for start in range(0, len(c.participants), NAMES_PER_LINE):
+        lines.append("• " + ", ".join(c.participants[start : start + NAMES_PER_LINE]))
+    lines += [
+        "Article 4 – Conditions financières",
+        "• Montant HT : 6950 euros",
+        f"Fait en 2 exemplaires, à {c.location}, le {c.signature_date:%Y-%m-%d}",
+        "Pour le Client :",
+        f"Nom : {c.client_contact}",
+        "Pour le Prestataire :",
+        f"Nom : {c.signatory_name}",
+    ]
+    return lines
+
+
+def _generic_lines(convention: SyntheticConvention) -> list[str]:
+    c = convention
+    lines = [
+        "CONVENTION DE FORMATION PROFESSIONNELLE",
+        f"Organisme de formation : {c.provider_name}",
+        f"Je soussigné(e) {c.signatory_name}",
+        f"Entreprise : {c.company_name}",
+        f"Intitulé de l'action : {c.action_title}",
+        f"Date de début : {c.date_start:%d/%m/%Y}",
+        f"Date de fin : {c.date_end:%d/%m/%Y}",
+        f"Durée totale : {c.duration} heures",
+        f"Lieu : {c.location}",
+        f"Date de signature : {c.signature_date:%d/%m/%Y}",
+        "Article 1 – Participants",
+    ]
+    lines += [f"• {name}" for name in c.participants]
+    lines.append("Article 2 – Engagements")
+    return lines
+
+
+# Field names contain the labels of convention_patterns.json, in an order where
+# no short label ("du", "au") is found first in another field's name.
+def _form_values(convention: SyntheticConvention) -> list[tuple[str, str]]:
+    c = convention
+    return [
+        ("Date de début", f"{c.date_start:%d/%m/%Y}"),
+        ("Date de fin", f"{c.date_end:%d/%m/%Y}"),
+        ("Organisme de formation", c.provider_name),
+        ("Soussigné", c.signatory_name),
+        ("Entreprise", c.company_name),
+        ("Bénéficiaire", c.participants[0]),
+        ("Intitulé de l'action", c.action_title),
+        ("Durée", f"{c.duration} heures"),
+        ("Lieu", c.location),
+        ("Date de signature", f"{c.signature_date:%d/%m/%Y}"),
+    ]
+
+
+def _draw_form(pdf: canvas.Canvas, convention: SyntheticConvention) -> None:
+    y = PAGE_HEIGHT - MARGIN - 20
+    for name, value in _form_values(convention):
+        pdf.acroForm.textfield(name=name, value=value, x=MARGIN + 200, y=y, width=280, height=18, borderWidth=0)
+        y -= 28
+    pdf.showPage()
+
+
+def _annex_lines(convention: SyntheticConvention) -> list[str]:
+    rng = random.Random(convention.reference)
+    lines_per_page = int((PAGE_HEIGHT - 2 * MARGIN) // LEADING) - 1
+    lines = []
+    for page in range(convention.annex_pages):
+        lines.append(f"CONDITIONS GÉNÉRALES DE VENTE – ANNEXE {page + 1}")
+        for _ in range(lines_per_page - 1):
+            lines.append(" ".join(rng.choice(ANNEX_WORDS) for _ in range(12)).capitalize() + ".")
+    return lines
+
+
+def _draw_lines(pdf: canvas.Canvas, lines: list[str], header: str) -> None:
+    if FONT not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont(FONT, "Vera.ttf"))
+    y = 0.0
+    for index, line in enumerate(lines):
+        if index == 0 or y < MARGIN:
+            if index:
+                pdf.showPage()
+            y = PAGE_HEIGHT - MARGIN
+            if header:
+                pdf.setFont(FONT, 10)
+                pdf.drawString(MARGIN, y, header)
+                y -= LEADING
+        pdf.setFont(FONT, 10)
+        pdf.drawString(MARGIN, y, line)
+        y -= LEADING
+    pdf.showPage()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic conventions with their expected fields.")
+    parser.add_argument("--output", default="synthetic_conventions", help="Output directory")
+    parser.add_argument("--count", type=int, default=1, help="Conventions per layout")
+    parser.add_argument("--participants", type=int, nargs="+", default=[5], help="Participant counts")
+    parser.add_argument("--annex-pages", type=int, nargs="+", default=[0], help="Pages of general conditions")
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=list(LAYOUTS), help="Layout variants")
+    parser.add_argument("--seed", type=int, default=0, help="First random seed")
+    args = parser.parse_args()
+
+    seed = args.seed
+    written = 0
+    for layout, participants, annex_pages in product(args.layouts, args.participants, args.annex_pages):
+        for _ in range(args.count):
+            convention = make_convention(seed, participants, layout, annex_pages)
+            write_convention(convention, args.output, f"convention_{layout}_{participants}p_{annex_pages}a_{seed}")
+            seed += 1
+            written += 1
+    print(f"{written} conventions written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,11 @@ from __future__ import annotations
 
 from datetime import datetime
 import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pypdf import PdfWriter
+    from pypdf.generic import IndirectObject, PdfObject
 
 
 def map_to_attestation_fields(convention_fields: dict[str, str]) -> dict[str, str]:
@@ -30,3 +35,13 @@ def sanitize_filename(value: str, fallback: str = "beneficiaire") -> str:
     if not cleaned:
         cleaned = fallback
     return cleaned[:60]
+
+
+
+def add_indirect_object(writer: PdfWriter, obj: PdfObject) -> IndirectObject:
+    """Register ``obj`` in ``writer`` and return its indirect reference.
+
+    pypdf has no public method for this (checked on 5.0.0 and 6.20.1), so the
+    private ``PdfWriter._add_object`` is only called here.
+    """
+    return writer._add_object(obj)
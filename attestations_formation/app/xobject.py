@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import io
+import threading
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    FloatObject,
+    NameObject,
+    RectangleObject,
+)
+
+from app.layout import CompiledLayout, DrawOp, compile_layout
+from app.utils import add_indirect_object
+
+TEMPLATE_NAME = "/Tpl"
+FONT_NAME = "/F1"
+
+
+class TemplateForms:
+    """Template pages converted to Form XObjects, built once per process.
+
+    Cloning the forms into a writer reads the template's resources through
+    ``self.reader``, which is not thread-safe: ``lock`` serialises the clones
+    of concurrent renders sharing the same layout.
+    """
+
+    def __init__(self, compiled: CompiledLayout):
+        self.compiled = compiled
+        self.lock = threading.Lock()
+        self.reader = PdfReader(compiled.template_source())
+        self.pages: list[tuple[RectangleObject, DecodedStreamObject]] = []
+        for page in self.reader.pages:
+            contents = page.get_contents()
+            form = DecodedStreamObject()
+            form.set_data(contents.get_data() if contents is not None else b"")
+            form.update(
+                {
+                    NameObject("/Type"): NameObject("/XObject"),
+                    NameObject("/Subtype"): NameObject("/Form"),
+                    NameObject("/BBox"): ArrayObject([FloatObject(value) for value in page.mediabox]),
+                    NameObject("/Resources"): page["/Resources"],
+                }
+            )
+            self.pages.append((page.mediabox, form.flate_encode()))
+
+    def render(self, writer: PdfWriter, fields: dict[str, str], shared_objects: dict) -> None:
+        """Append one attestation to ``writer``.
+
+        ``shared_objects`` is owned by the caller and must only be reused with the
+        same ``writer``: it keeps the font and template objects already added to it.
+        """
+        shared = _shared_objects(writer, self, shared_objects)
+        for page_index, (mediabox, _) in enumerate(self.pages):
+            width = float(mediabox.width)
+            height = float(mediabox.height)
+            ops = self.compiled.ops_for_page(page_index, width, height)
+            content = DecodedStreamObject()
+            content.set_data(_content_stream(ops, fields))
+
+            page = writer.add_blank_page(width, height)
+            page[NameObject("/MediaBox")] = mediabox
+            page[NameObject("/Resources")] = DictionaryObject(
+                {
+                    NameObject("/XObject"): DictionaryObject({NameObject(TEMPLATE_NAME): shared["templates"][page_index]}),
+                    NameObject("/Font"): DictionaryObject({NameObject(FONT_NAME): shared["font"]}),
+                }
+            )
+            page[NameObject("/Contents")] = add_indirect_object(writer, content.flate_encode())
+
+
+def template_forms(compiled: CompiledLayout) -> TemplateForms:
+    if compiled.template_forms is None:
+        compiled.template_forms = TemplateForms(compiled)
+    return compiled.template_forms
+
+
+def render_attestation(fields: dict[str, str], layout: dict | CompiledLayout) -> bytes:
+    return render_attestations([fields], layout)
+
+
+def render_attestations(fields_list: list[dict[str, str]], layout: dict | CompiledLayout) -> bytes:
+    """One PDF holding every attestation; each page only adds its field text."""
+    compiled = layout if isinstance(layout, CompiledLayout) else compile_layout(layout)
+    forms = template_forms(compiled)
+    writer = PdfWriter()
+    shared_objects: dict = {}
+    for fields in fields_list:
+        forms.render(writer, fields, shared_objects)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def _shared_objects(writer: PdfWriter, forms: TemplateForms, cache: dict) -> dict:
+    shared = cache.get(forms)
+    if shared is None:
+        font = DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+                NameObject("/Encoding"): NameObject("/WinAnsiEncoding"),
+            }
+        )
+        shared = {"font": add_indirect_object(writer, font)}
+        with forms.lock:
+            shared["templates"] = [add_indirect_object(writer, form.clone(writer)) for _, form in forms.pages]
+        cache[forms] = shared
+    return shared
+
+
+def _content_stream(ops: tuple[DrawOp, ...], fields: dict[str, str]) -> bytes:
+    commands = [f"q {TEMPLATE_NAME} Do Q"]
+    for op in ops:
+        value = fields.get(op.field_id)
+        if op.kind == "checkbox":
+            value = "X" if value else ""
+        if not value:
+            continue
+        commands.append(
+            f"BT {FONT_NAME} {op.font_size} Tf {op.x:.2f} {op.y:.2f} Td ({_escape(str(value))}) Tj ET"
+        )
+    return "\n".join(commands).encode("cp1252", "replace")
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").replace("\r", " ").replace("\n", " ")
@@ -0,0 +1,48 @@
+import io
+
+import pytest
+from pypdf import PdfReader
+
+from app.acroform import build_form_template, fill_form_template, form_field_name
+from app.config import get_settings
+from app.generate_attestation import generate_attestation_bytes
+
+
+@pytest.fixture
+def compiled_layout():
+    return get_settings().compiled_attestation_layout
+
+
+def test_form_field_name_is_suffixed_on_multi_page_templates():
+    assert form_field_name("location", 0, 1) == "location"
+    assert form_field_name("location", 1, 3) == "location__p2"
+
+
+def test_build_form_template_declares_one_field_per_layout_entry(compiled_layout):
+    reader = PdfReader(io.BytesIO(build_form_template(compiled_layout)))
+
+    assert set(reader.get_fields()) == {field.field_id for field in compiled_layout.fields}
+
+
+def test_fill_form_template_without_flatten_keeps_values_in_fields(compiled_layout, sample_attestation_fields):
+    pdf_bytes = fill_form_template(sample_attestation_fields, compiled_layout, flatten=False)
+
+    values = PdfReader(io.BytesIO(pdf_bytes)).get_form_text_fields()
+    assert values["beneficiary_name"] == "Martin Durand"
+    assert values["checkbox_action_training"] == "X"
+
+
+def test_flattened_acroform_output_has_text_but_no_form(compiled_layout, sample_attestation_fields):
+    acroform = generate_attestation_bytes(sample_attestation_fields, compiled_layout, backend="acroform")
+
+    reader = PdfReader(io.BytesIO(acroform))
+    assert reader.get_fields() is None
+    assert "/Annots" not in reader.pages[0]
+    text = reader.pages[0].extract_text()
+    for value in sample_attestation_fields.values():
+        assert value in text
+
+
+def test_unknown_backend_is_rejected(compiled_layout, sample_attestation_fields):
+    with pytest.raises(ValueError, match="backend"):
+        generate_attestation_bytes(sample_attestation_fields, compiled_layout, backend="magic")
@@ -0,0 +1,20 @@
+import json
+import os
+
+from app import config
+
+
+def test_convention_config_is_validated_once_per_file_version(tmp_path, monkeypatch):
+    validated = []
+    monkeypatch.setattr(config, "validate_convention_config", validated.append)
+    path = tmp_path / "convention_patterns.json"
+    path.write_text(json.dumps({"fields": {"duration": {"patterns": ["Durée"]}}}), encoding="utf-8")
+
+    first = config._load_convention_config(str(path), path.stat().st_mtime_ns)
+    assert config._load_convention_config(str(path), path.stat().st_mtime_ns) is first
+    assert len(validated) == 1
+
+    path.write_text(json.dumps({"fields": {}}), encoding="utf-8")
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+    assert config._load_convention_config(str(path), path.stat().st_mtime_ns) == {"fields": {}}
+    assert len(validated) == 2
@@ -0,0 +1,40 @@
+from app.document import ConventionDocument
+from app.extract_convention import extract_fixed_fields, extract_participants
+
+TEXT = """CONVENTION DE FORMATION\r
+Et : ACME, dont le siège\r
+Article 1 – Objet\r
+La présente convention a pour objet la réalisation d'une formation intitulée : Vente\r
+Article 2 – Modalités\r
+• Durée de la formation : 14 heures de formation par personne.\r
+Article 3 – Participants\r
+• Jean Dupont, Marie Curie\r
+Article 4 – Conditions financières\r
+Article 4.2 - Sanction des formations\r
+Article 5 – Annexe\r
+Dates de formation : 01/02/2025 au 02/02/2025\r
+"""
+
+
+def test_sections_are_indexed_in_one_pass():
+    document = ConventionDocument(TEXT)
+
+    assert "\r" not in document.text
+    assert [section.number for section in document.sections] == ["1", "2", "3", "4", "4.2", "5"]
+    assert document.preamble.startswith("CONVENTION DE FORMATION")
+    assert "Sanction" in document.section("4")
+    assert "Annexe" not in document.section("4")
+    assert document.section("9") is None
+    assert document.lines[1] == "Et : ACME, dont le siège"
+
+
+def test_resolvers_read_their_section_and_fall_back_to_the_whole_text():
+    document = ConventionDocument(TEXT)
+
+    fields = extract_fixed_fields(document)
+
+    assert fields["company_name"] == "ACME"
+    assert fields["action_title"] == "Vente"
+    assert fields["duration"] == "14"
+    assert fields["date_start"] == "01/02/2025"
+    assert extract_participants(document) == ["Jean Dupont", "Marie Curie"]
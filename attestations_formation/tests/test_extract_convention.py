@@ -1,5 +1,7 @@
 from unittest.mock import MagicMock, patch
-from app.extract_convention import extract_fields, extract_convention_fields
+import pytest
+
+from app.extract_convention import extract_convention, extract_fields, extract_convention_fields
 
 def test_extract_fields_from_text(sample_config):
     text = """
@@ -40,3 +42,43 @@ def test_extract_convention_fields_full(mock_form, mock_text, sample_config):
     assert fields["beneficiary_name"] == "Stagiaire Test"
     assert fields["date_start"] == "01/01/2024"
     assert fields["duration"] == "35"
+
+
+COMPLETE_TEXT = """
+Entre Organisme Test Ci-après
+Client : Stagiaire Test
+formation intitulée : Formation Python
+Dates de formation : 01/01/2024 au 05/01/2024
+Durée de la formation : 35 heures
+"""
+
+
+@patch("app.extract_convention.extract_text")
+@patch("app.extract_convention.extract_form_fields")
+def test_auto_backend_keeps_fast_text_when_complete(mock_form, mock_text, sample_config):
+    mock_form.return_value = {}
+    mock_text.return_value = COMPLETE_TEXT
+
+    extraction = extract_convention("dummy.pdf", sample_config, "auto")
+
+    assert extraction.report.backend == "fast"
+    assert extraction.report.attempts == ["fast"]
+    assert extraction.fields["duration"] == "35"
+
+
+@patch("app.extract_convention.extract_text")
+@patch("app.extract_convention.extract_form_fields")
+def test_auto_backend_falls_back_to_layout_when_fields_are_missing(mock_form, mock_text, sample_config):
+    mock_form.return_value = {}
+    mock_text.side_effect = lambda path, backend: "Entre Organisme Test Ci-après" if backend == "fast" else COMPLETE_TEXT
+
+    extraction = extract_convention("dummy.pdf", sample_config, "auto")
+
+    assert extraction.report.backend == "layout"
+    assert extraction.report.attempts == ["fast", "layout"]
+    assert extraction.fields["beneficiary_name"] == "Stagiaire Test"
+
+
+def test_unknown_extraction_backend_is_rejected(sample_config):
+    with pytest.raises(ValueError, match="backend"):
+        extract_convention("dummy.pdf", sample_config, "ocr")
@@ -1,6 +1,11 @@
 import io
+import json
 from unittest.mock import MagicMock, patch
+import pytest
+
+from app.config import BASE_DIR, CONFIG_DIR
 from app.generate_attestation import generate_attestation_bytes
+from app.layout import compile_layout
 
 @patch("app.generate_attestation.PdfReader")
 @patch("app.generate_attestation.PdfWriter")
@@ -36,3 +41,16 @@ def test_generate_attestation_bytes_structure(mock_canvas, mock_writer, mock_rea
     
     assert pdf_bytes.startswith(b"%PDF")
     mock_canvas.assert_called()
+
+
+@pytest.mark.parametrize("backend", ["overlay", "acroform", "xobject"])
+def test_backends_are_byte_reproducible(backend, sample_attestation_fields):
+    # Shipped layout read directly: sample_settings patches Settings for the whole session.
+    layout = json.loads((CONFIG_DIR / "attestation_layout.json").read_text(encoding="utf-8"))
+    layout["template_pdf"] = str(BASE_DIR / layout["template_pdf"])
+    compiled = compile_layout(layout)
+
+    first = generate_attestation_bytes(sample_attestation_fields, compiled, backend=backend)
+
+    assert generate_attestation_bytes(sample_attestation_fields, compiled, backend=backend) == first
+    assert generate_attestation_bytes(sample_attestation_fields, compile_layout(layout), backend=backend) == first
@@ -0,0 +1,135 @@
+import io
+import json
+import os
+import pickle
+
+import pytest
+from pypdf import PdfReader
+
+from app.config import BASE_DIR, Settings, get_settings
+from app.generate_attestation import generate_attestation_bytes
+from app.layout import CompiledLayout, compile_layout
+
+
+def _layout(fields):
+    return {
+        "template_pdf": "template.pdf",
+        "image_width": 1000,
+        "image_height": 1000,
+        "fields": fields,
+    }
+
+
+def test_compile_layout_maps_bbox_to_points():
+    compiled = compile_layout(_layout([
+        {"field_id": "beneficiary_name", "bbox": [100, 200, 300, 220], "font_size": 10},
+        {"field_id": "date_start", "bbox": [100, 500, 300, 520], "y_offset": 10},
+    ]))
+
+    ops = compiled.ops_for_page(0, 500.0, 800.0)
+
+    assert [op.field_id for op in ops] == ["beneficiary_name", "date_start"]
+    assert ops[0].x == pytest.approx(50.0)
+    assert ops[0].y == pytest.approx(800 - 210 / 1000 * 800)
+    assert ops[0].font_size == 10
+    assert ops[1].y == pytest.approx(800 - 520 / 1000 * 800)
+    assert ops[1].font_size == 12
+
+
+def test_compile_layout_groups_fields_by_page():
+    compiled = compile_layout(_layout([
+        {"field_id": "everywhere", "bbox": [0, 0, 10, 10]},
+        {"field_id": "first", "bbox": [0, 0, 10, 10], "page": 1},
+        {"field_id": "second", "bbox": [0, 0, 10, 10], "page": 2},
+    ]))
+
+    assert [op.field_id for op in compiled.ops_for_page(0, 100, 100)] == ["everywhere", "first"]
+    assert [op.field_id for op in compiled.ops_for_page(1, 100, 100)] == ["everywhere", "second"]
+    assert [op.field_id for op in compiled.ops_for_page(2, 100, 100)] == ["everywhere"]
+
+
+def test_settings_compile_the_layout_once_per_file_version(tmp_path):
+    layout_file = tmp_path / "attestation_layout.json"
+    layout_file.write_text(json.dumps(_layout([{"field_id": "a", "bbox": [0, 0, 10, 10]}])), encoding="utf-8")
+    settings = Settings(_env_file=None, base_dir=tmp_path, attestation_layout_file=layout_file)
+
+    compiled = settings.compiled_attestation_layout
+    assert Settings(_env_file=None, base_dir=tmp_path, attestation_layout_file=layout_file).compiled_attestation_layout is compiled
+    assert compiled.template_pdf == str(tmp_path / "template.pdf")
+
+    layout_file.write_text(json.dumps(_layout([{"field_id": "b", "bbox": [0, 0, 10, 10]}])), encoding="utf-8")
+    os.utime(layout_file, ns=(layout_file.stat().st_atime_ns, layout_file.stat().st_mtime_ns + 1_000_000))
+    assert [field.field_id for field in settings.compiled_attestation_layout.fields] == ["b"]
+
+
+@pytest.mark.parametrize(
+    "overrides, message",
+    [
+        ({"template_pdf": ""}, "template_pdf"),
+        ({"image_width": 0}, "image_width"),
+        ({"fields": [{"bbox": [0, 0, 10, 10]}]}, "field_id"),
+        ({"fields": [{"field_id": "a", "bbox": [0, 0, 10]}]}, "bbox"),
+        ({"fields": [{"field_id": "a", "bbox": [10, 0, 5, 10]}]}, "right > left"),
+        ({"fields": [{"field_id": "a", "bbox": [0, 0, 10, 10], "type": "radio"}]}, "unknown type"),
+        ({"fields": [{"field_id": "a", "bbox": [0, 0, 10, 10], "page": 0}]}, "page"),
+        ({"fields": [{"field_id": "a", "bbox": [0, 0, 10, 10]}, {"field_id": "a", "bbox": [0, 0, 10, 10]}]}, "twice"),
+    ],
+)
+def test_compile_layout_rejects_invalid_entries(overrides, message):
+    layout = _layout([])
+    layout.update(overrides)
+    with pytest.raises(ValueError, match=message):
+        compile_layout(layout)
+
+
+def test_shipped_layout_renders_template(sample_attestation_fields):
+    settings = get_settings()
+    compiled = settings.compiled_attestation_layout
+    assert isinstance(compiled, CompiledLayout)
+    assert compiled.template_pdf == str(BASE_DIR / "certificat_de_realisation_281225.pdf")
+
+    pdf_bytes = generate_attestation_bytes(sample_attestation_fields, compiled)
+
+    text = PdfReader(io.BytesIO(pdf_bytes)).pages[0].extract_text()
+    assert "Martin Durand" in text
+
+
+def test_warm_layout_reads_template_from_memory(tmp_path):
+    template = tmp_path / "template.pdf"
+    template.write_bytes(b"%PDF-1.4 template")
+    compiled = compile_layout({**_layout([]), "template_pdf": str(template)})
+    assert compiled.template_source() == str(template)
+
+    compiled.warm()
+    template.unlink()
+
+    assert compiled.template_source().read() == b"%PDF-1.4 template"
+
+
+def test_pickled_layout_leaves_template_and_caches_behind(tmp_path):
+    template = tmp_path / "template.pdf"
+    template.write_bytes(b"%PDF-1.4 template")
+    compiled = compile_layout({**_layout([]), "template_pdf": str(template)}).warm()
+    compiled.template_stream = lambda: io.BytesIO(b"%PDF-1.4 shared")
+
+    copy = pickle.loads(pickle.dumps(compiled))
+
+    assert copy.fields == compiled.fields
+    assert copy.template_data is None and copy.template_stream is None
+    assert copy.template_source() == str(template)
+    assert compiled.template_source().read() == b"%PDF-1.4 shared"
+
+
+def test_fingerprint_follows_template_and_fields(tmp_path):
+    template = tmp_path / "template.pdf"
+    template.write_bytes(b"%PDF-1.4 template")
+    field = {"field_id": "beneficiary_name", "bbox": [100, 200, 300, 220]}
+    compiled = compile_layout({**_layout([field]), "template_pdf": str(template)})
+    first = compiled.fingerprint()
+
+    template.write_bytes(b"%PDF-1.4 new template")
+    moved = compile_layout({**_layout([{**field, "bbox": [100, 300, 300, 320]}]), "template_pdf": str(template)})
+
+    assert compiled.fingerprint() != first
+    assert compiled.warm().fingerprint() == compiled.fingerprint()
+    assert moved.fingerprint() not in (first, compiled.fingerprint())
@@ -0,0 +1,47 @@
+import pytest
+
+from app.patterns import lint_pattern, timed_search, validate_convention_config
+
+
+def test_shipped_style_patterns_are_clean():
+    assert lint_pattern(r"Durée\s*[:\-]?\s*(?P<value>[^\n]+)") == []
+    assert lint_pattern(r"Entre\s+(?P<value>.+?)\sCi-après") == []
+
+
+@pytest.mark.parametrize("pattern", [r"(a+)+$", r"(?P<value>(\w+\s?)*)\.", r"(x|\d+)*y"])
+def test_nested_quantifiers_are_errors(pattern):
+    assert ("error", "nested quantifiers can backtrack catastrophically") in lint_pattern(pattern)
+
+
+@pytest.mark.parametrize("pattern", [r"Entre\s+(?P<value>.+?)\s+Ci-après", r"Lieu\s*:\s*(?P<value>.*?)"])
+def test_unanchored_lazy_spans_are_warnings(pattern):
+    assert [severity for severity, _ in lint_pattern(pattern)] == ["warning"]
+
+
+def test_validate_rejects_invalid_and_nested_patterns():
+    config = {"fields": {"duration": {"patterns": [r"Durée\s*(?P<value>(\d+\s*)+)h"]}, "location": {"patterns": ["("]}}}
+
+    with pytest.raises(ValueError, match="duration.*location"):
+        validate_convention_config(config)
+
+
+def test_validate_returns_warnings(sample_config):
+    issues = validate_convention_config(sample_config)
+
+    assert [(issue.field_id, issue.severity) for issue in issues] == [("provider_name", "warning")]
+
+
+def test_flagged_pattern_runs_under_time_budget():
+    slow = []
+
+    value = timed_search("duration", r"(a+)+$", "a" * 40 + "b", 0.2, slow)
+
+    assert value is None
+    assert slow[0].field_id == "duration"
+    assert slow[0].timed_out
+
+
+def test_flagged_pattern_still_matches_within_budget():
+    text = "Entre Organisme Test Ci-après"
+
+    assert timed_search("provider_name", r"Entre\s+(?P<value>.+?)\s+Ci-après", text, 5, None) == "Organisme Test"
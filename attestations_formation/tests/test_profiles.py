@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+from app.extract_convention import extract_convention
+from app.profiles import header_fingerprint, match_profile, profile_config
+
+LINES = ["CONVENTION DE FORMATION ACME - REF-2024001", "Entre ACME Formation", "Ci-après désigné « ACME »"]
+
+
+def _config(sample_config, fingerprint, fields=None):
+    return {
+        **sample_config,
+        "profiles": {"acme": {"fingerprint": fingerprint, "fields": fields or {}, "fixed_fields": True}},
+    }
+
+
+def test_header_fingerprint_ignores_case_and_reference_numbers():
+    other = ["Convention de formation ACME - REF-2025999"]
+
+    assert header_fingerprint(LINES) == header_fingerprint(other)
+    assert header_fingerprint(LINES) != header_fingerprint(["CONVENTION DE FORMATION SLS"])
+
+
+def test_match_profile_by_keywords_or_header_hash(sample_config):
+    by_keywords = _config(sample_config, {"keywords": ["convention de formation acme", "Ci-après désigné"]})
+    by_hash = _config(sample_config, {"header_sha256": [header_fingerprint(LINES)]})
+
+    assert match_profile(LINES, by_keywords)[0] == "acme"
+    assert match_profile(LINES, by_hash)[0] == "acme"
+    assert match_profile(["CONVENTION DE FORMATION SLS"], by_keywords) is None
+
+
+def test_profile_config_only_keeps_profile_fields(sample_config):
+    profile = {"fields": {"duration": {"patterns": [r"(?P<value>\d+) heures"]}}}
+
+    restricted = profile_config(_config(sample_config, {}), profile)
+
+    assert list(restricted["fields"]) == ["duration"]
+    assert restricted["required"] == sample_config["required"]
+    assert "profiles" not in restricted
+
+
+TEXT = """CONVENTION DE FORMATION ACME - REF-2024001
+Entre Organisme Test Ci-après
+Client : Stagiaire Test
+formation intitulée : Formation Python
+Dates de formation : 01/01/2024 au 05/01/2024
+Durée de la formation : 35 heures
+"""
+
+
+@patch("app.extract_convention.extract_text", return_value=TEXT)
+@patch("app.extract_convention.extract_form_fields", return_value={})
+def test_extraction_routes_to_matching_profile(mock_form, mock_text, sample_config):
+    fields = {
+        "provider_name": {"patterns": [r"Entre\s+(?P<value>.+?)\sCi-après"]},
+        "beneficiary_name": {"patterns": [r"Client\s*:\s*(?P<value>.+)"]},
+    }
+    config = _config(sample_config, {"keywords": ["CONVENTION DE FORMATION ACME"]}, fields)
+
+    extraction = extract_convention("dummy.pdf", config, "fast")
+
+    assert extraction.report.profile == "acme"
+    assert extraction.fields["provider_name"] == "Organisme Test"
+
+
+@patch("app.extract_convention.extract_text", return_value=TEXT)
+@patch("app.extract_convention.extract_form_fields", return_value={})
+def test_incomplete_profile_falls_back_to_every_pattern(mock_form, mock_text, sample_config):
+    config = _config(sample_config, {"keywords": ["CONVENTION DE FORMATION ACME"]})
+
+    extraction = extract_convention("dummy.pdf", config, "fast")
+
+    assert extraction.report.profile is None
+    assert extraction.fields["beneficiary_name"] == "Stagiaire Test"
@@ -51,3 +51,22 @@ def test_process_pdf_multiple_participants(mock_generate, mock_extract, sample_s
     
     assert filename == "attestations.zip"
     assert media_type == "application/zip"
+
+
+def test_fingerprint_covers_layout_and_pattern_config():
+    def settings(layout_fingerprint="layout-1", patterns_fingerprint="patterns-1"):
+        layout = MagicMock()
+        layout.fingerprint.return_value = layout_fingerprint
+        return MagicMock(
+            attestation_backend="overlay",
+            attestation_flatten=True,
+            extraction_backend="auto",
+            compiled_attestation_layout=layout,
+            convention_config_fingerprint=patterns_fingerprint,
+        )
+
+    key = AttestationService(settings()).fingerprint(b"pdf")
+
+    assert AttestationService(settings()).fingerprint(b"pdf") == key
+    assert AttestationService(settings(layout_fingerprint="layout-2")).fingerprint(b"pdf") != key
+    assert AttestationService(settings(patterns_fingerprint="patterns-2")).fingerprint(b"pdf") != key
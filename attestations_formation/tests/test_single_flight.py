@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from app.single_flight import SingleFlight
+
+
+class _CountingEvent(threading.Event):
+    """Event that counts the threads blocked in ``wait``."""
+
+    def __init__(self):
+        super().__init__()
+        self.waiting = threading.Semaphore(0)
+
+    def wait(self, timeout=None):
+        self.waiting.release()
+        return super().wait(timeout)
+
+
+def test_concurrent_calls_share_one_computation():
+    flight = SingleFlight(ttl=0)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return b"zip"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("key", compute)))
+    leader.start()
+    started.wait(5)
+    # Followers wait on the leader's call; release it only once all four are blocked,
+    # otherwise a late follower (ttl=0, nothing cached) would become a new leader.
+    done = flight._calls["key"].done = _CountingEvent()
+    followers = [threading.Thread(target=lambda: results.append(flight.do("key", compute))) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    for _ in followers:
+        assert done.waiting.acquire(timeout=5)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(source for _, source in results) == ["computed"] + ["shared"] * 4
+    assert {value for value, _ in results} == {b"zip"}
+
+
+def test_results_are_cached_for_ttl():
+    now = [0.0]
+    flight = SingleFlight(ttl=10, clock=lambda: now[0])
+
+    assert flight.do("key", lambda: 1) == (1, "computed")
+    assert flight.do("key", lambda: 2) == (1, "cache")
+    now[0] = 11
+    assert flight.do("key", lambda: 3) == (3, "computed")
+
+
+def test_cache_is_bounded():
+    flight = SingleFlight(ttl=60, max_entries=2)
+    for key in "abc":
+        flight.do(key, lambda: key)
+
+    assert flight.do("a", lambda: "again") == ("again", "computed")
+
+
+def test_errors_are_not_cached():
+    flight = SingleFlight(ttl=60)
+
+    def fail():
+        raise ValueError("Missing required fields")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    assert flight.do("key", lambda: "ok") == ("ok", "computed")
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from app.config import BASE_DIR
+from app.extract_convention import extract_convention
+from app.synthetic import make_convention, render_convention, write_convention
+
+
+@pytest.fixture
+def convention_config():
+    with (BASE_DIR / "config" / "convention_patterns.json").open(encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+@pytest.mark.parametrize(
+    ("layout", "participants", "annex_pages"),
+    [("sls", 5, 0), ("sls", 200, 3), ("generic", 40, 2), ("acroform", 5, 0)],
+)
+def test_extraction_matches_expected_fields(tmp_path, convention_config, layout, participants, annex_pages):
+    pdf_path, json_path = write_convention(make_convention(7, participants, layout, annex_pages), tmp_path, "convention")
+    expected = json.loads(json_path.read_text(encoding="utf-8"))
+
+    extraction = extract_convention(str(pdf_path), convention_config, "fast")
+
+    assert extraction.fields == expected["fields"]
+    assert extraction.participants == expected["participants"]
+    assert extraction.report.profile == ("sls" if layout == "sls" else None)
+
+
+def test_synthetic_conventions_are_reproducible():
+    first = make_convention(3, 12, "generic", 1)
+
+    assert make_convention(3, 12, "generic", 1) == first
+    assert make_convention(4, 12, "generic", 1) != first
+    assert render_convention(first) == render_convention(make_convention(3, 12, "generic", 1))
+    assert len(set(first.participants)) == 12
+
+
+def test_unknown_layout_is_rejected():
+    with pytest.raises(ValueError, match="layout"):
+        make_convention(layout="scanned")
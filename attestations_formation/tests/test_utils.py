@@ -26,3 +26,4 @@ def test_map_to_attestation_fields_no_date():
     mapped = map_to_attestation_fields(input_fields)
     # Should fallback to current date
     assert mapped["signature_date"] == datetime.now().strftime("%d/%m/%Y")
+
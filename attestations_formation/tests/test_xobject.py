@@ -0,0 +1,69 @@
+import io
+import json
+import threading
+
+import pytest
+from pypdf import PdfReader
+
+from app.config import BASE_DIR, CONFIG_DIR
+from app.generate_attestation import generate_attestation_bytes, generate_attestations_bytes
+from app.layout import CompiledLayout, compile_layout
+from app.xobject import template_forms
+
+
+@pytest.fixture
+def compiled_layout():
+    # Read the shipped layout directly: sample_settings patches Settings for the whole session.
+    layout = json.loads((CONFIG_DIR / "attestation_layout.json").read_text(encoding="utf-8"))
+    layout["template_pdf"] = str(BASE_DIR / layout["template_pdf"])
+    return compile_layout(layout)
+
+
+def test_xobject_backend_draws_template_and_fields(compiled_layout, sample_attestation_fields):
+    pdf_bytes = generate_attestation_bytes(sample_attestation_fields, compiled_layout, backend="xobject")
+
+    page = PdfReader(io.BytesIO(pdf_bytes)).pages[0]
+    text = page.extract_text()
+    assert "Cachet et signature" in text
+    assert "Martin Durand" in text
+    assert "/Tpl" in page["/Resources"]["/XObject"]
+
+
+def test_template_forms_are_built_once_per_layout(compiled_layout):
+    assert template_forms(compiled_layout) is template_forms(compiled_layout)
+
+
+def test_combined_pdf_shares_the_template(compiled_layout, sample_attestation_fields):
+    single = generate_attestations_bytes([sample_attestation_fields], compiled_layout)
+    combined = generate_attestations_bytes([sample_attestation_fields] * 20, compiled_layout)
+
+    reader = PdfReader(io.BytesIO(combined))
+    assert len(reader.pages) == 20
+    templates = {page["/Resources"]["/XObject"].raw_get("/Tpl").idnum for page in reader.pages}
+    assert len(templates) == 1
+    assert (len(combined) - len(single)) / 19 < 1024
+
+
+def test_concurrent_renders_on_one_layout_give_identical_pdfs(compiled_layout, sample_attestation_fields):
+    # A fresh layout: its template forms are built by the racing threads themselves.
+    layout = CompiledLayout(compiled_layout.template_pdf, compiled_layout.fields).warm()
+    barrier = threading.Barrier(8)
+    outputs, errors = [], []
+
+    def render():
+        barrier.wait()
+        for _ in range(5):
+            try:
+                outputs.append(generate_attestation_bytes(sample_attestation_fields, layout, backend="xobject"))
+            except Exception as exc:  # noqa: BLE001 - collected for the assertion below
+                errors.append(exc)
+
+    threads = [threading.Thread(target=render) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(outputs) == 40
+    assert len(set(outputs)) == 1
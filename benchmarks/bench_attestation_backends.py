@@ -0,0 +1,82 @@
+"""Compare les backends de rendu des attestations (overlay, AcroForm, XObject).
+
+    python benchmarks/bench_attestation_backends.py [--count 50]
+
+Génère `--count` attestations avec chaque backend (après un premier rendu
+de chauffe qui compile le layout et construit le template de formulaire)
+et affiche le temps moyen par attestation et la taille des PDF. La derniere
+ligne mesure le PDF combine (`generate_attestations_bytes`) : taille ajoutee
+par attestation une fois le template embarque.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "attestations_formation"))
+
+from app.config import get_settings  # noqa: E402
+from app.generate_attestation import generate_attestation_bytes, generate_attestations_bytes  # noqa: E402
+from app.utils import map_to_attestation_fields  # noqa: E402
+
+VARIANTS = (
+    ("overlay", "overlay", True),
+    ("acroform", "acroform", True),
+    ("acroform (non aplati)", "acroform", False),
+    ("xobject", "xobject", True),
+)
+
+
+def _fields(index: int) -> dict[str, str]:
+    return map_to_attestation_fields(
+        {
+            "signatory_name": "Laurent Serre",
+            "provider_name": "Laurent Serre Développement",
+            "beneficiary_name": f"Participant {index:03d}",
+            "company_name": "ACME",
+            "action_title": "Bootcamp Commercial",
+            "date_start": "10/12/2025",
+            "date_end": "19/12/2025",
+            "duration": "40",
+            "location": "Montpellier",
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=50)
+    args = parser.parse_args()
+
+    layout = get_settings().compiled_attestation_layout.warm()
+    print(f"{'backend':<22} | {'ms / attestation':>16} | {'p95 (ms)':>8} | {'taille (Ko)':>11}")
+    print("-" * 67)
+    for label, backend, flatten in VARIANTS:
+        generate_attestation_bytes(_fields(0), layout, backend=backend, flatten=flatten)
+        timings = []
+        size = 0
+        for index in range(args.count):
+            started = time.perf_counter()
+            size = len(generate_attestation_bytes(_fields(index), layout, backend=backend, flatten=flatten))
+            timings.append(time.perf_counter() - started)
+        p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        print(
+            f"{label:<22} | {statistics.mean(timings) * 1000:>16.1f} | {p95 * 1000:>8.1f} | {size / 1024:>11.0f}"
+        )
+
+    fields = [_fields(index) for index in range(args.count)]
+    single = len(generate_attestations_bytes(fields[:1], layout))
+    started = time.perf_counter()
+    combined = len(generate_attestations_bytes(fields, layout))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{'xobject (PDF combine)':<22} | {elapsed / args.count * 1000:>16.1f} | {'-':>8} | {combined / 1024:>11.0f}"
+    )
+    if args.count > 1:
+        print(f"\nPDF combine : +{(combined - single) / (args.count - 1):.0f} octets par attestation supplementaire")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Débit de l'extraction des conventions, sur des conventions synthétiques.
+
+    python benchmarks/bench_extraction.py [--participants 5 50 200] [--annex-pages 0 10 30] [--repeat 3]
+
+Génère avec `app.synthetic` une convention par combinaison de mise en page
+(`sls`, `generic`, `acroform`), de nombre de participants et de pages
+d'annexes, puis mesure `extract_convention` (backend `auto`) : temps médian,
+pages par seconde, backend et profil retenus, et si les champs et les
+participants extraits correspondent au JSON attendu (`ok`, `écart` ou
+l'erreur levée).
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "attestations_formation"))
+
+from app.config import BASE_DIR  # noqa: E402
+from app.extract_convention import extract_convention  # noqa: E402
+from app.synthetic import LAYOUTS, make_convention, write_convention  # noqa: E402
+from pypdf import PdfReader  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--participants", type=int, nargs="+", default=[5, 50, 200])
+    parser.add_argument("--annex-pages", type=int, nargs="+", default=[0, 10, 30])
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=list(LAYOUTS))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    config = json.loads((BASE_DIR / "config" / "convention_patterns.json").read_text(encoding="utf-8"))
+    print(
+        f"{'layout':<9} | {'part.':>5} | {'pages':>5} | {'médiane (ms)':>12} | {'pages/s':>8} | "
+        f"{'backend':<8} | {'profil':<7} | résultat"
+    )
+    print("-" * 92)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for layout in args.layouts:
+            for participants in args.participants:
+                for annex_pages in args.annex_pages:
+                    convention = make_convention(participants, participants, layout, annex_pages)
+                    stem = f"{layout}_{participants}_{annex_pages}"
+                    pdf_path, json_path = write_convention(convention, tmpdir, stem)
+                    expected = json.loads(json_path.read_text(encoding="utf-8"))
+                    pages = len(PdfReader(pdf_path).pages)
+                    timings = []
+                    backend = profile = "-"
+                    for _ in range(args.repeat):
+                        started = time.perf_counter()
+                        try:
+                            extraction = extract_convention(str(pdf_path), config, "auto")
+                        except ValueError as exc:
+                            outcome = f"erreur : {exc}"
+                            timings.append(time.perf_counter() - started)
+                            continue
+                        timings.append(time.perf_counter() - started)
+                        backend = extraction.report.backend
+                        profile = extraction.report.profile or "-"
+                        matches = (
+                            extraction.fields == expected["fields"]
+                            and extraction.participants == expected["participants"]
+                        )
+                        outcome = "ok" if matches else "écart"
+                    median = statistics.median(timings)
+                    print(
+                        f"{layout:<9} | {participants:>5} | {pages:>5} | {median * 1000:>12.1f} | "
+                        f"{pages / median:>8.0f} | {backend:<8} | {profile:<7} | {outcome}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+"""Charge HTTP sur l'API (`/api/generate`) et sur l'application FastAPI (`/generate`).
+
+    python benchmarks/bench_load.py api [--concurrence 1 4 8] [--requetes 24] [--profil presence:5:3 --profil tout:20:1]
+    python benchmarks/bench_load.py fastapi [--concurrence 1 4] [--profil sls:5 --profil generic:50]
+    python benchmarks/bench_load.py --comparer [api|fastapi]
+
+Pour chaque niveau de concurrence, lance le serveur visé dans un sous-processus
+sur un port local libre (`serveur_local.py`, ou `uvicorn app.main:app` dans
+`attestations_formation/`), lui envoie une requête de chauffe non comptée, puis
+`--requetes` requêtes avec autant de clients simultanés que la concurrence
+(boucle fermée : chaque client renvoie une requête dès qu'il a sa réponse).
+Tout reste sur la machine : aucun service extérieur n'est appelé.
+
+Profils `type:participants[:poids]`, tirés au hasard (graine fixe) selon leur poids :
+- cible `api` : `type` est la sélection de documents (`presence`,
+  `questionnaire`, `attestation`, séparés par des virgules, ou `tout`) ;
+- cible `fastapi` : `type` est la mise en page de la convention synthétique
+  envoyée (`sls`, `generic`, `acroform`, voir `app.synthetic`).
+
+Chaque requête est différente (société ou convention propre), et le serveur est
+lancé avec le cache de résultats désactivé (`GENERATE_RESULT_TTL=0`,
+`GENERATION_RESULT_TTL=0`) et un dossier de pré-génération vide : on mesure le
+rendu, pas le cache. `--identiques` envoie au contraire la même requête partout.
+
+Affiche le débit (réponses réussies par seconde), les latences p50/p95/p99, le
+taux d'erreur (statut hors 2xx, délai dépassé, connexion refusée) et le pic de
+mémoire résidente du serveur (`VmHWM`, Linux). Les résultats sont ajoutés à
+`benchmarks/results/load_<commit>.json` (dossier ignoré par git) ; `--comparer`
+les affiche tous, triés par date de commit. Pour mesurer un ancien commit avec
+ce script : `git worktree add /tmp/ancien <commit>` puis `--racine /tmp/ancien`.
+"""
+import argparse
+import http.client
+import itertools
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+sys.path.insert(0, str(ROOT / "attestations_formation"))
+
+from app.synthetic import LAYOUTS, make_convention, render_convention  # noqa: E402
+
+DEFAULT_PROFILES = {"api": ["presence:5:3", "tout:20:1"], "fastapi": ["sls:5:3", "generic:20:1"]}
+DOCUMENT_TYPES = ("presence", "questionnaire", "attestation")
+# Trees older than `serveur_local.py` only have the Vercel handler.
+FALLBACK_API_SERVER = """
+import sys
+from http.server import ThreadingHTTPServer
+sys.path.insert(0, sys.argv[1] + "/api")
+import generate
+ThreadingHTTPServer(("127.0.0.1", int(sys.argv[2])), generate.handler).serve_forever()
+"""
+
+
+def parse_profile(value: str, target: str) -> tuple[str, int, int]:
+    """`type:participants[:poids]` -> (type, participants, poids)."""
+    parts = value.split(":")
+    try:
+        if len(parts) not in (2, 3):
+            raise ValueError
+        kind, participants, weight = parts[0], int(parts[1]), int(parts[2]) if len(parts) == 3 else 1
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Profil invalide '{value}' (format : type:participants[:poids]).")
+    if participants < 1 or weight < 1:
+        raise argparse.ArgumentTypeError(f"Profil invalide '{value}' : participants et poids doivent être >= 1.")
+    if target == "fastapi" and kind not in LAYOUTS:
+        raise argparse.ArgumentTypeError(f"Mise en page inconnue '{kind}' ({', '.join(LAYOUTS)}).")
+    if target == "api" and kind != "tout" and not set(kind.split(",")) <= set(DOCUMENT_TYPES):
+        raise argparse.ArgumentTypeError(f"Documents inconnus '{kind}' ({', '.join(DOCUMENT_TYPES)} ou tout).")
+    return kind, participants, weight
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Percentile par rang le plus proche (0 si aucune valeur)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _multipart(name: str, filename: str | None, content_type: str | None, data: bytes) -> tuple[bytes, str]:
+    boundary = f"----charge{uuid.uuid4().hex}"
+    disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else "")
+    head = f"--{boundary}\r\nContent-Disposition: {disposition}\r\n"
+    if content_type:
+        head += f"Content-Type: {content_type}\r\n"
+    body = head.encode() + b"\r\n" + data + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def _api_request(kind: str, participants: int, index: int) -> tuple[str, bytes, str]:
+    payload = {
+        "company": f"Charge {index:05d}",
+        "training": "Bootcamp Commercial",
+        "duration": "21",
+        "location": "Montpellier",
+        "dates": ["08/12/2025", "09/12/2025", "10/12/2025"],
+        "participants": [f"Participant {number:03d}" for number in range(1, participants + 1)],
+    }
+    if kind != "tout":
+        payload["documents"] = kind
+    body, content_type = _multipart("data", None, None, json.dumps(payload).encode())
+    return "/api/generate", body, content_type
+
+
+def _fastapi_request(kind: str, participants: int, index: int) -> tuple[str, bytes, str]:
+    pdf = render_convention(make_convention(index, participants, kind))
+    body, content_type = _multipart("file", "convention.pdf", "application/pdf", pdf)
+    return "/generate", body, content_type
+
+
+def build_requests(target: str, profiles: list, count: int, identical: bool, seed: int = 0) -> list[tuple]:
+    """`count` + 1 requêtes (la première sert de chauffe) : (profil, chemin, corps, Content-Type)."""
+    rng = random.Random(seed)
+    chosen = rng.choices(profiles, weights=[weight for _, _, weight in profiles], k=count + 1)
+    make = _api_request if target == "api" else _fastapi_request
+    requests = []
+    for index, (kind, participants, _) in enumerate(chosen):
+        if identical and requests:
+            requests.append(requests[0])
+            continue
+        requests.append((f"{kind}:{participants}", *make(kind, participants, index)))
+    return requests
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(target: str, root: Path, port: int, workers: int, scratch: Path) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "GENERATE_RESULT_TTL": "0",
+        "GENERATION_RESULT_TTL": "0",
+        "PREGENERATED_DIR": str(scratch / "pregenerated"),
+        "GENERATE_BLOB_DIR": str(scratch / "blobs"),
+    }
+    if target == "fastapi":
+        command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"]
+        cwd = root / "attestations_formation"
+    elif (root / "serveur_local.py").exists():
+        queue_size = str(max(64, workers * 4))
+        command = [sys.executable, "serveur_local.py", "--port", str(port), "--workers", str(workers),
+                   "--file-attente", queue_size]
+        cwd = root
+    else:
+        command = [sys.executable, "-c", FALLBACK_API_SERVER, str(root), str(port)]
+        cwd = root
+    process = subprocess.Popen(command, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Le serveur {target} s'est arrêté au démarrage (code {process.returncode}).")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            connection.request("GET", "/")
+            connection.getresponse().read()
+            connection.close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"Le serveur {target} ne répond pas sur le port {port}.")
+
+
+def peak_rss_mb(pid: int) -> float | None:
+    try:
+        status = Path(f"/proc/{pid}/status").read_text()
+    except OSError:
+        return None
+    for line in status.splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) / 1024
+    return None
+
+
+def _send(port: int, connection, request: tuple, timeout: float):
+    """Envoie une requête ; renvoie (connexion réutilisable ou None, statut, latence)."""
+    _, path, body, content_type = request
+    started = time.perf_counter()
+    try:
+        if connection is None:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+        connection.request("POST", path, body, {"Content-Type": content_type})
+        response = connection.getresponse()
+        response.read()
+        status = response.status
+        if response.will_close:
+            connection.close()
+            connection = None
+    except (OSError, http.client.HTTPException):
+        if connection is not None:
+            connection.close()
+        connection, status = None, 0
+    return connection, status, time.perf_counter() - started
+
+
+def run_load(port: int, requests: list[tuple], concurrency: int, timeout: float) -> tuple[list[tuple], float]:
+    """Envoie `requests` avec `concurrency` clients ; renvoie [(profil, statut, latence)] et la durée totale."""
+    indexes = itertools.count()
+    results = []
+    lock = threading.Lock()
+
+    def client() -> None:
+        connection = None
+        while (index := next(indexes)) < len(requests):
+            connection, status, latency = _send(port, connection, requests[index], timeout)
+            with lock:
+                results.append((requests[index][0], status, latency))
+        if connection is not None:
+            connection.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+
+def summarize(results: list[tuple], elapsed: float) -> dict:
+    ok = [latency for _, status, latency in results if 200 <= status < 300]
+    by_profile = {}
+    for profile in sorted({profile for profile, _, _ in results}):
+        latencies = [latency for name, status, latency in results if name == profile and 200 <= status < 300]
+        by_profile[profile] = {
+            "requests": sum(1 for name, _, _ in results if name == profile),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        }
+    return {
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "error_rate": round((len(results) - len(ok)) / len(results), 4) if results else 0.0,
+        "statuses": {str(status): sum(1 for _, s, _ in results if s == status) for status in sorted({s for _, s, _ in results})},
+        "throughput_rps": round(len(ok) / elapsed, 3) if elapsed else 0.0,
+        "p50_ms": round(percentile(ok, 50) * 1000, 1),
+        "p95_ms": round(percentile(ok, 95) * 1000, 1),
+        "p99_ms": round(percentile(ok, 99) * 1000, 1),
+        "elapsed_s": round(elapsed, 3),
+        "profiles": by_profile,
+    }
+
+
+def git_revision(root: Path) -> dict:
+    def git(*args: str) -> str:
+        try:
+            return subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD") or "inconnu",
+        "subject": git("log", "-1", "--format=%s"),
+        "date": git("log", "-1", "--format=%cI"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def record(revision: dict, runs: list[dict], results_dir: Path = RESULTS_DIR) -> Path:
+    """Ajoute les mesures au fichier du commit."""
+    results_dir.mkdir(parents=True, exist_ok=True)
+    path = results_dir / f"load_{revision['commit']}{'-modifie' if revision['dirty'] else ''}.json"
+    existing = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {**revision, "runs": []}
+    existing["runs"].extend(runs)
+    path.write_text(json.dumps(existing, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def _row(label: str, run: dict) -> str:
+    rss = f"{run['peak_rss_mb']:.0f}" if run.get("peak_rss_mb") is not None else "-"
+    return (
+        f"{label:<16} | {run['concurrency']:>5} | {run['throughput_rps']:>6.2f} | {run['p50_ms']:>8.0f} | "
+        f"{run['p95_ms']:>8.0f} | {run['p99_ms']:>8.0f} | {run['error_rate'] * 100:>7.1f} | {rss:>8} | "
+        f"{' '.join(run['profile_specs'])}"
+    )
+
+
+HEADER = (
+    f"{'commit':<16} | {'conc.':>5} | {'req/s':>6} | {'p50 (ms)':>8} | {'p95 (ms)':>8} | {'p99 (ms)':>8} | "
+    f"{'erreurs %':>7} | {'RSS (Mo)':>8} | profils"
+)
+
+
+def compare(target: str | None, results_dir: Path = RESULTS_DIR) -> None:
+    """Tableau de toutes les mesures enregistrées, un bloc par cible, commits par date."""
+    files = [json.loads(path.read_text(encoding="utf-8")) for path in sorted(results_dir.glob("load_*.json"))]
+    if not files:
+        print(f"Aucun résultat dans {results_dir}.")
+        return
+    files.sort(key=lambda data: data.get("date") or "")
+    for name in (target,) if target else ("api", "fastapi"):
+        rows = [
+            _row(data["commit"] + ("*" if data.get("dirty") else ""), run)
+            for data in files
+            for run in data["runs"]
+            if run["target"] == name
+        ]
+        if rows:
+            print(f"\n{name}  (* : copie de travail modifiée)")
+            print(HEADER)
+            print("-" * len(HEADER))
+            print("\n".join(rows))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cible", nargs="?", choices=("api", "fastapi"))
+    parser.add_argument("--concurrence", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--requetes", type=int, default=24, help="Requêtes mesurées par niveau de concurrence")
+    parser.add_argument("--profil", action="append", default=None, help="type:participants[:poids], répétable")
+    parser.add_argument("--workers", type=int, default=8, help="Threads de serveur_local.py (cible api)")
+    parser.add_argument("--identiques", action="store_true", help="Même requête partout (cache et regroupement)")
+    parser.add_argument("--delai", type=float, default=300, help="Délai maximal d'une requête en secondes")
+    parser.add_argument("--racine", type=Path, default=ROOT, help="Arbre à mesurer (worktree d'un autre commit)")
+    parser.add_argument("--sans-enregistrer", action="store_true", help="N'écrit pas benchmarks/results/")
+    parser.add_argument("--comparer", action="store_true", help="Affiche les résultats enregistrés")
+    args = parser.parse_args()
+
+    if args.comparer:
+        compare(args.cible)
+        return
+    if args.cible is None:
+        parser.error("indiquez la cible (api ou fastapi) ou --comparer.")
+    specs = args.profil or DEFAULT_PROFILES[args.cible]
+    try:
+        profiles = [parse_profile(spec, args.cible) for spec in specs]
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+    root = args.racine.resolve()
+    revision = git_revision(root)
+
+    requests = build_requests(args.cible, profiles, args.requetes, args.identiques)
+    print(f"{args.cible} @ {revision['commit']}{' (modifié)' if revision['dirty'] else ''} : {revision['subject']}")
+    print(HEADER)
+    print("-" * len(HEADER))
+    runs = []
+    for concurrency in args.concurrence:
+        port = _free_port()
+        with tempfile.TemporaryDirectory() as scratch:
+            process = start_server(args.cible, root, port, args.workers, Path(scratch))
+            try:
+                run_load(port, requests[:1], 1, args.delai)
+                results, elapsed = run_load(port, requests[1:], concurrency, args.delai)
+                peak = peak_rss_mb(process.pid)
+            finally:
+                process.terminate()
+                try:
+                    process.wait(30)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+        run = {
+            "target": args.cible,
+            "concurrency": concurrency,
+            "profile_specs": specs,
+            "identical": args.identiques,
+            "workers": args.workers if args.cible == "api" else None,
+            "measured_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            **summarize(results, elapsed),
+            "peak_rss_mb": round(peak, 1) if peak is not None else None,
+        }
+        runs.append(run)
+        print(_row(revision["commit"], run))
+
+    if not args.sans_enregistrer:
+        print(f"Résultats ajoutés à {record(revision, runs)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Temps de génération d'une feuille de présence selon le nombre de dates.
+
+    python benchmarks/bench_presence_sheet.py [--repeat 5]
+
+Compare le tableau unique (découpé par reportlab) au mode session longue
+(LongTable découpée explicitement par page) pour 5, 30 et 120 dates. Le
+temps par date doit rester à peu près constant en mode session longue.
+"""
+import argparse
+import io
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from generateur_feuilles import build_presence_sheet  # noqa: E402
+
+DATE_COUNTS = (5, 30, 120)
+
+
+def _dates(count: int) -> list[str]:
+    start = date(2025, 1, 6)
+    return [(start + timedelta(days=offset)).strftime("%d/%m/%Y") for offset in range(count)]
+
+
+def _measure(count: int, long_session: bool, repeat: int) -> float:
+    dates = _dates(count)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        build_presence_sheet(
+            io.BytesIO(), "ACME", "Alice Martin", "40", "Paris", "Bootcamp", dates, long_session=long_session
+        )
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'dates':>6} | {'mode':<12} | {'médiane (ms)':>12} | {'ms / date':>9}")
+    print("-" * 50)
+    for long_session, label in ((False, "table"), (True, "longtable")):
+        for count in DATE_COUNTS:
+            elapsed = _measure(count, long_session, args.repeat)
+            print(f"{count:>6} | {label:<12} | {elapsed * 1000:>12.1f} | {elapsed * 1000 / count:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Mémoire des workers de génération, avec ou sans fichiers partagés.
+
+    python benchmarks/bench_shared_assets.py [--workers 1 2 4] [--count 24]
+
+Pour chaque nombre de workers, rend `--count` attestations (backend xobject)
+dans un pool de processus de deux façons :
+- « chargé par worker » : chaque worker lit les réglages, compile le layout
+  et garde le template en mémoire (`warm()`) ;
+- « partagé » : le parent charge le template et la signature une fois
+  (`shared_assets.SharedAssets`) et les workers les projettent avec `attach`.
+
+Affiche le temps total et, par worker, la mémoire privée (`RssAnon`) et la
+mémoire partagée projetée (`RssFile` + `RssShmem`) lues dans
+`/proc/self/status` (Linux uniquement).
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT), str(ROOT / "attestations_formation")]
+
+from app.config import get_settings  # noqa: E402
+from app.generate_attestation import generate_attestation_bytes  # noqa: E402
+from app.utils import map_to_attestation_fields  # noqa: E402
+from shared_assets import SharedAssets, attach, shared_layout  # noqa: E402
+
+_layout = None
+
+
+def _load_per_worker() -> None:
+    global _layout
+    _layout = get_settings().compiled_attestation_layout.warm()
+
+
+def _render(index: int) -> tuple[int, dict[str, int]]:
+    layout = shared_layout() or _layout
+    fields = map_to_attestation_fields(
+        {
+            "signatory_name": "Laurent Serre",
+            "provider_name": "Laurent Serre Développement",
+            "beneficiary_name": f"Participant {index:03d}",
+            "company_name": "ACME",
+            "action_title": "Bootcamp Commercial",
+            "date_start": "10/12/2025",
+            "date_end": "19/12/2025",
+            "duration": "40",
+            "location": "Montpellier",
+        }
+    )
+    generate_attestation_bytes(fields, layout, backend="xobject")
+    return os.getpid(), _memory()
+
+
+def _memory() -> dict[str, int]:
+    values = {}
+    for line in Path("/proc/self/status").read_text().splitlines():
+        key, _, value = line.partition(":")
+        if key in ("RssAnon", "RssFile", "RssShmem"):
+            values[key] = int(value.split()[0])
+    return values
+
+
+def _run(workers: int, count: int, shared: bool) -> tuple[float, float, float]:
+    started = time.perf_counter()
+    if shared:
+        assets = SharedAssets(
+            {"signature": ROOT / "signature.png"}, layout=get_settings().compiled_attestation_layout
+        )
+        initializer, initargs = attach, (assets.handle,)
+    else:
+        assets = None
+        initializer, initargs = _load_per_worker, ()
+    try:
+        with ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs) as pool:
+            results = dict(pool.map(_render, range(count)))
+    finally:
+        if assets is not None:
+            assets.close()
+    elapsed = time.perf_counter() - started
+    private = statistics.mean(memory["RssAnon"] for memory in results.values())
+    mapped = statistics.mean(memory["RssFile"] + memory["RssShmem"] for memory in results.values())
+    return elapsed, private / 1024, mapped / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--count", type=int, default=24)
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} | {'mode':<18} | {'total (s)':>9} | {'privée / worker (Mo)':>20} | {'projetée (Mo)':>13}")
+    print("-" * 80)
+    for workers in args.workers:
+        for label, shared in (("chargé par worker", False), ("partagé", True)):
+            elapsed, private, mapped = _run(workers, args.count, shared)
+            print(f"{workers:>7} | {label:<18} | {elapsed:>9.2f} | {private:>20.1f} | {mapped:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import hashlib
+import importlib
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Protocol
+from urllib.parse import quote
+
+BLOB_KEY = re.compile(r"^[0-9a-f]{64}\.zip$")
+
+
+class BlobStore(Protocol):
+    """Storage for archives too large to be returned in the HTTP response.
+
+    ``put`` returns the key of the stored bytes and ``url`` the address the
+    client downloads them from. A store backed by an object storage service
+    returns its own (signed) URLs; ``get`` is only used for stores whose
+    ``url`` points back to ``GET /api/generate``.
+    """
+
+    def put(self, data: bytes) -> str: ...
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def url(self, key: str, filename: str) -> str: ...
+
+
+class LocalBlobStore:
+    """Archives kept as files named after their SHA-256 and served by ``GET /api/generate``.
+
+    Identical archives (generation is reproducible) share one file, whose
+    age restarts each time it is stored again. Files older than ``max_age``
+    seconds are removed on the next ``put``.
+    """
+
+    def __init__(self, root: str | Path, max_age: float = 3600.0):
+        self.root = Path(root)
+        self.max_age = max_age
+
+    def put(self, data: bytes) -> str:
+        key = f"{hashlib.sha256(data).hexdigest()}.zip"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._prune()
+        path = self.root / key
+        try:
+            # Requested again: restart its time to live instead of letting it expire.
+            os.utime(path)
+            return key
+        except FileNotFoundError:
+            pass
+        # One temporary file per call: concurrent puts (threads included) never share it.
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, prefix=key, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return key
+
+    def get(self, key: str) -> bytes | None:
+        if not BLOB_KEY.match(key):
+            return None
+        path = self.root / key
+        return path.read_bytes() if path.exists() else None
+
+    def url(self, key: str, filename: str) -> str:
+        return f"/api/generate?download={key}&filename={quote(filename)}"
+
+    def _prune(self) -> None:
+        deadline = time.time() - self.max_age
+        for path in self.root.glob("*.zip"):
+            try:
+                if path.stat().st_mtime < deadline:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+
+
+def load_blob_store() -> BlobStore:
+    """Store named by ``GENERATE_BLOB_STORE`` (``module:factory``), the local one by default."""
+    spec = os.environ.get("GENERATE_BLOB_STORE", "").strip()
+    if spec:
+        module_name, _, factory_name = spec.partition(":")
+        if not factory_name:
+            raise ValueError("GENERATE_BLOB_STORE must look like 'module:factory'.")
+        return getattr(importlib.import_module(module_name), factory_name)()
+    root = os.environ.get("GENERATE_BLOB_DIR") or Path(tempfile.gettempdir()) / "documents_formation_blobs"
+    return LocalBlobStore(root, max_age=float(os.environ.get("GENERATE_BLOB_TTL", "3600")))
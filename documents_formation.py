@@ -0,0 +1,527 @@
+"""
+Registre des documents produits pour une session de formation.
+
+Chaque type de document (feuille de présence, questionnaire, attestation)
+est déclaré une fois dans `DOCUMENT_TYPES` avec son dossier dans le ZIP et la
+fonction qui rend le PDF d'un participant. `build_archive` parcourt les
+participants une seule fois et n'appelle que les générateurs demandés : un
+nouveau type de document se branche avec `register_document_type`, sans
+recopier la boucle.
+
+Les modules de rendu (reportlab, pypdf, attestations) ne sont importés qu'au
+premier rendu d'un document qui en a besoin.
+
+Utilisation en ligne de commande :
+
+    python documents_formation.py --societe ACME --formation Vente --duree 14 \\
+        --lieu Paris --dates 01/12/2025,02/12/2025 \\
+        --participants "Alice Martin,Bob Durand" --documents attestation
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+import time
+import zipfile
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
+from datetime import datetime
+from itertools import repeat
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from zip_entries import write_zip_entry
+
+# Valeurs par défaut communes à l'API, à Streamlit et à la pré-génération : elles
+# entrent dans `session_fingerprint`, une autre graphie écarterait les ZIP pré-générés.
+DEFAULT_PROVIDER = "Laurent-Serre-Développement"
+DEFAULT_SIGNATORY = "Laurent Serre"
+
+@dataclass(frozen=True)
+class TrainingSession:
+    """Informations communes à tous les documents d'une session."""
+
+    company: str
+    training: str
+    duration: str
+    location: str
+    dates: tuple[str, ...]
+    participants: tuple[str, ...]
+    provider: str = DEFAULT_PROVIDER
+    signatory: str = DEFAULT_SIGNATORY
+    logo_path: str | None = None
+    # Layout compilé et réglages des attestations : chargés depuis
+    # `app.config.get_settings()` s'ils ne sont pas fournis.
+    attestation_layout: object | None = None
+    attestation_backend: str | None = None
+    attestation_flatten: bool | None = None
+
+    @property
+    def date_bounds(self) -> tuple[str, str]:
+        return select_date_bounds(self.dates)
+
+
+@dataclass(frozen=True)
+class DocumentType:
+    key: str
+    label: str
+    folder: str
+    # (session, participant) -> (nom du fichier dans `folder`, contenu du PDF)
+    render: Callable[[TrainingSession, str], tuple[str, bytes]]
+    # Le type s'appuie sur le module `attestations_formation/app`.
+    needs_attestation_module: bool = False
+
+
+DOCUMENT_TYPES: dict[str, DocumentType] = {}
+
+# Tailles fixes du format ZIP : en-tête local (+ descripteur), entrée du
+# répertoire central et fin de répertoire.
+ZIP_ENTRY_BYTES = 30 + 16 + 46
+ZIP_DIRECTORY_ENTRY_BYTES = 46
+ZIP_END_BYTES = 22
+
+
+def register_document_type(document_type: DocumentType) -> DocumentType:
+    """Ajoute un type de document ; l'ordre d'enregistrement est celui du ZIP."""
+    if document_type.key in DOCUMENT_TYPES:
+        raise ValueError(f"Document type '{document_type.key}' is already registered.")
+    DOCUMENT_TYPES[document_type.key] = document_type
+    return document_type
+
+
+def parse_documents(value: str | Iterable[str] | None) -> tuple[str, ...]:
+    """
+    Normalise une sélection de documents (`"presence,attestation"` ou liste).
+
+    Une sélection vide ou absente désigne tous les types. Le résultat suit
+    l'ordre du registre, sans doublon ; un type inconnu ou un élément qui
+    n'est pas une chaîne lève `ValueError`.
+    """
+    if value is None:
+        return tuple(DOCUMENT_TYPES)
+    if isinstance(value, str):
+        value = value.split(",")
+    value = list(value)
+    if not all(isinstance(item, str) for item in value):
+        raise ValueError("Invalid documents selection.")
+    requested = {item.strip() for item in value if item and item.strip()}
+    if not requested:
+        return tuple(DOCUMENT_TYPES)
+    unknown = sorted(requested - DOCUMENT_TYPES.keys())
+    if unknown:
+        raise ValueError(
+            f"Unknown document type(s): {', '.join(unknown)}. Expected: {', '.join(DOCUMENT_TYPES)}."
+        )
+    return tuple(key for key in DOCUMENT_TYPES if key in requested)
+
+
+def build_archive(
+    session: TrainingSession,
+    documents: Iterable[str] | None = None,
+    progress: Callable[[dict], None] | None = None,
+    workers: int | None = None,
+) -> bytes:
+    """
+    Rend les documents demandés pour chaque participant et renvoie le ZIP.
+
+    Les entrées sont rangées par participant puis dans l'ordre du registre,
+    chacune dans le dossier de son type. Avec `workers` > 1, les participants
+    sont rendus par un pool de processus (voir `build_archive_parts`).
+    """
+    return build_archive_parts(session, documents, progress=progress, workers=workers)[0]
+
+
+def build_archive_parts(
+    session: TrainingSession,
+    documents: Iterable[str] | None = None,
+    max_part_bytes: int | None = None,
+    progress: Callable[[dict], None] | None = None,
+    workers: int | None = None,
+) -> list[bytes]:
+    """
+    Comme `build_archive`, en découpant le ZIP en parties d'environ
+    `max_part_bytes` octets au plus.
+
+    La taille est suivie au fil du rendu : une partie est close avant le
+    participant qui la ferait dépasser, si bien que les documents d'un même
+    participant restent dans la même partie (un participant seul peut donc
+    dépasser la limite). Sans limite, une seule partie est produite.
+
+    `progress` reçoit un événement (dictionnaire sérialisable en JSON) au
+    départ (`start`), après chaque document (`document`) et après chaque
+    participant (`participant`), avec les durées en secondes.
+
+    Avec `workers` > 1, chaque participant est rendu dans un pool de
+    `workers` processus. Le template d'attestation, le layout compilé et la
+    signature sont chargés une fois ici et partagés avec les workers
+    (`shared_assets.py`) ; le ZIP est écrit dans l'ordre des participants et
+    reste identique à celui d'un rendu séquentiel. Les événements
+    `document` d'un participant arrivent alors ensemble.
+    """
+    document_types = [DOCUMENT_TYPES[key] for key in parse_documents(documents)]
+    total = len(session.participants) * len(document_types)
+    if progress is not None:
+        progress(
+            {
+                "event": "start",
+                "participants": len(session.participants),
+                "documents": [document_type.key for document_type in document_types],
+                "total": total,
+            }
+        )
+    completed = 0
+    parts: list[bytes] = []
+    buffer = io.BytesIO()
+    archive = zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED)
+    directory_bytes = ZIP_END_BYTES
+    pool = ExitStack()
+    rendered = None
+    if workers is not None and workers > 1 and len(session.participants) > 1:
+        rendered = _render_in_pool(pool, session, document_types, workers)
+    with pool:
+        for participant_index, participant in enumerate(session.participants):
+            participant_started = time.perf_counter()
+            entries = []
+            participant_documents = next(rendered) if rendered is not None else None
+            for position, document_type in enumerate(document_types):
+                if participant_documents is None:
+                    started = time.perf_counter()
+                    filename, pdf_bytes = document_type.render(session, participant)
+                    seconds = round(time.perf_counter() - started, 4)
+                else:
+                    filename, pdf_bytes, seconds = participant_documents[position]
+                entries.append((f"{document_type.folder}/{filename}", pdf_bytes))
+                completed += 1
+                if progress is not None:
+                    progress(
+                        {
+                            "event": "document",
+                            "participant": participant,
+                            "participant_index": participant_index,
+                            "document": document_type.key,
+                            "label": document_type.label,
+                            "seconds": seconds,
+                            "completed": completed,
+                            "total": total,
+                        }
+                    )
+            # Les PDF sont déjà compressés : leur taille brute majore l'entrée.
+            estimate = sum(len(pdf_bytes) + 2 * len(name) + ZIP_ENTRY_BYTES for name, pdf_bytes in entries)
+            if max_part_bytes is not None and archive.filelist and buffer.tell() + directory_bytes + estimate > max_part_bytes:
+                archive.close()
+                parts.append(buffer.getvalue())
+                buffer = io.BytesIO()
+                archive = zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED)
+                directory_bytes = ZIP_END_BYTES
+            for name, pdf_bytes in entries:
+                write_zip_entry(archive, name, pdf_bytes)
+                directory_bytes += len(name) + ZIP_DIRECTORY_ENTRY_BYTES
+            if progress is not None:
+                progress(
+                    {
+                        "event": "participant",
+                        "participant": participant,
+                        "participant_index": participant_index,
+                        "seconds": round(time.perf_counter() - participant_started, 4),
+                        "completed": completed,
+                        "total": total,
+                    }
+                )
+    archive.close()
+    parts.append(buffer.getvalue())
+    return parts
+
+
+def _render_in_pool(
+    stack: ExitStack, session: TrainingSession, document_types: list[DocumentType], workers: int
+) -> Iterator[list[tuple[str, bytes, float]]]:
+    """Rendus des participants par un pool de processus, dans l'ordre des participants."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    from shared_assets import SharedAssets, attach
+
+    layout = None
+    if any(document_type.needs_attestation_module for document_type in document_types):
+        layout, backend, flatten = _attestation_settings(session)
+        session = replace(session, attestation_backend=backend, attestation_flatten=flatten)
+    files = {}
+    signature = Path(__file__).resolve().parent / "signature.png"
+    if signature.exists():
+        files["signature"] = signature
+    assets = stack.enter_context(SharedAssets(files, layout=layout))
+    executor = stack.enter_context(
+        ProcessPoolExecutor(min(workers, len(session.participants)), initializer=attach, initargs=(assets.handle,))
+    )
+    # Le layout est transmis une fois par worker avec les fichiers partagés, pas à chaque participant.
+    task_session = replace(session, attestation_layout=None)
+    keys = tuple(document_type.key for document_type in document_types)
+    return executor.map(_render_participant, repeat(task_session), session.participants, repeat(keys))
+
+
+def _render_participant(session: TrainingSession, participant: str, keys: tuple[str, ...]) -> list[tuple[str, bytes, float]]:
+    from shared_assets import shared_layout
+
+    layout = shared_layout()
+    if layout is not None:
+        session = replace(session, attestation_layout=layout)
+    rendered = []
+    for key in keys:
+        started = time.perf_counter()
+        filename, pdf_bytes = DOCUMENT_TYPES[key].render(session, participant)
+        rendered.append((filename, pdf_bytes, round(time.perf_counter() - started, 4)))
+    return rendered
+
+
+def session_from_payload(payload: dict, logo_path: str | None = None) -> tuple[TrainingSession, tuple[str, ...]]:
+    """
+    Session et documents décrits par le JSON `data` de l'API (ou une ligne
+    d'un fichier de sessions) : dates et participants en texte séparé par des
+    virgules ou des retours à la ligne, ou en listes.
+
+    Lève `ValueError` si un champ obligatoire manque ou si un type de document
+    est inconnu.
+    """
+    def text(key: str, default: str = "") -> str:
+        return str(payload.get(key) or default).strip()
+
+    session = TrainingSession(
+        company=text("company"),
+        training=text("training"),
+        duration=text("duration"),
+        location=text("location"),
+        dates=tuple(normalize_dates(_split(payload.get("dates")))),
+        participants=tuple(_split(payload.get("participants"))),
+        provider=text("provider", DEFAULT_PROVIDER),
+        signatory=text("signatory", DEFAULT_SIGNATORY),
+        logo_path=logo_path,
+    )
+    required = (session.company, session.training, session.duration, session.location, session.dates, session.participants)
+    if not all(required):
+        raise ValueError("Missing required fields.")
+    documents = payload.get("documents")
+    if documents is not None and not isinstance(documents, (str, list, tuple)):
+        raise ValueError("Invalid documents selection.")
+    return session, parse_documents(documents)
+
+
+def session_fingerprint(session: TrainingSession, documents: Iterable[str] | None, logo_sha256: str | None) -> str:
+    """
+    Empreinte des entrées d'une génération, commune à l'API, à l'interface
+    Streamlit et à la pré-génération : un ZIP pré-généré est retrouvé dès que
+    les informations saisies sont les mêmes.
+
+    Quand des attestations sont demandées, le rendu en fait partie (template,
+    positions des champs, backend et aplatissement, voir `_attestation_settings`) :
+    un changement de template ou de réglage écarte les ZIP pré-générés avant lui.
+    """
+    from artefact_store import fingerprint_inputs
+
+    documents = parse_documents(documents)
+    inputs = {
+        "company": session.company,
+        "training": session.training,
+        "duration": session.duration,
+        "location": session.location,
+        "dates": list(session.dates),
+        "participants": list(session.participants),
+        "provider": session.provider,
+        "signatory": session.signatory,
+        "documents": list(documents),
+        "logo": logo_sha256,
+    }
+    if any(DOCUMENT_TYPES[key].needs_attestation_module for key in documents):
+        layout, backend, flatten = _attestation_settings(session)
+        inputs["attestation_renderer"] = {"layout": layout.fingerprint(), "backend": backend, "flatten": flatten}
+    return fingerprint_inputs(inputs)
+
+
+def parse_date(raw_value: str) -> datetime | None:
+    if not raw_value:
+        return None
+    for fmt in ("%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(raw_value.strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def normalize_dates(raw_dates: Iterable[str]) -> list[str]:
+    normalized = []
+    for raw in raw_dates:
+        parsed = parse_date(raw)
+        if parsed:
+            normalized.append(parsed.strftime("%d/%m/%Y"))
+        else:
+            normalized.append(raw.strip())
+    return normalized
+
+
+def select_date_bounds(dates_list: Iterable[str]) -> tuple[str, str]:
+    first = ""
+    last = ""
+    for value in dates_list:
+        parsed = parse_date(value)
+        if parsed:
+            formatted = parsed.strftime("%d/%m/%Y")
+            if not first:
+                first = formatted
+            last = formatted
+        else:
+            if not first:
+                first = value
+            last = value
+    return first, last
+
+
+def _render_presence(session: TrainingSession, participant: str) -> tuple[str, bytes]:
+    from generateur_feuilles import presence_sheet_bytes, presence_sheet_filename
+    from shared_assets import open_asset
+
+    pdf_bytes = presence_sheet_bytes(
+        session.company,
+        participant,
+        session.duration,
+        session.location,
+        session.training,
+        dates=list(session.dates) if session.dates else None,
+        reproducible=True,
+        signature=open_asset("signature"),
+    )
+    return presence_sheet_filename(participant), pdf_bytes
+
+
+def _render_questionnaire(session: TrainingSession, participant: str) -> tuple[str, bytes]:
+    from questionnaire_core import QuestionnaireData, questionnaire_filename, render_questionnaire_bytes, split_full_name
+
+    start_date, end_date = session.date_bounds
+    first_name, last_name = split_full_name(participant)
+    data = QuestionnaireData(
+        participant_last_name=last_name,
+        participant_first_name=first_name,
+        company=session.company,
+        training_program=session.training,
+        training_center=session.location,
+        start_date=start_date,
+        end_date=end_date,
+        logo_path=session.logo_path,
+    )
+    return questionnaire_filename(data), render_questionnaire_bytes(data, reproducible=True)
+
+
+def _render_attestation(session: TrainingSession, participant: str) -> tuple[str, bytes]:
+    from app.generate_attestation import generate_attestation_bytes
+    from app.utils import map_to_attestation_fields, sanitize_filename
+
+    start_date, end_date = session.date_bounds
+    layout, backend, flatten = _attestation_settings(session)
+
+    fields = map_to_attestation_fields(
+        {
+            "signatory_name": session.signatory,
+            "provider_name": session.provider,
+            "beneficiary_name": participant,
+            "company_name": session.company,
+            "action_title": session.training,
+            "date_start": start_date or (session.dates[0] if session.dates else ""),
+            "date_end": end_date or (session.dates[-1] if session.dates else ""),
+            "duration": session.duration,
+            "location": session.location,
+        }
+    )
+    pdf_bytes = generate_attestation_bytes(fields, layout, backend=backend, flatten=flatten)
+    return f"attestation_{sanitize_filename(participant)}.pdf", pdf_bytes
+
+
+def _attestation_settings(session: TrainingSession) -> tuple[object, str, bool]:
+    layout = session.attestation_layout
+    backend = session.attestation_backend
+    flatten = session.attestation_flatten
+    if layout is None or backend is None or flatten is None:
+        from app.config import get_settings
+
+        settings = get_settings()
+        layout = settings.compiled_attestation_layout if layout is None else layout
+        backend = settings.attestation_backend if backend is None else backend
+        flatten = settings.attestation_flatten if flatten is None else flatten
+    return layout, backend, flatten
+
+
+register_document_type(DocumentType("presence", "Feuilles de présence", "feuilles_presence", _render_presence))
+register_document_type(
+    DocumentType("questionnaire", "Questionnaires de satisfaction", "questionnaires_satisfaction", _render_questionnaire)
+)
+register_document_type(
+    DocumentType(
+        "attestation",
+        "Attestations de formation",
+        "attestations_formation",
+        _render_attestation,
+        needs_attestation_module=True,
+    )
+)
+
+
+def _split(value: str | Iterable[str] | None) -> list[str]:
+    """Liste d'une chaîne séparée par des virgules ou des retours à la ligne (ou d'une liste)."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.replace(",", "\n").splitlines()
+    tokens = [str(item).strip() for item in value]
+    return [token for token in tokens if token]
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Génère le ZIP des documents d'une session sans passer par l'interface web.
+    """
+    parser = argparse.ArgumentParser(description="Génère les documents d'une session de formation dans un ZIP.")
+    parser.add_argument("--societe", required=True, help="Société cliente")
+    parser.add_argument("--formation", required=True, help="Nom de la formation")
+    parser.add_argument("--duree", required=True, help="Durée de la formation")
+    parser.add_argument("--lieu", required=True, help="Lieu de formation")
+    parser.add_argument("--dates", required=True, help="Dates séparées par des virgules")
+    parser.add_argument("--participants", required=True, help="Participants séparés par des virgules")
+    parser.add_argument("--organisme", default=DEFAULT_PROVIDER, help="Organisme de formation")
+    parser.add_argument("--signataire", default=DEFAULT_SIGNATORY, help="Signataire des attestations")
+    parser.add_argument("--logo", default=None, help="Logo des questionnaires")
+    parser.add_argument(
+        "--documents",
+        default=None,
+        help=f"Types à générer, séparés par des virgules (par défaut : {','.join(DOCUMENT_TYPES)})",
+    )
+    parser.add_argument("--output", default="documents_formation.zip", help="Chemin du ZIP généré")
+    parser.add_argument("--processus", type=int, default=1, help="Nombre de processus de rendu (1 par défaut)")
+    args = parser.parse_args(argv)
+
+    try:
+        documents = parse_documents(args.documents)
+    except ValueError as exc:
+        parser.error(str(exc))
+    root = Path(__file__).resolve().parent
+    for path in (root / "generateur_questionnaire", root / "attestations_formation"):
+        if str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+
+    session = TrainingSession(
+        company=args.societe,
+        training=args.formation,
+        duration=args.duree,
+        location=args.lieu,
+        dates=tuple(normalize_dates(_split(args.dates))),
+        participants=tuple(_split(args.participants)),
+        provider=args.organisme,
+        signatory=args.signataire,
+        logo_path=args.logo,
+    )
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(build_archive(session, documents, workers=args.processus))
+    labels = ", ".join(DOCUMENT_TYPES[key].label.lower() for key in documents)
+    print(f"{len(session.participants)} participant(s) : {labels} -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,38 @@
 
+import argparse
+import io
 import os
 from pathlib import Path
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, Image, PageBreak
+
+from profiling import profiled
+
+PRESENCE_HEADER = ['Date', 'Durée (h)', 'Horaires', 'Signature Stagiaire', 'Signature Formateur']
+PRESENCE_COL_WIDTHS = [3*cm, 2*cm, 3*cm, 4.5*cm, 4.5*cm]
+PRESENCE_ROW_HEIGHT = 1.5*cm
+PRESENCE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#CCCCCC')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+])
+# Marge de sécurité (padding du cadre, arrondis) retirée de la hauteur disponible.
+FRAME_SAFETY = 0.5*cm
+
+
+def presence_sheet_filename(academicien):
+    """
+    Nom du fichier PDF de la feuille de présence d'un académicien.
+    """
+    return f"Feuille_de_presence_{academicien.replace(' ', '_')}.pdf"
+
 
 def create_presence_sheet(
     societe,
@@ -15,6 +42,7 @@ def create_presence_sheet(
     formation,
     dates=None,
     output_dir="feuilles_présence",
+    reproducible=False,
 ):
     """
     Génère une feuille de présence en PDF pour un académicien.
@@ -22,14 +50,75 @@ def create_presence_sheet(
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    file_name = output_dir / presence_sheet_filename(academicien)
+    build_presence_sheet(
+        str(file_name), societe, academicien, duree, lieu, formation, dates, reproducible=reproducible
+    )
+    print(f"Feuille de présence '{file_name}' générée.")
+    return file_name
+
+
+def presence_sheet_bytes(
+    societe, academicien, duree, lieu, formation, dates=None, reproducible=False, signature=None
+):
+    """
+    Génère la feuille de présence en mémoire et renvoie le contenu du PDF.
+    """
+    buffer = io.BytesIO()
+    build_presence_sheet(
+        buffer, societe, academicien, duree, lieu, formation, dates, reproducible=reproducible, signature=signature
+    )
+    return buffer.getvalue()
+
+
+def build_presence_sheet(
+    target,
+    societe,
+    academicien,
+    duree,
+    lieu,
+    formation,
+    dates=None,
+    long_session=None,
+    rows_per_page=None,
+    reproducible=False,
+    signature=None,
+):
+    """
+    Construit la feuille de présence dans `target` (chemin ou flux binaire).
+
+    En mode session longue, le tableau est découpé explicitement en pages
+    (une LongTable par page, en-tête répété) selon un budget de lignes par
+    page calculé sur la hauteur disponible, au lieu de laisser reportlab
+    redécouper un unique tableau page après page. Par défaut (`long_session`
+    à None) ce mode s'active dès que les lignes ne tiennent pas sur la
+    première page. `rows_per_page` force le budget des pages suivantes.
+
+    Avec `reproducible`, reportlab fige la date du document (celle de
+    `SOURCE_DATE_EPOCH` si la variable est définie, sinon le 01/01/2000) et
+    l'identifiant qui en dépend : des entrées identiques donnent le même PDF,
+    octet pour octet.
+
+    `signature` est le chemin ou le flux binaire de l'image de signature
+    (par défaut `signature.png` à côté du script, s'il existe).
+    """
     # Préparation de la signature si elle existe
-    signature_path = Path(__file__).resolve().parent / "signature.png"
     signature_img = None
-    if signature_path.exists():
-        signature_img = Image(str(signature_path), width=3.5*cm, height=1.2*cm)
+    if signature is None:
+        signature_path = Path(__file__).resolve().parent / "signature.png"
+        signature = str(signature_path) if signature_path.exists() else None
+    if signature is not None:
+        signature_img = Image(signature, width=3.5*cm, height=1.2*cm)
 
-    file_name = output_dir / f"Feuille_de_presence_{academicien.replace(' ', '_')}.pdf"
-    doc = SimpleDocTemplate(str(file_name), pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, topMargin=2*cm, bottomMargin=2*cm)
+    doc = SimpleDocTemplate(
+        target,
+        pagesize=A4,
+        rightMargin=2*cm,
+        leftMargin=2*cm,
+        topMargin=2*cm,
+        bottomMargin=2*cm,
+        invariant=1 if reproducible else None,
+    )
     
     story = []
     styles = getSampleStyleSheet()
@@ -70,43 +159,94 @@ def create_presence_sheet(
 
 
     # Tableau de présence
-    table_header = ['Date', 'Durée (h)', 'Horaires', 'Signature Stagiaire', 'Signature Formateur']
-    
-    table_data = [table_header]
-    
+    rows = _presence_rows(dates, signature_img)
+    first_page_rows = _row_budget(doc.height - _story_height(story, doc))
+    if long_session is None:
+        long_session = len(rows) > first_page_rows
+
+    if not long_session:
+        presence_table = Table([PRESENCE_HEADER] + rows, colWidths=PRESENCE_COL_WIDTHS, rowHeights=PRESENCE_ROW_HEIGHT)
+        presence_table.setStyle(PRESENCE_TABLE_STYLE)
+        story.append(presence_table)
+    else:
+        page_rows = rows_per_page or _row_budget(doc.height)
+        for index, chunk in enumerate(_chunk_rows(rows, min(first_page_rows, page_rows), page_rows)):
+            if index:
+                story.append(PageBreak())
+            presence_table = LongTable(
+                [PRESENCE_HEADER] + chunk,
+                colWidths=PRESENCE_COL_WIDTHS,
+                rowHeights=PRESENCE_ROW_HEIGHT,
+                repeatRows=1,
+            )
+            presence_table.setStyle(PRESENCE_TABLE_STYLE)
+            story.append(presence_table)
+
+    doc.build(story)
+
+def _presence_rows(dates, signature_img):
+    """
+    Lignes du tableau de présence (sans l'en-tête) : matin et après-midi par date.
+    """
+    rows = []
     if dates:
         for date in dates:
             # Matin
-            table_data.append([date, '4h', "9h-13h00", '', signature_img or ''])
+            rows.append([date, '4h', "9h-13h00", '', signature_img or ''])
             # Après-midi
-            table_data.append([date, '4h', "14h-18h00", '', signature_img or ''])
+            rows.append([date, '4h', "14h-18h00", '', signature_img or ''])
     else:
         for i in range(16): # 16 lignes par défaut
             horaire = "9h-13h00" if i % 2 == 0 else "14h-18h00"
-            table_data.append(['', '4h', horaire, '', signature_img or ''])
+            rows.append(['', '4h', horaire, '', signature_img or ''])
+    return rows
 
-    presence_table = Table(table_data, colWidths=[3*cm, 2*cm, 3*cm, 4.5*cm, 4.5*cm], rowHeights=1.5*cm)
 
+def _story_height(story, doc):
+    """
+    Hauteur occupée par les éléments déjà placés en haut de la première page.
+    """
+    height = 0
+    for flowable in story:
+        _, flowable_height = flowable.wrap(doc.width, doc.height)
+        height += flowable_height + flowable.getSpaceBefore() + flowable.getSpaceAfter()
+    return height
 
-    presence_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#CCCCCC')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
 
-    story.append(presence_table)
+def _row_budget(available_height):
+    """
+    Nombre de lignes (hors en-tête) qui tiennent dans la hauteur disponible.
+    """
+    usable = available_height - FRAME_SAFETY - PRESENCE_ROW_HEIGHT
+    return max(1, int(usable // PRESENCE_ROW_HEIGHT))
+
+
+def _chunk_rows(rows, first_page_rows, page_rows):
+    """
+    Découpe les lignes en pages : la première page a son propre budget.
+    """
+    chunks = [rows[:first_page_rows]]
+    for start in range(first_page_rows, len(rows), page_rows):
+        chunks.append(rows[start:start + page_rows])
+    return chunks
 
-    doc.build(story)
-    print(f"Feuille de présence '{file_name}' générée.")
 
-def main():
+def main(argv=None):
     """
     Fonction principale pour demander les informations et générer les feuilles.
     """
+    parser = argparse.ArgumentParser(description="Génère les feuilles de présence d'une formation.")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profiles",
+        default=None,
+        metavar="DOSSIER",
+        help="Profile la génération : fichiers .pstats et .collapsed (flamegraph) dans DOSSIER "
+        "(profiles/ par défaut) et fonctions les plus coûteuses affichées à la fin",
+    )
+    args = parser.parse_args(argv)
+
     print("Générateur de feuilles de présence")
     print("="*30)
 
@@ -120,9 +260,10 @@ def main():
     academiciens = [a.strip() for a in academiciens_str.split(',')]
     dates = [d.strip() for d in dates_str.split(',') if d.strip()]
     
-    for academicien in academiciens:
-        print(f"Génération de la feuille de présence pour {academicien}...")
-        create_presence_sheet(societe, academicien, duree, lieu, formation, dates)
+    with profiled("generateur_feuilles", args.profile):
+        for academicien in academiciens:
+            print(f"Génération de la feuille de présence pour {academicien}...")
+            create_presence_sheet(societe, academicien, duree, lieu, formation, dates)
 
     print("="*30)
     print("Toutes les feuilles de présence ont été générées.")
@@ -0,0 +1,67 @@
+import argparse
+import sys
+from pathlib import Path
+
+from questionnaire_responses import aggregate, read_response, write_reports
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Agrège les questionnaires de satisfaction remplis (PDF remplissables) en rapports CSV."
+    )
+    parser.add_argument(
+        "sources",
+        nargs="+",
+        help="Fichiers PDF ou dossiers contenant les questionnaires retournés (parcourus récursivement).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="generateur_questionnaire/rapports_satisfaction",
+        help="Répertoire de sortie des rapports CSV.",
+    )
+    return parser.parse_args()
+
+
+def collect_pdfs(sources: list[str]) -> list[Path]:
+    paths: list[Path] = []
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            paths.extend(sorted(p for p in path.rglob("*") if p.suffix.lower() == ".pdf"))
+        elif path.suffix.lower() == ".pdf":
+            paths.append(path)
+    return paths
+
+
+def main() -> None:
+    args = parse_args()
+    pdfs = collect_pdfs(args.sources)
+    if not pdfs:
+        print("Aucun PDF trouvé, arrêt.")
+        sys.exit(1)
+
+    responses = []
+    skipped: list[tuple[Path, str]] = []
+    for pdf in pdfs:
+        try:
+            response = read_response(pdf)
+        except Exception as exc:  # PDF illisible : on continue avec les autres
+            skipped.append((pdf, str(exc)))
+            continue
+        if response is None:
+            skipped.append((pdf, "pas un questionnaire remplissable"))
+            continue
+        responses.append(response)
+
+    sessions, programs = aggregate(responses)
+    for path in write_reports(sessions, programs, args.output_dir):
+        print(f"- Rapport écrit : {path}")
+
+    print("")
+    print(f"{len(responses)} questionnaire(s) agrégé(s) : {len(sessions)} session(s), {len(programs)} programme(s).")
+    for pdf, reason in skipped:
+        print(f"  Ignoré : {pdf} ({reason})")
+
+
+if __name__ == "__main__":
+    main()
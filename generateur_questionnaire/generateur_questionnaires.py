@@ -3,7 +3,13 @@ import re
 import sys
 from pathlib import Path
 
-from questionnaire_core import QuestionnaireData, render_questionnaire, split_full_name
+# Le module de profilage est partagé à la racine du dépôt.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from profiling import profiled  # noqa: E402
+from questionnaire_core import QuestionnaireData, render_questionnaire, split_full_name  # noqa: E402
 
 
 def parse_args() -> argparse.Namespace:
@@ -20,6 +26,20 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Chemin vers un logo à afficher dans l'en-tête (optionnel).",
     )
+    parser.add_argument(
+        "--remplissable",
+        action="store_true",
+        help="Génère des PDF remplissables (boutons radio et zones de texte) à agréger ensuite.",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profiles",
+        default=None,
+        metavar="DOSSIER",
+        help="Profile la génération : fichiers .pstats et .collapsed (flamegraph) dans DOSSIER "
+        "(profiles/ par défaut) et fonctions les plus coûteuses affichées à la fin.",
+    )
     return parser.parse_args()
 
 
@@ -57,20 +77,21 @@ def main() -> None:
     output_dir = Path(args.output_dir)
     logo_path = args.logo if args.logo else None
 
-    for participant in participants:
-        first_name, last_name = split_full_name(participant)
-        data = QuestionnaireData(
-            participant_last_name=last_name,
-            participant_first_name=first_name,
-            company=company,
-            training_program=training_program,
-            training_center=training_center,
-            start_date=start_date,
-            end_date=end_date,
-            logo_path=logo_path,
-        )
-        pdf_path = render_questionnaire(data, output_dir=output_dir)
-        print(f"- Questionnaire généré : {pdf_path}")
+    with profiled("generateur_questionnaires", args.profile):
+        for participant in participants:
+            first_name, last_name = split_full_name(participant)
+            data = QuestionnaireData(
+                participant_last_name=last_name,
+                participant_first_name=first_name,
+                company=company,
+                training_program=training_program,
+                training_center=training_center,
+                start_date=start_date,
+                end_date=end_date,
+                logo_path=logo_path,
+            )
+            pdf_path = render_questionnaire(data, output_dir=output_dir, fillable=args.remplissable)
+            print(f"- Questionnaire généré : {pdf_path}")
 
     print("")
     print("Opération terminée.")
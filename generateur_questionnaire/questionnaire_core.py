@@ -1,3 +1,4 @@
+import io
 import re
 import unicodedata
 from dataclasses import dataclass
@@ -8,11 +9,24 @@ from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import cm
-from reportlab.platypus import (Image, Paragraph, SimpleDocTemplate, Spacer,
-                                Table, TableStyle)
+from reportlab.platypus import (Flowable, Image, Paragraph, SimpleDocTemplate,
+                                Spacer, Table, TableStyle)
 
 
 RATING_OPTIONS = ("++", "+", "-", "--")
+# Valeurs d'export des boutons radio (les noms PDF évitent "+" et "-").
+RATING_EXPORTS = ("tres_satisfait", "satisfait", "peu_satisfait", "pas_satisfait")
+RATING_SECTIONS = (
+    ("organisation", ("Accueil", "Respect des horaires", "Durée", "Logistique, prestations techniques")),
+    ("formateur", ("La maîtrise du contenu", "La qualité de l’écoute", "La clarté du message")),
+    ("animation", ("Les supports", "Les échanges", "La méthode pédagogique", "La durée et le rythme")),
+    ("objectifs", ("Adhériez-vous à cet objectif ?", "Vous semble-t-il atteint ?")),
+)
+EXPECTATION_OPTIONS = ("Tout à fait", "En grande partie", "A peu près", "Pas du tout")
+EXPECTATION_FIELD = "attentes"
+NOTE_FIELD = "note_sur_10"
+# Champs cachés en lecture seule qui identifient la session dans un PDF rempli.
+SESSION_FIELDS = ("programme", "societe", "date_debut", "date_fin")
 
 
 @dataclass
@@ -27,24 +41,57 @@ class QuestionnaireData:
     logo_path: str | None = None
 
 
-def render_questionnaire(data: QuestionnaireData, output_dir: str | Path) -> Path:
-    """Generate a satisfaction questionnaire PDF matching the provided sample."""
+def render_questionnaire(
+    data: QuestionnaireData, output_dir: str | Path, fillable: bool = False, reproducible: bool = False
+) -> Path:
+    """Generate a satisfaction questionnaire PDF matching the provided sample.
+
+    With ``fillable=True`` the rating grids become radio groups and the
+    comment boxes text fields (AcroForm), so answers can be read back by
+    ``agregation_questionnaires.py``.
+
+    With ``reproducible=True`` the document date (``SOURCE_DATE_EPOCH`` when
+    set, 2000-01-01 otherwise) and the PDF ID are fixed, so identical data
+    gives byte-identical files.
+    """
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
+    pdf_path = output_path / questionnaire_filename(data)
+    _build_questionnaire(data, str(pdf_path), fillable, reproducible)
+    return pdf_path
+
+
+def render_questionnaire_bytes(data: QuestionnaireData, fillable: bool = False, reproducible: bool = False) -> bytes:
+    """Generate the questionnaire in memory and return the PDF content."""
+    buffer = io.BytesIO()
+    _build_questionnaire(data, buffer, fillable, reproducible)
+    return buffer.getvalue()
+
+
+def rating_field_name(section: str, row_index: int) -> str:
+    """Nom du groupe radio d'une ligne de notation (``organisation_1``...)."""
+    return f"{section}_{row_index + 1}"
+
+
+def questionnaire_filename(data: QuestionnaireData) -> str:
+    """File name used for a participant's questionnaire."""
     filename = _build_filename(
         data.participant_last_name or data.participant_first_name or "participant",
         data.training_program or "formation",
     )
-    pdf_path = output_path / f"Questionnaire_{filename}.pdf"
+    return f"Questionnaire_{filename}.pdf"
+
 
+def _build_questionnaire(data: QuestionnaireData, target, fillable: bool = False, reproducible: bool = False) -> None:
     doc = SimpleDocTemplate(
-        str(pdf_path),
+        target,
         pagesize=A4,
         rightMargin=2 * cm,
         leftMargin=2 * cm,
         topMargin=1.8 * cm,
         bottomMargin=1.8 * cm,
+        invariant=1 if reproducible else None,
     )
 
     styles = getSampleStyleSheet()
@@ -72,61 +119,66 @@ def render_questionnaire(data: QuestionnaireData, output_dir: str | Path) -> Pat
     story.append(Paragraph("Questionnaire de satisfaction", title_style))
     story.append(Spacer(1, 0.5 * cm))
     story.append(_build_information_table(data))
+    if fillable:
+        story.append(_SessionFields(_session_values(data)))
     story.append(Spacer(1, 0.4 * cm))
+    ratings = dict(RATING_SECTIONS)
+
+    def field(name: str) -> str | None:
+        return name if fillable else None
 
     # Section 1
     story.append(Paragraph("1ère partie : l’organisation de la formation", section_style))
     story.append(Paragraph("Votre avis sur le déroulement de la formation ?", subtitle_style))
-    story.append(_rating_table(["Accueil", "Respect des horaires", "Durée", "Logistique, prestations techniques"]))
+    story.append(_rating_table(ratings["organisation"], field("organisation")))
     story.append(Spacer(1, 0.3 * cm))
     story.append(Paragraph("Avez-vous des commentaires à faire sur ces points ?", body_style))
-    story.append(_text_area(3 * cm))
+    story.append(_text_area(3 * cm, field("organisation_commentaires")))
     story.append(Spacer(1, 0.5 * cm))
 
     # Section 2
     story.append(Paragraph("2ème partie : le formateur", section_style))
     story.append(Paragraph("Chez le formateur, comment évaluez-vous ?", subtitle_style))
-    story.append(_rating_table(["La maîtrise du contenu", "La qualité de l’écoute", "La clarté du message"]))
+    story.append(_rating_table(ratings["formateur"], field("formateur")))
     story.append(Spacer(1, 0.3 * cm))
     story.append(Paragraph("Avez-vous des commentaires à faire sur ces points ?", body_style))
-    story.append(_text_area(3 * cm))
+    story.append(_text_area(3 * cm, field("formateur_commentaires")))
     story.append(Spacer(1, 0.5 * cm))
 
     # Section 3
     story.append(Paragraph("3ème partie : l’animation", section_style))
     story.append(Paragraph("Votre avis sur l’animation de la formation ?", subtitle_style))
-    story.append(_rating_table(["Les supports", "Les échanges", "La méthode pédagogique", "La durée et le rythme"]))
+    story.append(_rating_table(ratings["animation"], field("animation")))
     story.append(Spacer(1, 0.3 * cm))
     story.append(Paragraph("Avez-vous des commentaires à faire sur ces points ?", body_style))
-    story.append(_text_area(3 * cm))
+    story.append(_text_area(3 * cm, field("animation_commentaires")))
     story.append(Spacer(1, 0.5 * cm))
 
     # Section 4
     story.append(Paragraph("4ème partie : les objectifs de la formation", section_style))
     story.append(Paragraph("Selon vous, quels étaient les objectifs de la formation ?", body_style))
-    story.append(_text_area(3.5 * cm))
+    story.append(_text_area(3.5 * cm, field("objectifs_attendus")))
     story.append(Spacer(1, 0.3 * cm))
-    story.append(_rating_table(["Adhériez-vous à cet objectif ?", "Vous semble-t-il atteint ?"]))
+    story.append(_rating_table(ratings["objectifs"], field("objectifs")))
     story.append(Spacer(1, 0.3 * cm))
     story.append(Paragraph("Avez-vous des commentaires à faire sur ces points ?", body_style))
-    story.append(_text_area(3 * cm))
+    story.append(_text_area(3 * cm, field("objectifs_commentaires")))
     story.append(Spacer(1, 0.5 * cm))
 
     # Conclusion
     story.append(Paragraph("Conclusion", section_style))
     story.append(Paragraph("La formation a-t-elle répondu à vos attentes ?", body_style))
-    story.append(_checkbox_list(["Tout à fait", "En grande partie", "A peu près", "Pas du tout"]))
+    story.append(_checkbox_list(EXPECTATION_OPTIONS, field(EXPECTATION_FIELD)))
     story.append(Spacer(1, 0.3 * cm))
     story.append(Paragraph("Note de la formation (sur 10)", body_style))
-    story.append(_text_area(1.5 * cm))
+    story.append(_text_area(1.5 * cm, field(NOTE_FIELD)))
     story.append(Spacer(1, 0.3 * cm))
     story.append(Paragraph("Vos suggestions sont les bienvenues :", body_style))
-    story.append(_text_area(3.5 * cm))
+    story.append(_text_area(3.5 * cm, field("suggestions")))
     story.append(Spacer(1, 0.5 * cm))
     story.append(Paragraph("Merci d’avoir répondu à ce questionnaire !", body_style))
 
     doc.build(story)
-    return pdf_path
 
 
 def split_full_name(full_name: str) -> tuple[str, str]:
@@ -168,10 +220,14 @@ def _build_information_table(data: QuestionnaireData) -> Table:
     return table
 
 
-def _rating_table(items: Sequence[str]) -> Table:
+def _rating_table(items: Sequence[str], field_prefix: str | None = None) -> Table:
     data = [[""] + list(RATING_OPTIONS)]
-    for label in items:
-        data.append([label] + [""] * len(RATING_OPTIONS))
+    for row_index, label in enumerate(items):
+        if field_prefix is None:
+            data.append([label] + [""] * len(RATING_OPTIONS))
+        else:
+            name = rating_field_name(field_prefix, row_index)
+            data.append([label] + [_RadioButton(name, export, label) for export in RATING_EXPORTS])
     col_widths = [7.0 * cm] + [2.5 * cm for _ in RATING_OPTIONS]
     row_heights = [0.9 * cm] + [1.1 * cm for _ in items]
     table = Table(data, colWidths=col_widths, rowHeights=row_heights)
@@ -190,10 +246,17 @@ def _rating_table(items: Sequence[str]) -> Table:
     return table
 
 
-def _checkbox_list(options: Iterable[str]) -> Table:
+def _checkbox_list(options: Iterable[str], field_name: str | None = None) -> Table:
     styles = getSampleStyleSheet()
-    rows = [[Paragraph(f"[ ] {opt}", styles["Normal"])] for opt in options]
-    table = Table(rows, colWidths=[15 * cm])
+    if field_name is None:
+        rows = [[Paragraph(f"[ ] {opt}", styles["Normal"])] for opt in options]
+        table = Table(rows, colWidths=[15 * cm])
+    else:
+        rows = [
+            [_RadioButton(field_name, f"choix_{index + 1}", opt, size=12), Paragraph(opt, styles["Normal"])]
+            for index, opt in enumerate(options)
+        ]
+        table = Table(rows, colWidths=[1 * cm, 14 * cm])
     table.setStyle(
         TableStyle(
             [
@@ -206,12 +269,94 @@ def _checkbox_list(options: Iterable[str]) -> Table:
     return table
 
 
-def _text_area(height: float) -> Table:
-    table = Table([[""]], colWidths=[15 * cm], rowHeights=[height])
+def _text_area(height: float, field_name: str | None = None) -> Table:
+    content = "" if field_name is None else _TextField(field_name, 15 * cm - 12, height - 8)
+    table = Table([[content]], colWidths=[15 * cm], rowHeights=[height])
     table.setStyle(TableStyle([("GRID", (0, 0), (-1, -1), 0.5, colors.black)]))
     return table
 
 
+def _session_values(data: QuestionnaireData) -> dict[str, str]:
+    values = (data.training_program, data.company, data.start_date, data.end_date)
+    return dict(zip(SESSION_FIELDS, values))
+
+
+class _RadioButton(Flowable):
+    """Bouton radio AcroForm dessiné à la position de sa cellule."""
+
+    def __init__(self, name: str, value: str, tooltip: str, size: float = 14):
+        super().__init__()
+        self.name = name
+        self.value = value
+        self.tooltip = tooltip
+        self.width = self.height = size
+
+    def draw(self) -> None:
+        self.canv.acroForm.radio(
+            name=self.name,
+            value=self.value,
+            tooltip=self.tooltip,
+            size=self.width,
+            x=0,
+            y=0,
+            buttonStyle="circle",
+            shape="circle",
+            borderWidth=1,
+            fieldFlags="noToggleToOff radio",
+            relative=True,
+        )
+
+
+class _TextField(Flowable):
+    """Zone de texte AcroForm (multiligne) qui remplit une cellule de commentaire."""
+
+    def __init__(self, name: str, width: float, height: float):
+        super().__init__()
+        self.name = name
+        self.width = width
+        self.height = height
+
+    def draw(self) -> None:
+        self.canv.acroForm.textfield(
+            name=self.name,
+            width=self.width,
+            height=self.height,
+            x=0,
+            y=0,
+            borderWidth=0,
+            fillColor=colors.white,
+            fontSize=10,
+            maxlen=2000,
+            fieldFlags="multiline doNotSpellCheck",
+            relative=True,
+        )
+
+
+class _SessionFields(Flowable):
+    """Champs cachés en lecture seule portant la session (programme, société, dates)."""
+
+    def __init__(self, values: dict[str, str]):
+        super().__init__()
+        self.values = values
+        self.width = self.height = 0
+
+    def draw(self) -> None:
+        for name, value in self.values.items():
+            self.canv.acroForm.textfield(
+                name=name,
+                value=value or "",
+                width=1,
+                height=1,
+                x=0,
+                y=0,
+                borderWidth=0,
+                maxlen=200,
+                annotationFlags="hidden",
+                fieldFlags="readOnly",
+                relative=True,
+            )
+
+
 def _build_logo_flow(logo_path: str):
     flow = []
     path = Path(logo_path)
@@ -0,0 +1,165 @@
+import csv
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from pypdf import PdfReader
+from pypdf.generic import NameObject
+
+from questionnaire_core import (EXPECTATION_FIELD, EXPECTATION_OPTIONS, NOTE_FIELD, RATING_EXPORTS,
+                                RATING_OPTIONS, RATING_SECTIONS, SESSION_FIELDS, rating_field_name)
+
+# Une ligne par critère noté, dans l'ordre du questionnaire : (section, critère, nom du champ).
+RATING_ROWS = tuple(
+    (section, label, rating_field_name(section, row_index))
+    for section, labels in RATING_SECTIONS
+    for row_index, label in enumerate(labels)
+)
+_ROW_INDEX = {name: index for index, (_, _, name) in enumerate(RATING_ROWS)}
+_EXPORT_INDEX = {export: index for index, export in enumerate(RATING_EXPORTS)}
+_EXPECTATION_INDEX = {f"choix_{index + 1}": index for index in range(len(EXPECTATION_OPTIONS))}
+
+
+@dataclass
+class QuestionnaireResponse:
+    path: Path
+    program: str
+    company: str
+    start_date: str
+    end_date: str
+    ratings: dict[str, int] = field(default_factory=dict)
+    expectation: int | None = None
+    note: float | None = None
+    comments: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def session(self) -> str:
+        return f"{self.company} ({self.start_date} - {self.end_date})"
+
+
+class SatisfactionCounters:
+    """Compteurs d'un groupe de réponses (session ou programme).
+
+    Les notes sont comptées dans un ``array`` à plat de
+    ``len(RATING_ROWS) * len(RATING_OPTIONS)`` entiers : la case
+    ``ligne * 4 + option`` compte les réponses ``option`` pour ce critère.
+    """
+
+    def __init__(self):
+        self.responses = 0
+        self.ratings = array("L", [0]) * (len(RATING_ROWS) * len(RATING_OPTIONS))
+        self.expectations = array("L", [0]) * len(EXPECTATION_OPTIONS)
+        self.note_total = 0.0
+        self.note_count = 0
+
+    def add(self, response: QuestionnaireResponse) -> None:
+        self.responses += 1
+        width = len(RATING_OPTIONS)
+        for name, option in response.ratings.items():
+            self.ratings[_ROW_INDEX[name] * width + option] += 1
+        if response.expectation is not None:
+            self.expectations[response.expectation] += 1
+        if response.note is not None:
+            self.note_total += response.note
+            self.note_count += 1
+
+    def row_counts(self, row_index: int) -> list[int]:
+        width = len(RATING_OPTIONS)
+        return list(self.ratings[row_index * width:(row_index + 1) * width])
+
+    @property
+    def note_average(self) -> float | None:
+        return self.note_total / self.note_count if self.note_count else None
+
+
+def read_response(path: str | Path) -> QuestionnaireResponse | None:
+    """Lit les champs d'un questionnaire rempli ; ``None`` si le PDF n'en contient pas."""
+    path = Path(path)
+    fields = PdfReader(path).get_fields() or {}
+    if not all(name in fields for name in SESSION_FIELDS):
+        return None
+    values = {name: _field_value(meta) for name, meta in fields.items()}
+    program, company, start_date, end_date = (values[name] for name in SESSION_FIELDS)
+    response = QuestionnaireResponse(path, program, company, start_date, end_date)
+    for _, _, name in RATING_ROWS:
+        option = _EXPORT_INDEX.get(values.get(name, ""))
+        if option is not None:
+            response.ratings[name] = option
+    response.expectation = _EXPECTATION_INDEX.get(values.get(EXPECTATION_FIELD, ""))
+    response.note = _parse_note(values.get(NOTE_FIELD, ""))
+    response.comments = {
+        name: value
+        for name, value in values.items()
+        if value and name not in SESSION_FIELDS and name not in _ROW_INDEX
+        and name not in (EXPECTATION_FIELD, NOTE_FIELD)
+    }
+    return response
+
+
+def aggregate(responses: Iterable[QuestionnaireResponse]) -> tuple[dict, dict]:
+    """Regroupe les réponses par session et par programme."""
+    sessions: dict[tuple[str, str], SatisfactionCounters] = {}
+    programs: dict[str, SatisfactionCounters] = {}
+    for response in responses:
+        sessions.setdefault((response.program, response.session), SatisfactionCounters()).add(response)
+        programs.setdefault(response.program, SatisfactionCounters()).add(response)
+    return sessions, programs
+
+
+def write_reports(sessions: dict, programs: dict, output_dir: str | Path) -> list[Path]:
+    """Écrit les rapports CSV (détail par critère et synthèse) par session et par programme."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    session_groups = [((program, session), counters) for (program, session), counters in sorted(sessions.items())]
+    program_groups = [((program,), counters) for program, counters in sorted(programs.items())]
+    paths = [
+        _write_ratings(output_dir / "satisfaction_par_session.csv", ["Programme", "Session"], session_groups),
+        _write_summary(output_dir / "synthese_par_session.csv", ["Programme", "Session"], session_groups),
+        _write_ratings(output_dir / "satisfaction_par_programme.csv", ["Programme"], program_groups),
+        _write_summary(output_dir / "synthese_par_programme.csv", ["Programme"], program_groups),
+    ]
+    return paths
+
+
+def _write_ratings(path: Path, keys: list[str], groups: list) -> Path:
+    with path.open("w", newline="", encoding="utf-8-sig") as handle:
+        writer = csv.writer(handle, delimiter=";")
+        writer.writerow(keys + ["Section", "Critère", *RATING_OPTIONS, "Réponses", "Satisfaits (%)"])
+        for key, counters in groups:
+            for row_index, (section, label, _) in enumerate(RATING_ROWS):
+                counts = counters.row_counts(row_index)
+                answered = sum(counts)
+                satisfied = f"{100 * (counts[0] + counts[1]) / answered:.0f}" if answered else ""
+                writer.writerow([*key, section, label, *counts, answered, satisfied])
+    return path
+
+
+def _write_summary(path: Path, keys: list[str], groups: list) -> Path:
+    with path.open("w", newline="", encoding="utf-8-sig") as handle:
+        writer = csv.writer(handle, delimiter=";")
+        writer.writerow(keys + ["Questionnaires", "Note moyenne /10", *EXPECTATION_OPTIONS])
+        for key, counters in groups:
+            average = counters.note_average
+            writer.writerow(
+                [*key, counters.responses, f"{average:.1f}" if average is not None else "", *counters.expectations]
+            )
+    return path
+
+
+def _field_value(meta) -> str:
+    value = meta.get("/V")
+    if value is None:
+        return ""
+    if isinstance(value, NameObject) or meta.get("/FT") == "/Btn":
+        # Valeur d'export d'un bouton radio : "/satisfait" -> "satisfait".
+        return str(value).lstrip("/")
+    return str(value).strip()
+
+
+def _parse_note(raw: str) -> float | None:
+    try:
+        note = float(raw.replace(",", ".").split("/")[0])
+    except ValueError:
+        return None
+    return note if 0 <= note <= 10 else None
@@ -1,11 +1,18 @@
 import io
+import sys
 import tempfile
 import zipfile
 from pathlib import Path
 
 import streamlit as st
 
-from questionnaire_core import QuestionnaireData, render_questionnaire, split_full_name
+# `zip_entries` est partagé à la racine du dépôt.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from questionnaire_core import QuestionnaireData, render_questionnaire, split_full_name  # noqa: E402
+from zip_entries import write_zip_entry  # noqa: E402
 
 
 DEFAULT_OUTPUT_DIR = Path("generateur_questionnaire/questionnaires_satisfaction")
@@ -44,7 +51,8 @@ def _build_zip_buffer(paths: list[Path]) -> bytes:
     buffer = io.BytesIO()
     with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
         for file_path in paths:
-            archive.write(file_path, arcname=file_path.name)
+            # Date fixe : des questionnaires identiques donnent la même archive.
+            write_zip_entry(archive, file_path.name, file_path.read_bytes())
     buffer.seek(0)
     return buffer.read()
 
@@ -77,6 +85,11 @@ with st.form("questionnaire_form"):
         help="Le logo sera affiché dans l'en-tête de chaque questionnaire.",
     )
 
+    fillable = st.checkbox(
+        "PDF remplissables",
+        help="Boutons radio et zones de texte à remplir à l'écran, agrégeables avec agregation_questionnaires.py.",
+    )
+
     submitted = st.form_submit_button("Générer les questionnaires")
 
 
@@ -111,7 +124,7 @@ if submitted:
                         end_date=end_date,
                         logo_path=logo_path,
                     )
-                    pdf_path = render_questionnaire(data, DEFAULT_OUTPUT_DIR)
+                    pdf_path = render_questionnaire(data, DEFAULT_OUTPUT_DIR, fillable=fillable, reproducible=True)
                     generated_paths.append(pdf_path)
 
         if generated_paths:
@@ -1,4 +1,5 @@
-from questionnaire_core import QuestionnaireData, render_questionnaire, split_full_name
+from questionnaire_core import (QuestionnaireData, questionnaire_filename, render_questionnaire,
+                                render_questionnaire_bytes, split_full_name)
 
 
 def test_split_full_name_variants():
@@ -21,3 +22,37 @@ def test_render_questionnaire_creates_pdf(tmp_path):
     pdf_path = render_questionnaire(data, output_dir=tmp_path)
     assert pdf_path.exists()
     assert pdf_path.stat().st_size > 0
+
+
+def test_render_questionnaire_bytes_matches_file_name(tmp_path):
+    data = QuestionnaireData(
+        participant_last_name="Martin",
+        participant_first_name="Alice",
+        company="Entreprise Test",
+        training_program="Formation Python",
+        training_center="Centre Paris",
+        start_date="01/01/2024",
+        end_date="05/01/2024",
+    )
+    pdf_bytes = render_questionnaire_bytes(data, reproducible=True)
+    pdf_path = render_questionnaire(data, tmp_path, reproducible=True)
+
+    assert pdf_path.name == questionnaire_filename(data) == "Questionnaire_martin_formation_python.pdf"
+    assert pdf_bytes.startswith(b"%PDF")
+    assert pdf_bytes == pdf_path.read_bytes()
+
+
+def test_reproducible_questionnaire_is_byte_identical():
+    data = QuestionnaireData(
+        participant_last_name="Martin",
+        participant_first_name="Alice",
+        company="Entreprise Test",
+        training_program="Formation Python",
+        training_center="Centre Paris",
+        start_date="01/01/2024",
+        end_date="05/01/2024",
+    )
+
+    for fillable in (False, True):
+        first = render_questionnaire_bytes(data, fillable=fillable, reproducible=True)
+        assert render_questionnaire_bytes(data, fillable=fillable, reproducible=True) == first
@@ -0,0 +1,72 @@
+import csv
+import io
+
+from pypdf import PdfReader, PdfWriter
+
+from questionnaire_core import QuestionnaireData, render_questionnaire_bytes
+from questionnaire_responses import RATING_ROWS, aggregate, read_response, write_reports
+
+
+def _data(company="ACME", program="Vente"):
+    return QuestionnaireData(
+        participant_last_name="Martin",
+        participant_first_name="Alice",
+        company=company,
+        training_program=program,
+        training_center="Centre Paris",
+        start_date="01/01/2024",
+        end_date="05/01/2024",
+    )
+
+
+def _fill(pdf_bytes, values, path):
+    writer = PdfWriter(clone_from=PdfReader(io.BytesIO(pdf_bytes)))
+    for page in writer.pages:
+        writer.update_page_form_field_values(page, values, auto_regenerate=False)
+    writer.write(path)
+    return path
+
+
+def test_fillable_questionnaire_declares_radio_groups_and_text_fields():
+    fields = PdfReader(io.BytesIO(render_questionnaire_bytes(_data(), fillable=True))).get_fields()
+
+    assert {name for _, _, name in RATING_ROWS} <= set(fields)
+    assert fields["organisation_1"]["/FT"] == "/Btn"
+    assert fields["suggestions"]["/FT"] == "/Tx"
+    assert fields["programme"]["/V"] == "Vente"
+
+
+def test_print_questionnaire_has_no_form():
+    assert PdfReader(io.BytesIO(render_questionnaire_bytes(_data()))).get_fields() is None
+
+
+def test_read_and_aggregate_responses(tmp_path):
+    template = render_questionnaire_bytes(_data(), fillable=True)
+    other_session = render_questionnaire_bytes(_data(company="Globex"), fillable=True)
+    paths = [
+        _fill(template, {"organisation_1": "/tres_satisfait", "attentes": "/choix_1", "note_sur_10": "9"}, tmp_path / "a.pdf"),
+        _fill(template, {"organisation_1": "/peu_satisfait", "note_sur_10": "7", "suggestions": "Plus de pauses"}, tmp_path / "b.pdf"),
+        _fill(other_session, {"organisation_1": "/satisfait"}, tmp_path / "c.pdf"),
+    ]
+
+    responses = [read_response(path) for path in paths]
+    assert responses[1].comments == {"suggestions": "Plus de pauses"}
+
+    sessions, programs = aggregate(responses)
+    assert len(sessions) == 2
+    assert programs["Vente"].responses == 3
+    assert programs["Vente"].row_counts(0) == [1, 1, 1, 0]
+    assert programs["Vente"].note_average == 8
+
+    report_paths = write_reports(sessions, programs, tmp_path / "rapports")
+    with report_paths[2].open(encoding="utf-8-sig") as handle:
+        rows = list(csv.reader(handle, delimiter=";"))
+    assert rows[1][:7] == ["Vente", "organisation", "Accueil", "1", "1", "1", "0"]
+    assert rows[1][-1] == "67"
+
+
+def test_read_response_ignores_other_pdfs(tmp_path):
+    path = tmp_path / "print.pdf"
+    path.write_bytes(render_questionnaire_bytes(_data()))
+
+    assert read_response(path) is None
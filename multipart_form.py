@@ -0,0 +1,233 @@
+import hashlib
+import re
+from dataclasses import dataclass
+from email.message import Message
+from email.parser import HeaderParser
+from pathlib import Path
+from typing import BinaryIO
+
+CHUNK_SIZE = 64 * 1024
+MAX_HEADER_BYTES = 16 * 1024
+
+
+class MultipartError(ValueError):
+    status = 400
+
+
+class PayloadTooLarge(MultipartError):
+    status = 413
+
+
+@dataclass(frozen=True)
+class UploadLimits:
+    max_total_bytes: int = 5 * 1024 * 1024
+    max_field_bytes: int = 256 * 1024
+    max_file_bytes: int = 4 * 1024 * 1024
+
+
+@dataclass
+class UploadedFile:
+    field_name: str
+    filename: str
+    content_type: str
+    path: Path
+    size: int
+    sha256: str
+
+
+class _TextSink:
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.buffer = bytearray()
+
+    def write(self, data: bytes) -> None:
+        if len(self.buffer) + len(data) > self.limit:
+            raise PayloadTooLarge(f"Field '{self.name}' exceeds {self.limit} bytes.")
+        self.buffer.extend(data)
+
+
+class _FileSink:
+    def __init__(self, name: str, filename: str, content_type: str, path: Path, limit: int):
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.path = path
+        self.limit = limit
+        self.size = 0
+        self.digest = hashlib.sha256()
+        self.handle = path.open("wb")
+
+    def write(self, data: bytes) -> None:
+        self.size += len(data)
+        if self.size > self.limit:
+            self.close()
+            self.path.unlink(missing_ok=True)
+            raise PayloadTooLarge(f"File '{self.name}' exceeds {self.limit} bytes.")
+        self.digest.update(data)
+        self.handle.write(data)
+
+    def close(self) -> None:
+        if not self.handle.closed:
+            self.handle.close()
+
+
+def parse_boundary(content_type: str) -> bytes:
+    message = Message()
+    message["Content-Type"] = content_type
+    if message.get_content_type() != "multipart/form-data":
+        raise MultipartError("Expected a multipart/form-data body.")
+    boundary = message.get_param("boundary")
+    if not boundary or not isinstance(boundary, str) or len(boundary) > 70:
+        raise MultipartError("Missing or invalid multipart boundary.")
+    return boundary.encode("latin-1")
+
+
+def parse_multipart(
+    stream: BinaryIO,
+    content_type: str,
+    content_length: int,
+    spool_dir: Path,
+    limits: UploadLimits = UploadLimits(),
+) -> tuple[dict[str, str], dict[str, UploadedFile]]:
+    """Parse a multipart/form-data body while it is read from ``stream``.
+
+    Exactly ``content_length`` bytes are consumed. Text fields are returned
+    decoded; file parts are written to ``spool_dir`` chunk by chunk and
+    hashed on the fly, so an upload is never held in memory as a whole.
+    Oversized bodies, fields or files raise :class:`PayloadTooLarge` as soon
+    as the limit is crossed.
+    """
+    if content_length > limits.max_total_bytes:
+        raise PayloadTooLarge(f"Request body exceeds {limits.max_total_bytes} bytes.")
+    boundary = parse_boundary(content_type)
+    parser = _Parser(boundary, Path(spool_dir), limits)
+    remaining = content_length
+    try:
+        while remaining > 0:
+            chunk = stream.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                raise MultipartError("Request body ended before Content-Length bytes were read.")
+            remaining -= len(chunk)
+            parser.feed(chunk)
+        return parser.finish()
+    except Exception:
+        parser.abort()
+        raise
+
+
+class _Parser:
+    def __init__(self, boundary: bytes, spool_dir: Path, limits: UploadLimits):
+        self.delimiter = b"--" + boundary
+        self.part_delimiter = b"\r\n" + self.delimiter
+        self.spool_dir = spool_dir
+        self.limits = limits
+        self.buffer = b""
+        self.state = "preamble"
+        self.sink: _TextSink | _FileSink | None = None
+        self.fields: dict[str, str] = {}
+        self.files: dict[str, UploadedFile] = {}
+
+    def feed(self, data: bytes) -> None:
+        self.buffer += data
+        while True:
+            if self.state == "preamble":
+                index = self.buffer.find(self.delimiter)
+                if index < 0:
+                    self.buffer = self.buffer[-len(self.delimiter):]
+                    return
+                self.buffer = self.buffer[index + len(self.delimiter):]
+                self.state = "after_delimiter"
+            elif self.state == "after_delimiter":
+                if len(self.buffer) < 2:
+                    return
+                if self.buffer.startswith(b"--"):
+                    self.state = "done"
+                    self.buffer = b""
+                    return
+                if not self.buffer.startswith(b"\r\n"):
+                    raise MultipartError("Malformed multipart delimiter.")
+                self.buffer = self.buffer[2:]
+                self.state = "headers"
+            elif self.state == "headers":
+                index = self.buffer.find(b"\r\n\r\n")
+                if index < 0:
+                    if len(self.buffer) > MAX_HEADER_BYTES:
+                        raise PayloadTooLarge("Multipart part headers are too large.")
+                    return
+                self._open_part(self.buffer[:index])
+                self.buffer = self.buffer[index + 4:]
+                self.state = "body"
+            elif self.state == "body":
+                index = self.buffer.find(self.part_delimiter)
+                if index < 0:
+                    keep = len(self.part_delimiter) - 1
+                    if len(self.buffer) > keep:
+                        self.sink.write(self.buffer[:-keep])
+                        self.buffer = self.buffer[-keep:]
+                    return
+                self.sink.write(self.buffer[:index])
+                self._close_part()
+                self.buffer = self.buffer[index + len(self.part_delimiter):]
+                self.state = "after_delimiter"
+            else:
+                # Epilogue after the closing delimiter is ignored.
+                self.buffer = b""
+                return
+
+    def finish(self) -> tuple[dict[str, str], dict[str, UploadedFile]]:
+        if self.state != "done":
+            raise MultipartError("Multipart body is incomplete.")
+        return self.fields, self.files
+
+    def abort(self) -> None:
+        if isinstance(self.sink, _FileSink):
+            self.sink.close()
+            self.sink.path.unlink(missing_ok=True)
+        for upload in self.files.values():
+            upload.path.unlink(missing_ok=True)
+
+    def _open_part(self, raw_headers: bytes) -> None:
+        headers = HeaderParser().parsestr(raw_headers.decode("utf-8", "replace"))
+        if headers.get_content_disposition() != "form-data":
+            raise MultipartError("Multipart part without form-data disposition.")
+        name = headers.get_param("name", header="content-disposition")
+        if not name or not isinstance(name, str):
+            raise MultipartError("Multipart part without a field name.")
+        filename = headers.get_filename()
+        if filename is None:
+            self.sink = _TextSink(name, self.limits.max_field_bytes)
+            return
+        path = self.spool_dir / f"upload_{len(self.files)}{_safe_suffix(filename)}"
+        self.sink = _FileSink(
+            name,
+            filename,
+            headers.get_content_type(),
+            path,
+            self.limits.max_file_bytes,
+        )
+
+    def _close_part(self) -> None:
+        sink = self.sink
+        self.sink = None
+        if isinstance(sink, _TextSink):
+            self.fields[sink.name] = sink.buffer.decode("utf-8", "replace")
+            return
+        sink.close()
+        if not sink.filename and sink.size == 0:
+            # Empty <input type="file">: the browser sends a part without content.
+            sink.path.unlink(missing_ok=True)
+            return
+        self.files[sink.name] = UploadedFile(
+            field_name=sink.name,
+            filename=sink.filename,
+            content_type=sink.content_type,
+            path=sink.path,
+            size=sink.size,
+            sha256=sink.digest.hexdigest(),
+        )
+
+
+def _safe_suffix(filename: str) -> str:
+    suffix = Path(filename.replace("\\", "/")).suffix.lower()
+    return suffix if re.fullmatch(r"\.[a-z0-9]{1,8}", suffix) else ""
@@ -0,0 +1,216 @@
+"""
+Pré-génération des archives des sessions à venir, pendant les heures creuses.
+
+Lit un fichier de sessions (JSON ou CSV) et rend à l'avance le ZIP des
+sessions qui commencent dans les `--jours` prochains jours. Les archives sont
+rangées dans `PregeneratedArchives` (dossier `PREGENERATED_DIR`) sous
+l'empreinte de leurs entrées : quand le formulaire de l'API, de la page web ou
+de l'interface Streamlit décrit exactement la même session (mêmes champs, même
+sélection de documents, même logo), l'archive est servie sans rien générer.
+
+Chaque session reprend les clés du JSON `data` de l'API : `company`,
+`training`, `duration`, `location`, `dates`, `participants` et, en option,
+`provider`, `signatory`, `documents` et `logo` (chemin du fichier, relatif au
+fichier de sessions). Les noms des options de `documents_formation.py`
+(`societe`, `formation`, `duree`, `lieu`, `organisme`, `signataire`) sont
+aussi acceptés comme en-têtes de colonnes CSV.
+
+Utilisation :
+
+    python pregeneration.py sessions.json --jours 7 --creneau 20:00-07:00
+    python pregeneration.py sessions.csv --boucle --intervalle 900
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from datetime import time as day_time
+from pathlib import Path
+from typing import Callable, Iterable
+
+from artefact_store import PregeneratedArchives
+from documents_formation import (TrainingSession, build_archive, parse_date, session_fingerprint,
+                                 session_from_payload)
+
+COLUMN_ALIASES = {
+    "societe": "company",
+    "formation": "training",
+    "duree": "duration",
+    "lieu": "location",
+    "organisme": "provider",
+    "signataire": "signatory",
+}
+
+
+@dataclass(frozen=True)
+class PlannedSession:
+    """Session lue dans le fichier, avec l'empreinte sous laquelle son ZIP est rangé."""
+
+    session: TrainingSession
+    documents: tuple[str, ...]
+    fingerprint: str
+    start: date | None
+
+    @property
+    def title(self) -> str:
+        return f"{self.session.company} – {self.session.training} ({self.session.dates[0]})"
+
+
+def load_sessions(path: str | Path) -> list[PlannedSession]:
+    """
+    Sessions d'un fichier JSON (liste d'objets) ou CSV (séparateur `;` ou `,`).
+
+    Lève `ValueError` en indiquant la session fautive si un champ obligatoire
+    manque, si un type de document est inconnu ou si le logo est introuvable.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        rows = _read_csv(path)
+    else:
+        rows = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(rows, list):
+            raise ValueError(f"{path} : une liste de sessions est attendue.")
+
+    planned = []
+    for index, row in enumerate(rows, start=1):
+        try:
+            planned.append(_plan(row, path.parent))
+        except (OSError, ValueError) as exc:
+            raise ValueError(f"{path}, session {index} : {exc}") from exc
+    return planned
+
+
+def select_upcoming(planned: Iterable[PlannedSession], today: date, days: int) -> list[PlannedSession]:
+    """Sessions dont le premier jour tombe entre `today` et `today + days` inclus."""
+    last_day = today + timedelta(days=days)
+    return [item for item in planned if item.start is not None and today <= item.start <= last_day]
+
+
+def parse_window(value: str) -> tuple[day_time, day_time]:
+    """Créneau `HH:MM-HH:MM` ; il peut passer minuit (`20:00-07:00`)."""
+    try:
+        start, end = (datetime.strptime(part.strip(), "%H:%M").time() for part in value.split("-"))
+    except ValueError as exc:
+        raise ValueError(f"Créneau invalide '{value}' (format attendu : HH:MM-HH:MM).") from exc
+    return start, end
+
+
+def in_window(moment: datetime, window: tuple[day_time, day_time] | None) -> bool:
+    if window is None:
+        return True
+    start, end = window
+    current = moment.time()
+    if start <= end:
+        return start <= current < end
+    return current >= start or current < end
+
+
+def pregenerate(
+    planned: Iterable[PlannedSession],
+    archives: PregeneratedArchives,
+    log: Callable[[str], None] = print,
+    workers: int | None = None,
+) -> list[Path]:
+    """Rend et range les archives manquantes ; renvoie les fichiers écrits."""
+    written = []
+    for item in planned:
+        if item.fingerprint in archives:
+            log(f"{item.title} : déjà pré-générée")
+            continue
+        started = time.perf_counter()
+        path = archives.put(item.fingerprint, build_archive(item.session, item.documents, workers=workers))
+        log(
+            f"{item.title} : {len(item.session.participants)} participant(s) en "
+            f"{time.perf_counter() - started:.1f} s -> {path.name}"
+        )
+        written.append(path)
+    return written
+
+
+def _plan(row: dict, base_dir: Path) -> PlannedSession:
+    if not isinstance(row, dict):
+        raise ValueError("un objet JSON est attendu.")
+    payload = {COLUMN_ALIASES.get(key, key): value for key, value in row.items() if key}
+    logo_path = None
+    logo_sha256 = None
+    if payload.get("logo"):
+        logo = base_dir / str(payload["logo"]).strip()
+        logo_sha256 = hashlib.sha256(logo.read_bytes()).hexdigest()
+        logo_path = str(logo)
+    session, documents = session_from_payload(payload, logo_path)
+    starts = [parsed.date() for parsed in map(parse_date, session.dates) if parsed]
+    return PlannedSession(
+        session=session,
+        documents=documents,
+        fingerprint=session_fingerprint(session, documents, logo_sha256),
+        start=min(starts) if starts else None,
+    )
+
+
+def _read_csv(path: Path) -> list[dict]:
+    text = path.read_text(encoding="utf-8-sig")
+    try:
+        dialect = csv.Sniffer().sniff(text.split("\n", 1)[0], delimiters=";,")
+        delimiter = dialect.delimiter
+    except csv.Error:
+        delimiter = ";"
+    return list(csv.DictReader(text.splitlines(keepends=True), delimiter=delimiter))
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Pré-génère les sessions à venir, une fois ou en boucle pendant le créneau.
+    """
+    parser = argparse.ArgumentParser(description="Pré-génère les ZIP des sessions de formation à venir.")
+    parser.add_argument("sessions", help="Fichier de sessions (.json ou .csv)")
+    parser.add_argument("--jours", type=int, default=7, help="Horizon en jours (7 par défaut)")
+    parser.add_argument(
+        "--creneau",
+        default=None,
+        help="Heures creuses HH:MM-HH:MM (ex. 20:00-07:00) ; hors créneau, rien n'est généré",
+    )
+    parser.add_argument("--boucle", action="store_true", help="Relit le fichier et recommence à chaque intervalle")
+    parser.add_argument("--intervalle", type=float, default=900, help="Secondes entre deux passages (900)")
+    parser.add_argument("--dossier", default=None, help="Dossier des archives (PREGENERATED_DIR par défaut)")
+    parser.add_argument("--processus", type=int, default=1, help="Nombre de processus de rendu (1 par défaut)")
+    parser.add_argument(
+        "--purge",
+        type=float,
+        default=30,
+        help="Supprime les archives écrites il y a plus de N jours (30, 0 pour conserver)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        window = parse_window(args.creneau) if args.creneau else None
+    except ValueError as exc:
+        parser.error(str(exc))
+    root = Path(__file__).resolve().parent
+    for path in (root / "generateur_questionnaire", root / "attestations_formation"):
+        if str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+    archives = PregeneratedArchives(args.dossier)
+
+    while True:
+        now = datetime.now()
+        if in_window(now, window):
+            if args.purge > 0:
+                archives.prune(args.purge * 86400)
+            planned = select_upcoming(load_sessions(args.sessions), now.date(), args.jours)
+            written = pregenerate(planned, archives, workers=args.processus)
+            print(f"{len(planned)} session(s) à venir, {len(written)} archive(s) générée(s) dans {archives.root}")
+        else:
+            print(f"{now:%H:%M} : hors du créneau {args.creneau}, aucune génération")
+        if not args.boucle:
+            break
+        time.sleep(args.intervalle)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, ContextManager, Iterator
+
+PROFILE_DIR_ENV = "PROFILE_DIR"
+DEFAULT_PROFILE_DIR = "profiles"
+# Keeps file names unique when a web worker profiles successive requests.
+_sequence = itertools.count(1)
+# Only one cProfile can be active per process on Python >= 3.12 (and on older
+# versions concurrent profiles mix their samples), so one block is profiled at
+# a time.
+_active = threading.Lock()
+
+
+class Profile:
+    """cProfile plus a stack sampler around one run of the calling thread.
+
+    cProfile gives exact call counts and cumulative times (``.pstats``, for
+    ``python -m pstats`` or snakeviz); the sampler records the whole stack of
+    the thread every ``interval`` seconds and writes it in the collapsed format
+    (``a;b;c 12``) read by ``flamegraph.pl``, inferno or speedscope. Only the
+    thread that enters the context is profiled: worker processes are not.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.profiler = cProfile.Profile()
+        self.samples: Counter[str] = Counter()
+        self.seconds = 0.0
+        self._thread_id = 0
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+        self._started = 0.0
+
+    def __enter__(self) -> Profile:
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, name="profile-sampler", daemon=True)
+        self._sampler.start()
+        self._started = time.perf_counter()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.disable()
+        self.seconds = time.perf_counter() - self._started
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def top(self, limit: int = 20, sort: str = "cumulative") -> str:
+        """The ``limit`` functions with the largest cumulative time, as printed by pstats."""
+        output = io.StringIO()
+        pstats.Stats(self.profiler, stream=output).sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.samples.items()))
+
+    def write(self, output_dir: str | Path, name: str) -> tuple[Path, Path]:
+        """Write ``<name>-<timestamp>-<pid>-<n>.pstats`` and ``.collapsed`` in ``output_dir``."""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{name}-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}-{next(_sequence)}"
+        stats_path = output_dir / f"{stem}.pstats"
+        collapsed_path = output_dir / f"{stem}.collapsed"
+        self.profiler.dump_stats(stats_path)
+        collapsed_path.write_text(self.collapsed(), encoding="utf-8")
+        return stats_path, collapsed_path
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    path = Path(code.co_filename)
+    location = f"{path.parent.name}/{path.name}" if path.parent.name else path.name
+    return f"{code.co_name} ({location}:{code.co_firstlineno})"
+
+
+def profile_dir_from_env() -> str | None:
+    """Directory named by ``PROFILE_DIR``, used by the web apps to profile each generation."""
+    return os.environ.get(PROFILE_DIR_ENV) or None
+
+
+@contextmanager
+def profiled(
+    name: str,
+    output_dir: str | Path | None,
+    limit: int = 20,
+    log: Callable[[str], None] = print,
+) -> Iterator[Profile | None]:
+    """Profile the block when ``output_dir`` is set, then write the files and log the top functions.
+
+    With ``output_dir=None`` the block runs unprofiled, so callers can wrap
+    their work unconditionally. A block entered while another one is being
+    profiled (a concurrent request of the same worker) also runs unprofiled.
+    """
+    if output_dir is None:
+        yield None
+        return
+    if not _active.acquire(blocking=False):
+        log(f"{name} not profiled: another profile is already running in this process")
+        yield None
+        return
+    profile = Profile()
+    try:
+        with profile:
+            yield profile
+    finally:
+        _active.release()
+        stats_path, collapsed_path = profile.write(output_dir, name)
+        log(
+            f"Profile of {name} ({profile.seconds:.2f} s): {stats_path} (pstats), "
+            f"{collapsed_path} (collapsed stacks)\n{profile.top(limit)}"
+        )
+
+
+def profiled_from_env(name: str) -> ContextManager[Profile | None]:
+    """``profiled`` in ``PROFILE_DIR`` with the summary on stderr; a no-op when the variable is unset."""
+    return profiled(name, profile_dir_from_env(), log=lambda text: print(text, file=sys.stderr))
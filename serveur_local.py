@@ -0,0 +1,299 @@
+"""
+Serveur autonome pour héberger la page web et l'API hors de Vercel.
+
+Reprend le routage de `vercel.json` : `/api/generate` est servi par la classe
+`handler` de `api/generate.py` (la même que sur Vercel) et le reste par les
+fichiers de `public/` (`/` renvoie `index.html`).
+
+Les connexions acceptées sont placées dans une file bornée (`--file-attente`)
+et traitées par un nombre fixe de threads (`--workers`) : au-delà, le serveur
+répond aussitôt `503` au lieu d'accumuler les requêtes. Les connexions restent
+ouvertes entre deux requêtes (HTTP/1.1 keep-alive) jusqu'à `--inactivite`
+secondes sans activité ; pendant ce temps elles n'occupent pas de thread, si
+bien que `--workers` borne les requêtes traitées en même temps et non les
+connexions ouvertes. À `SIGTERM` ou `Ctrl+C`, le serveur n'accepte plus de
+connexion et laisse `--arret` secondes aux requêtes en cours pour se terminer.
+
+Utilisation :
+
+    python serveur_local.py --port 8000 --workers 8 --file-attente 64
+"""
+from __future__ import annotations
+
+import argparse
+import mimetypes
+import queue
+import selectors
+import signal
+import socket
+import sys
+import threading
+import time
+from http.server import HTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+ROOT = Path(__file__).resolve().parent
+PUBLIC_DIR = ROOT / "public"
+sys.path.insert(0, str(ROOT / "api"))
+
+import generate  # noqa: E402
+
+BUSY_RESPONSE = (
+    b"HTTP/1.1 503 Service Unavailable\r\n"
+    b"Content-Type: text/plain; charset=utf-8\r\n"
+    b"Content-Length: 12\r\n"
+    b"Retry-After: 1\r\n"
+    b"Connection: close\r\n"
+    b"\r\n"
+    b"Server busy."
+)
+
+
+class LocalHandler(generate.handler):
+    """`handler` de l'API en HTTP/1.1, plus les fichiers statiques de `public/`."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        # Délai de lecture d'une requête commencée (en-têtes et corps).
+        self.timeout = self.server.idle_timeout
+        self.keep_alive = False
+        super().setup()
+
+    def handle(self) -> None:
+        """
+        Traite les requêtes déjà arrivées sur la connexion, puis rend le worker.
+
+        Une connexion keep-alive sans requête en attente n'occupe pas de
+        thread : `LocalServer` la surveille et la remet en file dès que le
+        client envoie la suivante.
+        """
+        self.handle_one_request()
+        while not self.close_connection and not self.server.stopping and self._request_pending():
+            self.handle_one_request()
+        self.keep_alive = not self.close_connection and not self.server.stopping
+
+    def _request_pending(self) -> bool:
+        # Octets déjà lus dans le tampon de `rfile` (ou arrivés entre-temps) : on ne
+        # peut pas rendre la connexion sans les perdre, il faut les traiter ici.
+        self.connection.setblocking(False)
+        try:
+            return bool(self.rfile.peek(1))
+        except (BlockingIOError, ValueError, OSError):
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if path.startswith("/api/"):
+            if path.rstrip("/") != "/api/generate":
+                generate._send_text(self, 404, "Not found.")
+                return
+            super().do_GET()
+            return
+        self._send_static(path)
+
+    def do_POST(self) -> None:
+        if urlsplit(self.path).path.rstrip("/") != "/api/generate":
+            self.close_connection = True
+            generate._send_text(self, 404, "Not found.")
+            return
+        super().do_POST()
+
+    def _send_static(self, path: str) -> None:
+        relative = unquote(path).lstrip("/") or "index.html"
+        target = (PUBLIC_DIR / relative).resolve()
+        if not target.is_relative_to(PUBLIC_DIR) or not target.is_file():
+            generate._send_text(self, 404, "Not found.")
+            return
+        data = target.read_bytes()
+        content_type = mimetypes.guess_type(target.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/"):
+            content_type += "; charset=utf-8"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class LocalServer(HTTPServer):
+    """
+    Serveur HTTP à nombre fixe de threads et file d'attente bornée.
+
+    Le thread de `serve_forever` ne fait qu'accepter les connexions ; les
+    `workers` threads traitent les requêtes. Une connexion keep-alive inactive
+    est rendue à un thread de surveillance (`selectors`) qui la remet en file
+    quand une nouvelle requête arrive, ou la ferme après `idle_timeout`
+    secondes : `workers` borne les requêtes traitées en même temps, pas les
+    connexions ouvertes. Une connexion qui ne trouve pas de place dans la file
+    reçoit `503` et est fermée.
+    """
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        workers: int = 8,
+        queue_size: int = 64,
+        idle_timeout: float = 5.0,
+        handler_class=LocalHandler,
+    ):
+        if workers < 1 or queue_size < 1:
+            raise ValueError("workers and queue_size must be at least 1.")
+        self.request_queue_size = queue_size
+        super().__init__(address, handler_class)
+        self.idle_timeout = idle_timeout
+        self.stopping = False
+        self._connections: queue.Queue = queue.Queue(queue_size)
+        self._idle = selectors.DefaultSelector()
+        self._idle_lock = threading.Lock()
+        self._idle_pending: list[tuple[socket.socket, tuple, float]] = []
+        self._wakeup_read, self._wakeup_write = socket.socketpair()
+        self._wakeup_write.setblocking(False)
+        self._idle.register(self._wakeup_read, selectors.EVENT_READ)
+        self._watcher = threading.Thread(target=self._watch_idle, name="serveur-local-inactives", daemon=True)
+        self._watcher.start()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"serveur-local-{index}", daemon=True) for index in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def process_request(self, request, client_address) -> None:
+        try:
+            self._connections.put_nowait((request, client_address))
+        except queue.Full:
+            try:
+                request.sendall(BUSY_RESPONSE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+
+    def finish_request(self, request, client_address):
+        return self.RequestHandlerClass(request, client_address, self)
+
+    def _work(self) -> None:
+        while True:
+            item = self._connections.get()
+            if item is None:
+                return
+            request, client_address = item
+            keep_alive = False
+            try:
+                keep_alive = self.finish_request(request, client_address).keep_alive
+            except Exception:
+                self.handle_error(request, client_address)
+            if keep_alive:
+                self._park(request, client_address)
+            else:
+                self.shutdown_request(request)
+
+    def _park(self, request, client_address) -> None:
+        with self._idle_lock:
+            self._idle_pending.append((request, client_address, time.monotonic() + self.idle_timeout))
+        self._wake_watcher()
+
+    def _wake_watcher(self) -> None:
+        try:
+            self._wakeup_write.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # Déjà réveillé (tampon plein) ou en cours d'arrêt.
+
+    def _watch_idle(self) -> None:
+        deadlines: dict[socket.socket, float] = {}
+        while not self.stopping:
+            with self._idle_lock:
+                pending, self._idle_pending = self._idle_pending, []
+            for request, client_address, deadline in pending:
+                self._idle.register(request, selectors.EVENT_READ, client_address)
+                deadlines[request] = deadline
+            now = time.monotonic()
+            for request in [request for request, deadline in deadlines.items() if deadline <= now]:
+                self._idle.unregister(request)
+                del deadlines[request]
+                self.shutdown_request(request)
+            timeout = max(0.0, min(deadlines.values()) - now) if deadlines else None
+            for key, _ in self._idle.select(timeout):
+                if key.fileobj is self._wakeup_read:
+                    self._wakeup_read.recv(4096)
+                    continue
+                self._idle.unregister(key.fileobj)
+                del deadlines[key.fileobj]
+                self.process_request(key.fileobj, key.data)
+        for request in deadlines:
+            self.shutdown_request(request)
+        with self._idle_lock:
+            pending, self._idle_pending = self._idle_pending, []
+        for request, _, _ in pending:
+            self.shutdown_request(request)
+
+    def drain(self, timeout: float) -> bool:
+        """
+        Laisse les workers finir les connexions en file puis les arrête.
+
+        À appeler après `shutdown()`. Renvoie False si des requêtes tournaient
+        encore après `timeout` secondes.
+        """
+        deadline = time.monotonic() + timeout
+        # Les connexions inactives sont fermées ; celles qui reviennent d'un worker aussi.
+        self.stopping = True
+        self._wake_watcher()
+        for _ in self._workers:
+            # La file peut encore être pleine : attendre une place compte aussi dans le délai.
+            try:
+                self._connections.put(None, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                return False
+        for worker in self._workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+        return not any(worker.is_alive() for worker in self._workers)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.stopping = True
+        self._wake_watcher()
+        self._watcher.join(5)
+        self._idle.close()
+        self._wakeup_read.close()
+        self._wakeup_write.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Lance le serveur jusqu'à `SIGTERM` ou `Ctrl+C`.
+    """
+    parser = argparse.ArgumentParser(description="Sert la page web et l'API de génération sans Vercel.")
+    parser.add_argument("--hote", default="127.0.0.1", help="Adresse d'écoute (127.0.0.1 par défaut)")
+    parser.add_argument("--port", type=int, default=8000, help="Port d'écoute (8000 par défaut)")
+    parser.add_argument("--workers", type=int, default=8, help="Threads de traitement des requêtes (8)")
+    parser.add_argument("--file-attente", type=int, default=64, help="Connexions en attente avant de répondre 503 (64)")
+    parser.add_argument("--inactivite", type=float, default=5.0, help="Secondes avant de fermer une connexion inactive (5)")
+    parser.add_argument("--arret", type=float, default=30.0, help="Secondes laissées aux requêtes en cours à l'arrêt (30)")
+    parser.add_argument("--prechauffer", action="store_true", help="Charge les générateurs avant la première requête")
+    args = parser.parse_args(argv)
+
+    if args.prechauffer:
+        generate.warm()
+    server = LocalServer((args.hote, args.port), args.workers, args.file_attente, args.inactivite)
+
+    def stop(signum, frame) -> None:
+        # `shutdown` attend la fin de `serve_forever` : il ne peut pas être appelé depuis son thread.
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    host, port = server.server_address[:2]
+    print(f"Serveur prêt sur http://{host}:{port} ({args.workers} workers, file de {args.file_attente})")
+    try:
+        server.serve_forever()
+    finally:
+        print("Arrêt : fin des requêtes en cours...")
+        drained = server.drain(args.arret)
+        server.server_close()
+        print("Serveur arrêté." if drained else f"Serveur arrêté, requêtes interrompues après {args.arret:g} s.")
+
+
+if __name__ == "__main__":
+    main()
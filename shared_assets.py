@@ -0,0 +1,165 @@
+"""
+Fichiers partagés entre les processus de génération.
+
+Le processus parent crée `SharedAssets` : il lit une seule fois le template
+d'attestation et la signature, et les range bout à bout dans un
+fichier temporaire (sous `/dev/shm`, en mémoire, quand il existe). Chaque
+worker d'un pool l'attache avec `attach`, passé comme initialiseur : le
+fichier est projeté en lecture seule avec `mmap`, si bien que tous les
+workers lisent les mêmes pages physiques au lieu d'en garder chacun une
+copie. Le layout compilé est transmis une fois par worker, sans ses caches.
+Le logo des questionnaires n'en fait pas partie : chaque worker le lit
+depuis `logo_path`.
+
+    with SharedAssets({"signature": "signature.png"}, layout=layout) as assets:
+        with ProcessPoolExecutor(4, initializer=attach, initargs=(assets.handle,)) as pool:
+            ...
+
+Dans un worker, `open_asset(nom)` renvoie un flux en lecture sur la zone
+partagée (accepté par pypdf et reportlab) et `shared_layout()` le layout
+dont le template est lu depuis cette zone.
+"""
+from __future__ import annotations
+
+import io
+import mmap
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+
+@dataclass(frozen=True)
+class AssetsHandle:
+    """Ce qu'un worker reçoit pour attacher les fichiers : chemin, index et layout."""
+
+    path: str
+    index: tuple[tuple[str, int, int], ...]
+    layout: object | None = None
+
+
+class AssetReader(io.RawIOBase):
+    """Flux en lecture seule sur une zone mémoire, sans la copier."""
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = max(0, min(len(buffer), len(self._view) - self._position))
+        buffer[:size] = self._view[self._position : self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+
+class SharedAssets:
+    """
+    Côté parent : fichiers (chemins ou contenus) rangés dans une zone partagée.
+
+    Avec `layout`, son template est ajouté sous le nom `template`. La zone
+    est supprimée par `close` (ou en sortant du bloc `with`) ; les workers
+    déjà attachés gardent leur projection jusqu'à leur arrêt.
+    """
+
+    def __init__(self, files: dict[str, str | Path | bytes], layout=None, directory: str | Path | None = None):
+        files = dict(files)
+        if layout is not None and "template" not in files:
+            files["template"] = layout.template_data if layout.template_data is not None else layout.template_pdf
+        if directory is None and os.path.isdir("/dev/shm"):
+            directory = "/dev/shm"
+        handle, path = tempfile.mkstemp(prefix="documents_formation_", suffix=".assets", dir=directory)
+        index = []
+        offset = 0
+        with os.fdopen(handle, "wb") as output:
+            for name, source in files.items():
+                data = source if isinstance(source, bytes) else Path(source).read_bytes()
+                output.write(data)
+                index.append((name, offset, len(data)))
+                offset += len(data)
+        self.handle = AssetsHandle(path, tuple(index), layout)
+
+    def close(self) -> None:
+        try:
+            os.unlink(self.handle.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> SharedAssets:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class _Attached:
+    def __init__(self, handle: AssetsHandle):
+        with open(handle.path, "rb") as source:
+            size = os.fstat(source.fileno()).st_size
+            # Une zone vide ne peut pas être projetée.
+            self.mapping = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.whole = memoryview(self.mapping if self.mapping is not None else b"")
+        self.views = {name: self.whole[offset : offset + size] for name, offset, size in handle.index}
+        self.layout = handle.layout
+        if self.layout is not None and "template" in self.views:
+            self.layout.template_stream = lambda: AssetReader(self.views["template"])
+
+    def close(self) -> None:
+        if self.layout is not None:
+            self.layout.template_stream = None
+        for view in (*self.views.values(), self.whole):
+            view.release()
+        if self.mapping is not None:
+            try:
+                self.mapping.close()
+            except BufferError:
+                # Un flux encore ouvert la référence : elle sera libérée avec lui.
+                pass
+
+
+_attached: _Attached | None = None
+
+
+def attach(handle: AssetsHandle) -> None:
+    """Initialiseur de pool : projette les fichiers partagés dans le worker."""
+    global _attached
+    for path in (ROOT, ROOT / "generateur_questionnaire", ROOT / "attestations_formation"):
+        if str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+    detach()
+    _attached = _Attached(handle)
+
+
+def detach() -> None:
+    global _attached
+    if _attached is not None:
+        _attached.close()
+        _attached = None
+
+
+def open_asset(name: str) -> AssetReader | None:
+    """Flux sur le fichier partagé `name`, ou None hors d'un worker attaché."""
+    if _attached is None or name not in _attached.views:
+        return None
+    return AssetReader(_attached.views[name])
+
+
+def shared_layout():
+    """Layout compilé transmis par le parent, ou None hors d'un worker attaché."""
+    return _attached.layout if _attached is not None else None
@@ -1,51 +1,63 @@
-import io
+import hashlib
 import os
 import sys
 import tempfile
-import zipfile
-from datetime import datetime
+import uuid
+from dataclasses import replace
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable
 
 import streamlit as st
 
-from generateur_feuilles import create_presence_sheet
+from artefact_store import ArtefactStore, PregeneratedArchives, fingerprint_inputs
+from documents_formation import (DEFAULT_PROVIDER, DEFAULT_SIGNATORY, DOCUMENT_TYPES, TrainingSession, build_archive,
+                                 normalize_dates, session_fingerprint, session_from_payload)
+from profiling import profiled_from_env
 
-sys.path.append(str(Path(__file__).parent / "generateur_questionnaire"))
-from questionnaire_core import QuestionnaireData, render_questionnaire, split_full_name  # noqa: E402
+APP_ROOT = Path(__file__).parent
 
-attestation_root = Path(__file__).parent / "attestations_formation"
-ATTESTATION_AVAILABLE = False
-ATTESTATION_ERROR: str | None = None
-if attestation_root.exists():
-    sys.path.insert(0, str(attestation_root))
+
+@st.cache_resource(show_spinner=False)
+def _load_generators() -> SimpleNamespace:
+    """Import the document generators once per server process, not on every rerun."""
+    for path in (APP_ROOT / "generateur_questionnaire",):
+        if str(path) not in sys.path:
+            sys.path.append(str(path))
+    import generateur_feuilles  # noqa: F401
+    import questionnaire_core  # noqa: F401
+
+    generators = SimpleNamespace(attestation_available=False, attestation_error=None)
+
+    attestation_root = APP_ROOT / "attestations_formation"
+    if not attestation_root.exists():
+        return generators
+    if str(attestation_root) not in sys.path:
+        sys.path.insert(0, str(attestation_root))
     try:
-        from app.config import get_settings  # noqa: E402
-        from app.generate_attestation import generate_attestation  # noqa: E402
-        from app.utils import map_to_attestation_fields, sanitize_filename  # noqa: E402
-        ATTESTATION_AVAILABLE = True
+        from app.config import get_settings
+        import app.generate_attestation  # noqa: F401
     except ModuleNotFoundError as exc:
-        try:
-            import importlib
+        generators.attestation_error = str(exc)
+        return generators
 
-            sys.path.insert(0, str(attestation_root / "app"))
-            config_module = importlib.import_module("config")
-            generator_module = importlib.import_module("generate_attestation")
-            utils_module = importlib.import_module("utils")
+    generators.get_settings = get_settings
+    generators.attestation_available = True
+    return generators
 
-            get_settings = config_module.get_settings
-            generate_attestation = generator_module.generate_attestation
-            map_to_attestation_fields = utils_module.map_to_attestation_fields
-            sanitize_filename = utils_module.sanitize_filename
-            ATTESTATION_AVAILABLE = True
-        except Exception as fallback_exc:
-            ATTESTATION_ERROR = f"{exc} | fallback: {fallback_exc}"
-            ATTESTATION_AVAILABLE = False
 
+@st.cache_resource(show_spinner=False)
+def _load_settings():
+    return _load_generators().get_settings()
 
-st.set_page_config(page_title="Générateur de documents formation", page_icon="🧾")
 
-st.markdown(
-    """
+@st.cache_resource(show_spinner=False)
+def _load_attestation_layout():
+    """Compiled layout and template bytes, shared by every session."""
+    return _load_settings().compiled_attestation_layout.warm()
+
+
+APP_STYLES = """
     <style>
         @import url('https://fonts.googleapis.com/css2?family=Fraunces:wght@500;700&family=Work+Sans:wght@300;400;500;600&display=swap');
 
@@ -135,9 +147,32 @@ st.markdown(
             background-color: transparent;
         }
     </style>
-    """,
-    unsafe_allow_html=True,
-)
+"""
+
+
+st.set_page_config(page_title="Générateur de documents formation", page_icon="🧾")
+
+@st.cache_resource(show_spinner=False)
+def _artefact_store() -> ArtefactStore:
+    """Archives already built, per browser session (survives download-button reruns)."""
+    return ArtefactStore(
+        max_sessions=int(os.environ.get("ARTEFACT_MAX_SESSIONS", "32")),
+        max_memory_bytes=int(os.environ.get("ARTEFACT_MAX_MEMORY_MB", "256")) * 1024 * 1024,
+        spill_dir=os.environ.get("ARTEFACT_SPILL_DIR") or None,
+    )
+
+
+def _session_id() -> str:
+    if "artefact_session_id" not in st.session_state:
+        st.session_state["artefact_session_id"] = uuid.uuid4().hex
+    return st.session_state["artefact_session_id"]
+
+
+generators = _load_generators()
+ATTESTATION_AVAILABLE = generators.attestation_available
+ATTESTATION_ERROR: str | None = generators.attestation_error
+
+st.markdown(APP_STYLES, unsafe_allow_html=True)
 
 st.markdown(
     """
@@ -155,50 +190,11 @@ def _extract_participants(raw_value: str) -> list[str]:
     return [token for token in tokens if token]
 
 
-def _parse_date(raw_value: str) -> datetime | None:
-    if not raw_value:
-        return None
-    for fmt in ("%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d"):
-        try:
-            return datetime.strptime(raw_value.strip(), fmt)
-        except ValueError:
-            continue
-    return None
-
-
 def _extract_dates(raw_value: str) -> list[str]:
     tokens = [item.strip() for item in raw_value.replace(",", "\n").splitlines()]
     return [token for token in tokens if token]
 
 
-def _normalize_dates(raw_dates: list[str]) -> list[str]:
-    normalized = []
-    for raw in raw_dates:
-        parsed = _parse_date(raw)
-        if parsed:
-            normalized.append(parsed.strftime("%d/%m/%Y"))
-        else:
-            normalized.append(raw.strip())
-    return normalized
-
-
-def _select_date_bounds(dates_list: list[str]) -> tuple[str, str]:
-    first = ""
-    last = ""
-    for value in dates_list:
-        parsed = _parse_date(value)
-        if parsed:
-            formatted = parsed.strftime("%d/%m/%Y")
-            if not first:
-                first = formatted
-            last = formatted
-        else:
-            if not first:
-                first = value
-            last = value
-    return first, last
-
-
 def _collect_missing(
     societe: str,
     participants: list[str],
@@ -223,14 +219,83 @@ def _collect_missing(
     return missing
 
 
-def _build_zip_buffer(entries: list[tuple[Path, str]]) -> bytes:
-    buffer = io.BytesIO()
-    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
-        for file_path, arcname in entries:
-            if file_path.exists():
-                archive.write(file_path, arcname=arcname)
-    buffer.seek(0)
-    return buffer.read()
+def _generate_documents(
+    societe: str,
+    participants: tuple[str, ...],
+    duree: str,
+    lieu: str,
+    formation: str,
+    dates_list: tuple[str, ...],
+    provider_name: str,
+    signatory_name: str,
+    logo_name: str | None,
+    logo_bytes: bytes | None,
+    documents: tuple[str, ...],
+    progress: Callable[[dict], None] | None = None,
+) -> bytes:
+    """Render the selected documents in memory and return the ZIP bytes.
+
+    ``progress`` receives the per-document events of ``build_archive``.
+
+    Nothing is written to shared folders: each run only uses its own
+    temporary directory (for the logo), so concurrent sessions cannot
+    overwrite or pick up each other's files.
+    """
+    needs_attestations = any(DOCUMENT_TYPES[key].needs_attestation_module for key in documents)
+    settings = _load_settings() if needs_attestations else None
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logo_path = None
+        if logo_bytes is not None:
+            tmp_file = Path(tmpdir) / Path(logo_name or "logo").name
+            tmp_file.write_bytes(logo_bytes)
+            logo_path = str(tmp_file)
+
+        session = TrainingSession(
+            company=societe,
+            training=formation,
+            duration=duree,
+            location=lieu,
+            dates=tuple(dates_list),
+            participants=tuple(participants),
+            provider=provider_name,
+            signatory=signatory_name,
+            logo_path=logo_path,
+            attestation_layout=_load_attestation_layout() if needs_attestations else None,
+            attestation_backend=settings.attestation_backend if settings else None,
+            attestation_flatten=settings.attestation_flatten if settings else None,
+        )
+        with profiled_from_env("streamlit_app"):
+            return build_archive(session, documents, progress=progress)
+
+
+def _pregenerated_archive(inputs: dict) -> bytes | None:
+    """Archive rendered ahead of time by ``pregeneration.py`` for the same form, if any."""
+    payload = {
+        "company": inputs["societe"],
+        "training": inputs["formation"],
+        "duration": inputs["duree"],
+        "location": inputs["lieu"],
+        "dates": list(inputs["dates_list"]),
+        "participants": list(inputs["participants"]),
+        "provider": inputs["provider_name"],
+        "signatory": inputs["signatory_name"],
+        "documents": list(inputs["documents"]),
+    }
+    try:
+        session, documents = session_from_payload(payload)
+    except ValueError:
+        return None
+    if any(DOCUMENT_TYPES[key].needs_attestation_module for key in documents):
+        settings = _load_settings()
+        session = replace(
+            session,
+            attestation_layout=_load_attestation_layout(),
+            attestation_backend=settings.attestation_backend,
+            attestation_flatten=settings.attestation_flatten,
+        )
+    logo_sha256 = hashlib.sha256(inputs["logo_bytes"]).hexdigest() if inputs["logo_bytes"] is not None else None
+    return PregeneratedArchives().get(session_fingerprint(session, documents, logo_sha256))
 
 
 with st.form("presence_form"):
@@ -250,6 +315,13 @@ with st.form("presence_form"):
         height=120,
     )
 
+    documents = st.multiselect(
+        "Documents à générer",
+        options=list(DOCUMENT_TYPES),
+        default=list(DOCUMENT_TYPES),
+        format_func=lambda key: DOCUMENT_TYPES[key].label,
+    )
+
     st.markdown("<p class='section-title'>Participants</p>", unsafe_allow_html=True)
     participants_raw = st.text_area(
         "Académiciens / Participants (un nom par ligne ou séparé par des virgules)",
@@ -260,12 +332,12 @@ with st.form("presence_form"):
     st.markdown("<p class='section-title'>Attestation de formation</p>", unsafe_allow_html=True)
     provider_name = st.text_input(
         "Organisme de formation",
-        value="Laurent-Serre-Développement",
+        value=DEFAULT_PROVIDER,
         disabled=not ATTESTATION_AVAILABLE,
     )
     signatory_name = st.text_input(
         "Signataire",
-        value="Laurent Serre",
+        value=DEFAULT_SIGNATORY,
         disabled=not ATTESTATION_AVAILABLE,
     )
 
@@ -284,10 +356,13 @@ if submitted:
         societe, participants, duree, lieu, formation, dates_raw
     )
 
+    if not documents:
+        missing.append("Documents à générer")
+
     if missing:
         st.error("Champs manquants : " + ", ".join(missing))
     else:
-        if not ATTESTATION_AVAILABLE:
+        if not ATTESTATION_AVAILABLE and any(DOCUMENT_TYPES[key].needs_attestation_module for key in documents):
             message = (
                 "Module d'attestations introuvable. Ajoutez le dossier "
                 "`attestations_formation/` avec son sous-dossier `app/` dans le projet."
@@ -296,93 +371,54 @@ if submitted:
                 message = f"{message}\n\nDétail technique : {ATTESTATION_ERROR}"
             st.error(message)
             st.stop()
-        dates_list = _normalize_dates(_extract_dates(dates_raw))
+        dates_list = normalize_dates(_extract_dates(dates_raw))
         if not dates_list:
             st.warning(
                 "Les dates n'ont pas été reconnues. Les feuilles de présence seront générées avec 16 lignes vides."
             )
 
-        with st.spinner("Génération des documents en cours..."):
-            presence_output_dir = Path("feuilles_présence")
-            questionnaire_output_dir = Path("generateur_questionnaire/questionnaires_satisfaction")
-            attestation_output_dir = Path("attestations_formation/certificats_output")
-            presence_output_dir.mkdir(parents=True, exist_ok=True)
-            questionnaire_output_dir.mkdir(parents=True, exist_ok=True)
-            attestation_output_dir.mkdir(parents=True, exist_ok=True)
-
-            zip_entries: list[tuple[Path, str]] = []
-
-            settings = get_settings()
-            attestation_layout = settings.attestation_layout
-
-            questionnaire_start, questionnaire_end = _select_date_bounds(dates_list)
-            attestation_start = questionnaire_start or (dates_list[0] if dates_list else "")
-            attestation_end = questionnaire_end or (dates_list[-1] if dates_list else "")
-
-            with tempfile.TemporaryDirectory() as tmpdir:
-                logo_path = None
-                if logo_file:
-                    tmp_file = Path(tmpdir) / logo_file.name
-                    tmp_file.write_bytes(logo_file.getvalue())
-                    logo_path = str(tmp_file)
-
-                for participant in participants:
-                    create_presence_sheet(
-                        societe,
-                        participant,
-                        duree,
-                        lieu,
-                        formation,
-                        dates=dates_list if dates_list else None,
-                    )
-
-                    first_name, last_name = split_full_name(participant)
-                    data = QuestionnaireData(
-                        participant_last_name=last_name,
-                        participant_first_name=first_name,
-                        company=societe,
-                        training_program=formation,
-                        training_center=lieu,
-                        start_date=questionnaire_start,
-                        end_date=questionnaire_end,
-                        logo_path=logo_path,
-                    )
-                    questionnaire_path = render_questionnaire(data, questionnaire_output_dir)
-
-                    attestation_fields = map_to_attestation_fields(
-                        {
-                            "signatory_name": signatory_name,
-                            "provider_name": provider_name,
-                            "beneficiary_name": participant,
-                            "company_name": societe,
-                            "action_title": formation,
-                            "date_start": attestation_start,
-                            "date_end": attestation_end,
-                            "duration": duree,
-                            "location": lieu,
-                        }
-                    )
-                    attestation_name = f"attestation_{sanitize_filename(participant)}.pdf"
-                    attestation_path = attestation_output_dir / attestation_name
-                    generate_attestation(attestation_fields, attestation_layout, attestation_path)
-
-                    presence_file = presence_output_dir / f"Feuille_de_presence_{participant.replace(' ', '_')}.pdf"
-                    zip_entries.append(
-                        (presence_file, f"feuilles_presence/{presence_file.name}")
-                    )
-                    zip_entries.append(
-                        (questionnaire_path, f"questionnaires_satisfaction/{questionnaire_path.name}")
-                    )
-                    zip_entries.append(
-                        (attestation_path, f"attestations_formation/{attestation_path.name}")
-                    )
-
-            zip_bytes = _build_zip_buffer(zip_entries)
-
+        generation_inputs = {
+            "societe": societe,
+            "participants": tuple(participants),
+            "duree": duree,
+            "lieu": lieu,
+            "formation": formation,
+            "dates_list": tuple(dates_list),
+            "provider_name": provider_name,
+            "signatory_name": signatory_name,
+            "logo_name": logo_file.name if logo_file else None,
+            "logo_bytes": logo_file.getvalue() if logo_file else None,
+            "documents": tuple(key for key in DOCUMENT_TYPES if key in documents),
+        }
+        fingerprint = fingerprint_inputs(generation_inputs)
+        store = _artefact_store()
+        if store.get(_session_id(), fingerprint) is None:
+            archive = _pregenerated_archive(generation_inputs)
+            if archive is None:
+                progress_bar = st.progress(0.0, text="Génération des documents en cours...")
+
+                def _show_progress(event: dict) -> None:
+                    if event["event"] == "document":
+                        progress_bar.progress(
+                            event["completed"] / event["total"],
+                            text=(
+                                f"{event['completed']}/{event['total']} · {event['participant']} : "
+                                f"{event['label']} ({event['seconds']:.2f} s)"
+                            ),
+                        )
+
+                archive = _generate_documents(**generation_inputs, progress=_show_progress)
+                progress_bar.empty()
+            store.put(_session_id(), fingerprint, archive)
+        st.session_state["artefact_fingerprint"] = fingerprint
         st.success("Génération terminée !")
-        st.download_button(
-            label="Télécharger le ZIP combiné",
-            data=zip_bytes,
-            file_name="documents_formation.zip",
-            mime="application/zip",
-        )
+
+
+zip_bytes = _artefact_store().get(_session_id(), st.session_state.get("artefact_fingerprint"))
+if zip_bytes is not None:
+    st.download_button(
+        label="Télécharger le ZIP combiné",
+        data=zip_bytes,
+        file_name="documents_formation.zip",
+        mime="application/zip",
+    )
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parents[1] / "api"
+HEAVY_MODULES = ("reportlab", "pypdf", "pydantic_settings", "app", "generateur_feuilles", "questionnaire_core")
+# Cumulative import time allowed for `import generate`, in microseconds.
+IMPORT_BUDGET_US = int(os.environ.get("GENERATE_IMPORT_BUDGET_US", "150000"))
+
+
+def _importtime(code: str) -> dict[str, int]:
+    env = {key: value for key, value in os.environ.items() if key != "GENERATE_WARM_ON_IMPORT"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=API_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            timings[name.strip()] = int(cumulative)
+        except ValueError:
+            continue
+    return timings
+
+
+def test_import_does_not_load_rendering_stack():
+    timings = _importtime("import generate")
+
+    loaded = sorted(name for name in timings if name.split(".")[0] in HEAVY_MODULES)
+    assert loaded == []
+
+
+def test_import_stays_within_cold_start_budget():
+    timings = _importtime("import generate")
+
+    assert timings["generate"] <= IMPORT_BUDGET_US, (
+        f"import generate took {timings['generate']}us (budget {IMPORT_BUDGET_US}us)"
+    )
+
+
+def test_warm_loads_rendering_stack():
+    timings = _importtime("import generate; generate.warm()")
+
+    assert "reportlab" in timings
+    assert "app.generate_attestation" in timings
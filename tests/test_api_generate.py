@@ -0,0 +1,315 @@
+import base64
+import hashlib
+import http.client
+import io
+import json
+import subprocess
+import sys
+import threading
+import zipfile
+from http.server import HTTPServer, ThreadingHTTPServer
+
+import pytest
+
+import generate
+
+BOUNDARY = "----apitestboundary"
+PAYLOAD = {
+    "company": "ACME",
+    "training": "Vente",
+    "duration": "14",
+    "location": "Paris",
+    "dates": "01/12/2025\n02/12/2025",
+    "participants": "Alice Martin, Bob Durand",
+}
+
+
+ARCHIVE_PAYLOAD = {
+    **PAYLOAD,
+    "provider": "Laurent-Serre-Développement",
+    "signatory": "Laurent Serre",
+}
+# Builds the same archive in a fresh interpreter and prints its SHA-256.
+ARCHIVE_SCRIPT = f"""
+import hashlib, json, sys
+sys.path[:0] = {[str(generate.ROOT / part) for part in ("", "generateur_questionnaire", "attestations_formation", "api")]!r}
+import generate
+session, documents = generate.session_from_payload(json.loads(sys.argv[1]))
+print(hashlib.sha256(generate._build_parts(session, documents, None)[0]).hexdigest())
+"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_flight():
+    generate._flight.cache_clear()
+    yield
+    generate._flight.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def no_pregenerated(tmp_path, monkeypatch):
+    monkeypatch.setenv("PREGENERATED_DIR", str(tmp_path / "pregenerated"))
+
+
+@pytest.fixture
+def api_server():
+    server = HTTPServer(("127.0.0.1", 0), generate.handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _multipart(payload: dict, logo: bytes | None = None) -> bytes:
+    body = (
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="data"\r\n\r\n'.encode()
+        + json.dumps(payload).encode()
+        + b"\r\n"
+    )
+    if logo is not None:
+        body += (
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="logo"; filename="logo.png"\r\n'
+            "Content-Type: image/png\r\n\r\n"
+        ).encode() + logo + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+def _post(server, body: bytes, headers: dict | None = None) -> http.client.HTTPResponse:
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=60)
+    all_headers = {"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"}
+    all_headers.update(headers or {})
+    connection.request("POST", "/api/generate", body=body, headers=all_headers)
+    response = connection.getresponse()
+    response.body = response.read()
+    connection.close()
+    return response
+
+
+def test_generate_returns_zip_with_all_documents(api_server):
+    logo = (generate.ROOT / "signature.png").read_bytes()
+
+    response = _post(api_server, _multipart(PAYLOAD, logo))
+
+    assert response.status == 200
+    names = zipfile.ZipFile(io.BytesIO(response.body)).namelist()
+    assert names == [
+        "feuilles_presence/Feuille_de_presence_Alice_Martin.pdf",
+        "questionnaires_satisfaction/Questionnaire_martin_vente.pdf",
+        "attestations_formation/attestation_Alice_Martin.pdf",
+        "feuilles_presence/Feuille_de_presence_Bob_Durand.pdf",
+        "questionnaires_satisfaction/Questionnaire_durand_vente.pdf",
+        "attestations_formation/attestation_Bob_Durand.pdf",
+    ]
+
+
+def test_generate_only_requested_documents(api_server):
+    response = _post(api_server, _multipart({**PAYLOAD, "documents": ["attestation"]}))
+
+    assert response.status == 200
+    assert zipfile.ZipFile(io.BytesIO(response.body)).namelist() == [
+        "attestations_formation/attestation_Alice_Martin.pdf",
+        "attestations_formation/attestation_Bob_Durand.pdf",
+    ]
+
+
+def test_profile_dir_profiles_each_rendering(api_server, tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path / "profiles"))
+
+    response = _post(api_server, _multipart({**PAYLOAD, "documents": ["presence"]}))
+
+    assert response.status == 200
+    assert sorted(path.suffix for path in (tmp_path / "profiles").iterdir()) == [".collapsed", ".pstats"]
+    assert "build_presence_sheet" in capsys.readouterr().err
+
+
+def test_generate_rejects_unknown_documents(api_server):
+    response = _post(api_server, _multipart({**PAYLOAD, "documents": ["convocation"]}))
+
+    assert response.status == 400
+    assert b"convocation" in response.body
+
+
+@pytest.mark.parametrize("documents", [[1], ["presence", ["x"]]])
+def test_generate_rejects_non_string_documents(api_server, documents):
+    response = _post(api_server, _multipart({**PAYLOAD, "documents": documents}))
+
+    assert response.status == 400
+    assert response.body == b"Invalid documents selection."
+
+
+def _get(server, url: str) -> http.client.HTTPResponse:
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=60)
+    connection.request("GET", url)
+    response = connection.getresponse()
+    response.body = response.read()
+    connection.close()
+    return response
+
+
+@pytest.fixture
+def small_responses(tmp_path, monkeypatch):
+    # One participant's documents weigh about 600 KB: every archive goes past the limit.
+    monkeypatch.setenv("GENERATE_MAX_RESPONSE_BYTES", "700000")
+    monkeypatch.setenv("GENERATE_BLOB_DIR", str(tmp_path / "blobs"))
+
+
+def test_large_archive_is_split_into_stored_parts(api_server, small_responses):
+    response = _post(api_server, _multipart(PAYLOAD))
+
+    assert response.status == 200
+    assert response.getheader("Content-Type") == "application/json"
+    manifest = json.loads(response.body)
+    assert manifest["delivery"] == "parts"
+    assert [part["filename"] for part in manifest["parts"]] == [
+        "documents_formation_partie1.zip",
+        "documents_formation_partie2.zip",
+    ]
+    names = []
+    for part in manifest["parts"]:
+        download = _get(api_server, part["url"])
+        assert download.status == 200
+        assert download.getheader("Content-Disposition") == f'attachment; filename="{part["filename"]}"'
+        assert len(download.body) == part["size"]
+        names.append(zipfile.ZipFile(io.BytesIO(download.body)).namelist())
+    assert names == [
+        [
+            "feuilles_presence/Feuille_de_presence_Alice_Martin.pdf",
+            "questionnaires_satisfaction/Questionnaire_martin_vente.pdf",
+            "attestations_formation/attestation_Alice_Martin.pdf",
+        ],
+        [
+            "feuilles_presence/Feuille_de_presence_Bob_Durand.pdf",
+            "questionnaires_satisfaction/Questionnaire_durand_vente.pdf",
+            "attestations_formation/attestation_Bob_Durand.pdf",
+        ],
+    ]
+
+
+def test_large_archive_can_be_stored_whole(api_server, small_responses, monkeypatch):
+    monkeypatch.setenv("GENERATE_LARGE_DELIVERY", "blob")
+
+    manifest = json.loads(_post(api_server, _multipart(PAYLOAD)).body)
+
+    assert manifest["delivery"] == "blob"
+    [part] = manifest["parts"]
+    assert part["filename"] == "documents_formation.zip"
+    assert len(zipfile.ZipFile(io.BytesIO(_get(api_server, part["url"]).body)).namelist()) == 6
+
+
+def test_download_of_unknown_archive_is_not_found(api_server, small_responses):
+    response = _get(api_server, "/api/generate?download=../../etc/passwd")
+
+    assert response.status == 404
+
+
+def test_progress_stream_reports_each_document_then_the_archive(api_server, tmp_path, monkeypatch):
+    monkeypatch.setenv("GENERATE_BLOB_DIR", str(tmp_path / "blobs"))
+
+    response = _post(api_server, _multipart(PAYLOAD), {"Accept": "application/x-ndjson"})
+
+    assert response.status == 200
+    assert response.getheader("Content-Type") == "application/x-ndjson"
+    events = [json.loads(line) for line in response.body.splitlines()]
+    assert [event["event"] for event in events] == ["start"] + ["document"] * 3 + ["participant"] + [
+        "document"
+    ] * 3 + ["participant", "done"]
+    assert events[0] == {
+        "event": "start",
+        "participants": 2,
+        "documents": ["presence", "questionnaire", "attestation"],
+        "total": 6,
+    }
+    assert [event["completed"] for event in events if event["event"] == "document"] == [1, 2, 3, 4, 5, 6]
+    assert all(event["seconds"] >= 0 for event in events[1:])
+    done = events[-1]
+    assert done["source"] == "computed"
+    assert done["delivery"] == "inline"
+    archive = base64.b64decode(done["archive"])
+    assert len(archive) == done["size"]
+    assert len(zipfile.ZipFile(io.BytesIO(archive)).namelist()) == 6
+    assert not (tmp_path / "blobs").exists() or not any((tmp_path / "blobs").iterdir())
+
+
+def test_progress_stream_stores_archives_too_large_to_inline(api_server, small_responses):
+    response = _post(api_server, _multipart(PAYLOAD), {"Accept": "application/x-ndjson"})
+
+    done = json.loads(response.body.splitlines()[-1])
+    assert done["event"] == "done"
+    assert done["delivery"] == "parts"
+    names = [zipfile.ZipFile(io.BytesIO(_get(api_server, part["url"]).body)).namelist() for part in done["parts"]]
+    assert sum(map(len, names)) == 6
+
+
+def test_generate_rejects_missing_fields(api_server):
+    response = _post(api_server, _multipart({"company": "ACME"}))
+
+    assert response.status == 400
+    assert response.body == b"Missing required fields."
+
+
+def test_generate_rejects_oversized_logo(api_server, monkeypatch):
+    monkeypatch.setenv("GENERATE_MAX_FILE_BYTES", "1000")
+
+    response = _post(api_server, _multipart(PAYLOAD, b"x" * 5000))
+
+    assert response.status == 413
+
+
+def test_generate_rejects_oversized_body_from_content_length(api_server, monkeypatch):
+    monkeypatch.setenv("GENERATE_MAX_BODY_BYTES", "100")
+
+    response = _post(api_server, _multipart(PAYLOAD))
+
+    assert response.status == 413
+
+
+def test_identical_concurrent_requests_share_one_build(monkeypatch):
+    calls = []
+    release = threading.Event()
+
+    def slow_build(fingerprint, session, documents):
+        calls.append(session.company)
+        release.wait(10)
+        return "application/zip", b"PK-archive"
+
+    monkeypatch.setattr(generate, "_deliver", slow_build)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), generate.handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    responses = []
+    try:
+        clients = [
+            threading.Thread(target=lambda: responses.append(_post(server, _multipart(PAYLOAD)))) for _ in range(3)
+        ]
+        for client in clients:
+            client.start()
+        while not calls:
+            threading.Event().wait(0.01)
+        threading.Event().wait(0.2)
+        release.set()
+        for client in clients:
+            client.join(30)
+        late = _post(server, _multipart(PAYLOAD))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert calls == ["ACME"]
+    assert [response.body for response in responses] == [b"PK-archive"] * 3
+    assert sorted(response.getheader("X-Result-Source") for response in responses) == ["computed", "shared", "shared"]
+    assert late.getheader("X-Result-Source") == "cache"
+
+
+def test_archive_is_byte_identical_across_runs_and_processes():
+    session, documents = generate.session_from_payload(ARCHIVE_PAYLOAD)
+    first = generate._build_parts(session, documents, None)[0]
+
+    assert generate._build_parts(session, documents, None)[0] == first
+    child = subprocess.run(
+        [sys.executable, "-c", ARCHIVE_SCRIPT, json.dumps(ARCHIVE_PAYLOAD)],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=120,
+    )
+    assert child.stdout.strip() == hashlib.sha256(first).hexdigest()
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+
+from artefact_store import ArtefactStore, PregeneratedArchives, fingerprint_inputs
+
+
+def test_fingerprint_is_stable_and_hashes_bytes():
+    first = fingerprint_inputs({"company": "ACME", "participants": ("Alice", "Bob"), "logo": b"png"})
+    second = fingerprint_inputs({"logo": b"png", "participants": ["Alice", "Bob"], "company": "ACME"})
+    other = fingerprint_inputs({"company": "ACME", "participants": ("Alice", "Bob"), "logo": b"jpg"})
+
+    assert first == second
+    assert first != other
+
+
+def test_get_returns_stored_archive_for_same_session_only():
+    store = ArtefactStore()
+    store.put("session-a", "fp", b"zip")
+
+    assert store.get("session-a", "fp") == b"zip"
+    assert store.get("session-b", "fp") is None
+    assert store.get("session-a", "other") is None
+    assert store.get("session-a", None) is None
+
+
+def test_least_recently_used_session_is_evicted():
+    store = ArtefactStore(max_sessions=2)
+    store.put("a", "fp", b"1")
+    store.put("b", "fp", b"2")
+    store.get("a", "fp")
+    store.put("c", "fp", b"3")
+
+    assert store.get("a", "fp") == b"1"
+    assert store.get("b", "fp") is None
+    assert store.get("c", "fp") == b"3"
+
+
+def test_entries_per_session_are_bounded():
+    store = ArtefactStore(max_entries_per_session=2)
+    for index in range(3):
+        store.put("a", f"fp{index}", b"x")
+
+    assert store.get("a", "fp0") is None
+    assert len(store) == 2
+
+
+def test_memory_budget_spills_oldest_artefacts_to_disk(tmp_path):
+    store = ArtefactStore(max_memory_bytes=10, spill_dir=tmp_path)
+    store.put("a", "old", b"0123456789")
+    store.put("a", "new", b"abcdefghij")
+
+    assert store.memory_bytes == 10
+    assert (tmp_path / "a" / "old.zip").exists()
+    assert store.get("a", "old") == b"0123456789"
+
+    store.drop_session("a")
+    assert not (tmp_path / "a").exists()
+    assert store.memory_bytes == 0
+
+
+def test_memory_budget_without_spill_dir_drops_artefacts():
+    store = ArtefactStore(max_memory_bytes=10)
+    store.put("a", "old", b"0123456789")
+    store.put("b", "new", b"abcdefghij")
+
+    assert store.get("a", "old") is None
+    assert store.get("b", "new") == b"abcdefghij"
+
+
+def test_memory_budget_without_spill_dir_keeps_the_archive_just_stored():
+    store = ArtefactStore(max_memory_bytes=10)
+    store.put("a", "old", b"0123")
+    store.put("b", "large", b"0123456789abcdef")
+
+    assert store.get("b", "large") == b"0123456789abcdef"
+    assert store.get("a", "old") is None
+    assert store.memory_bytes == 16
+
+
+def test_pregenerated_archives_are_stored_by_fingerprint(tmp_path):
+    archives = PregeneratedArchives(tmp_path)
+    fingerprint = "a" * 64
+
+    archives.put(fingerprint, b"zip")
+
+    assert fingerprint in archives
+    assert archives.get(fingerprint) == b"zip"
+    assert archives.get("b" * 64) is None
+    assert archives.get("../secret") is None
+    old = tmp_path / f"{fingerprint}.zip"
+    os.utime(old, (time.time() - 120, time.time() - 120))
+    assert archives.prune(60) == 1
+    assert fingerprint not in archives
+
+
+def test_concurrent_puts_of_a_pregenerated_archive_leave_one_complete_file(tmp_path):
+    archives = PregeneratedArchives(tmp_path)
+    fingerprint = "c" * 64
+    data = os.urandom(2_000_000)
+    threads = [threading.Thread(target=archives.put, args=(fingerprint, data)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert archives.get(fingerprint) == data
+    assert list(tmp_path.iterdir()) == [tmp_path / f"{fingerprint}.zip"]
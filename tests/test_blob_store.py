@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+
+import blob_store
+from blob_store import LocalBlobStore, load_blob_store
+
+
+def test_local_store_is_content_addressed(tmp_path):
+    store = LocalBlobStore(tmp_path)
+
+    key = store.put(b"PK-archive")
+
+    assert store.put(b"PK-archive") == key
+    assert store.get(key) == b"PK-archive"
+    assert list(tmp_path.iterdir()) == [tmp_path / key]
+    assert store.url(key, "documents formation.zip") == f"/api/generate?download={key}&filename=documents%20formation.zip"
+
+
+def test_local_store_rejects_keys_outside_its_directory(tmp_path):
+    (tmp_path / "secret.txt").write_bytes(b"secret")
+    store = LocalBlobStore(tmp_path / "blobs")
+
+    assert store.get("../secret.txt") is None
+    assert store.get("0" * 64 + ".zip") is None
+
+
+def test_local_store_prunes_expired_archives(tmp_path):
+    store = LocalBlobStore(tmp_path, max_age=60)
+    old_key = store.put(b"old")
+    past = time.time() - 120
+    os.utime(tmp_path / old_key, (past, past))
+
+    new_key = store.put(b"new")
+
+    assert store.get(old_key) is None
+    assert store.get(new_key) == b"new"
+
+
+def test_local_store_refreshes_archives_stored_again(tmp_path):
+    store = LocalBlobStore(tmp_path, max_age=60)
+    key = store.put(b"archive")
+    past = time.time() - 50
+    os.utime(tmp_path / key, (past, past))
+
+    assert store.put(b"archive") == key
+    assert (tmp_path / key).stat().st_mtime > past + 40
+
+
+def test_concurrent_puts_of_the_same_archive_write_one_complete_file(tmp_path):
+    store = LocalBlobStore(tmp_path)
+    data = os.urandom(2_000_000)
+    keys = []
+    threads = [threading.Thread(target=lambda: keys.append(store.put(data))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(keys) == 8 and len(set(keys)) == 1
+    assert store.get(keys[0]) == data
+    assert list(tmp_path.iterdir()) == [tmp_path / keys[0]]
+
+
+class MemoryBlobStore:
+    def __init__(self):
+        self.blobs = {}
+
+    def put(self, data):
+        self.blobs["key"] = data
+        return "key"
+
+    def get(self, key):
+        return self.blobs.get(key)
+
+    def url(self, key, filename):
+        return f"https://blobs.example/{key}/{filename}"
+
+
+def test_blob_store_is_pluggable(monkeypatch, tmp_path):
+    monkeypatch.setenv("GENERATE_BLOB_STORE", f"{__name__}:MemoryBlobStore")
+    assert isinstance(load_blob_store(), MemoryBlobStore)
+
+    monkeypatch.delenv("GENERATE_BLOB_STORE")
+    monkeypatch.setenv("GENERATE_BLOB_DIR", str(tmp_path))
+    store = load_blob_store()
+    assert isinstance(store, blob_store.LocalBlobStore)
+    assert store.root == tmp_path
@@ -0,0 +1,187 @@
+import io
+import random
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import documents_formation
+from documents_formation import (DEFAULT_PROVIDER, DOCUMENT_TYPES, DocumentType, TrainingSession, build_archive,
+                                 build_archive_parts, main, parse_documents, register_document_type, session_fingerprint,
+                                 session_from_payload)
+
+SESSION = TrainingSession(
+    company="ACME",
+    training="Vente",
+    duration="14",
+    location="Paris",
+    dates=("01/12/2025", "02/12/2025"),
+    participants=("Alice Martin", "Bob Durand"),
+)
+
+
+def _names(zip_bytes):
+    return zipfile.ZipFile(io.BytesIO(zip_bytes)).namelist()
+
+
+def test_parse_documents_follows_registry_order():
+    assert parse_documents(None) == ("presence", "questionnaire", "attestation")
+    assert parse_documents("") == ("presence", "questionnaire", "attestation")
+    assert parse_documents("attestation, presence,presence") == ("presence", "attestation")
+    assert parse_documents(["questionnaire"]) == ("questionnaire",)
+
+
+def test_parse_documents_rejects_unknown_types():
+    with pytest.raises(ValueError, match="convocation"):
+        parse_documents(["presence", "convocation"])
+
+
+@pytest.mark.parametrize("documents", [[1], ["presence", ["x"]], [None]])
+def test_parse_documents_rejects_non_string_items(documents):
+    with pytest.raises(ValueError, match="Invalid documents selection"):
+        parse_documents(documents)
+
+
+def test_build_archive_only_renders_requested_documents(monkeypatch):
+    def fail(session, participant):
+        raise AssertionError("questionnaire should not be rendered")
+
+    questionnaire = DOCUMENT_TYPES["questionnaire"]
+    monkeypatch.setitem(
+        DOCUMENT_TYPES, "questionnaire", DocumentType(questionnaire.key, questionnaire.label, questionnaire.folder, fail)
+    )
+
+    names = _names(build_archive(SESSION, ["attestation", "presence"]))
+
+    assert names == [
+        "feuilles_presence/Feuille_de_presence_Alice_Martin.pdf",
+        "attestations_formation/attestation_Alice_Martin.pdf",
+        "feuilles_presence/Feuille_de_presence_Bob_Durand.pdf",
+        "attestations_formation/attestation_Bob_Durand.pdf",
+    ]
+
+
+def test_archive_without_attestations_does_not_need_the_attestation_module():
+    root = Path(documents_formation.__file__).resolve().parent
+    script = f"""
+import sys
+sys.path[:0] = {[str(root), str(root / "generateur_questionnaire")]!r}
+from documents_formation import TrainingSession, build_archive
+session = TrainingSession("ACME", "Vente", "14", "Paris", ("01/12/2025",), ("Alice Martin",))
+build_archive(session, ["presence", "questionnaire"])
+print("app" in sys.modules)
+"""
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, cwd="/")
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
+
+
+def test_registered_document_types_reuse_the_participant_loop(monkeypatch):
+    monkeypatch.setattr(documents_formation, "DOCUMENT_TYPES", dict(DOCUMENT_TYPES))
+    register_document_type(
+        DocumentType("badge", "Badges", "badges", lambda session, participant: (f"{participant}.pdf", b"%PDF-badge"))
+    )
+
+    assert _names(build_archive(SESSION, "badge")) == ["badges/Alice Martin.pdf", "badges/Bob Durand.pdf"]
+    with pytest.raises(ValueError, match="already registered"):
+        register_document_type(DocumentType("badge", "Badges", "badges", lambda session, participant: None))
+
+
+def test_cli_writes_selected_documents(tmp_path, capsys):
+    output = tmp_path / "session.zip"
+
+    main([
+        "--societe", "ACME", "--formation", "Vente", "--duree", "14", "--lieu", "Paris",
+        "--dates", "01/12/2025,02/12/2025", "--participants", "Alice Martin,Bob Durand",
+        "--documents", "presence", "--output", str(output),
+    ])
+
+    assert _names(output.read_bytes()) == [
+        "feuilles_presence/Feuille_de_presence_Alice_Martin.pdf",
+        "feuilles_presence/Feuille_de_presence_Bob_Durand.pdf",
+    ]
+    assert "2 participant(s)" in capsys.readouterr().out
+
+
+def test_build_archive_parts_keeps_participants_together(monkeypatch):
+    # Incompressible contents, like the already compressed PDFs.
+    monkeypatch.setattr(documents_formation, "DOCUMENT_TYPES", {})
+    register_document_type(
+        DocumentType("badge", "Badges", "badges", lambda session, participant: (f"{participant}.pdf", random.Random(participant).randbytes(1000)))
+    )
+    register_document_type(
+        DocumentType("memo", "Mémos", "memos", lambda session, participant: (f"{participant}.pdf", random.Random(participant * 2).randbytes(1000)))
+    )
+    session = TrainingSession("ACME", "Vente", "14", "Paris", (), ("Alice", "Bob", "Chloé"))
+
+    parts = build_archive_parts(session, max_part_bytes=4500)
+
+    assert [_names(part) for part in parts] == [
+        ["badges/Alice.pdf", "memos/Alice.pdf", "badges/Bob.pdf", "memos/Bob.pdf"],
+        ["badges/Chloé.pdf", "memos/Chloé.pdf"],
+    ]
+    assert all(len(part) <= 4500 for part in parts)
+    assert build_archive_parts(session) == [build_archive(session)]
+
+
+def test_build_archive_reports_progress(monkeypatch):
+    monkeypatch.setattr(documents_formation, "DOCUMENT_TYPES", {})
+    register_document_type(
+        DocumentType("badge", "Badges", "badges", lambda session, participant: (f"{participant}.pdf", b"%PDF"))
+    )
+    session = TrainingSession("ACME", "Vente", "14", "Paris", (), ("Alice", "Bob"))
+    events = []
+
+    build_archive(session, progress=events.append)
+
+    assert [(event["event"], event.get("participant"), event.get("completed")) for event in events] == [
+        ("start", None, None),
+        ("document", "Alice", 1),
+        ("participant", "Alice", 1),
+        ("document", "Bob", 2),
+        ("participant", "Bob", 2),
+    ]
+    assert events[0] == {"event": "start", "participants": 2, "documents": ["badge"], "total": 2}
+
+
+def test_default_provider_gives_the_same_fingerprint_everywhere():
+    payload = {
+        "company": SESSION.company,
+        "training": SESSION.training,
+        "duration": SESSION.duration,
+        "location": SESSION.location,
+        "dates": list(SESSION.dates),
+        "participants": list(SESSION.participants),
+    }
+    from_api, _ = session_from_payload(payload)
+    # Streamlit pre-fills the form with DEFAULT_PROVIDER.
+    from_form, _ = session_from_payload({**payload, "provider": DEFAULT_PROVIDER})
+
+    assert from_api.provider == SESSION.provider == DEFAULT_PROVIDER
+    assert session_fingerprint(from_api, ["presence"], None) == session_fingerprint(from_form, ["presence"], None)
+
+
+def test_fingerprint_covers_the_attestation_renderer_only_when_attestations_are_requested():
+    from dataclasses import replace
+
+    from app.config import get_settings
+
+    settings = get_settings()
+    session = replace(
+        SESSION,
+        attestation_layout=settings.compiled_attestation_layout,
+        attestation_backend="overlay",
+        attestation_flatten=True,
+    )
+    other_backend = replace(session, attestation_backend="xobject")
+    not_flattened = replace(session, attestation_flatten=False)
+
+    with_attestations = {session_fingerprint(item, None, None) for item in (session, other_backend, not_flattened)}
+    presence_only = {session_fingerprint(item, ["presence"], None) for item in (session, other_backend, not_flattened)}
+
+    assert len(with_attestations) == 3
+    assert len(presence_only) == 1
+    assert session_fingerprint(session, None, None) == session_fingerprint(SESSION, None, None)
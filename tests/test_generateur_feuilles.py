@@ -0,0 +1,68 @@
+import io
+
+from pypdf import PdfReader
+
+from generateur_feuilles import build_presence_sheet, create_presence_sheet, presence_sheet_bytes, presence_sheet_filename
+
+
+def test_presence_sheet_bytes_does_not_touch_disk(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    pdf_bytes = presence_sheet_bytes("ACME", "Alice Martin", "14", "Paris", "Vente", ["01/12/2025"])
+
+    assert pdf_bytes.startswith(b"%PDF")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_create_presence_sheet_writes_named_file(tmp_path):
+    path = create_presence_sheet("ACME", "Alice Martin", "14", "Paris", "Vente", output_dir=tmp_path)
+
+    assert path == tmp_path / presence_sheet_filename("Alice Martin")
+    assert path.name == "Feuille_de_presence_Alice_Martin.pdf"
+    assert path.read_bytes().startswith(b"%PDF")
+
+
+def _page_texts(pdf_bytes):
+    return [page.extract_text() for page in PdfReader(io.BytesIO(pdf_bytes)).pages]
+
+
+def _dates(count):
+    return [f"{day:02d}/{month:02d}/2025" for month in (1, 2, 3, 4, 5) for day in range(1, 29)][:count]
+
+
+def test_short_session_fits_on_one_page():
+    pages = _page_texts(presence_sheet_bytes("ACME", "Alice Martin", "14", "Paris", "Vente", _dates(2)))
+
+    assert len(pages) == 1
+
+
+def test_long_session_repeats_header_on_every_page():
+    dates = _dates(30)
+    pages = _page_texts(presence_sheet_bytes("ACME", "Alice Martin", "240", "Paris", "Vente", dates))
+
+    assert len(pages) > 2
+    assert all("Signature Stagiaire" in text for text in pages)
+    # Every half-day row appears exactly once across the pages.
+    assert sum(text.count("9h-13h00") + text.count("14h-18h00") for text in pages) == 2 * len(dates)
+    assert all(date in "".join(pages) for date in dates)
+
+
+def test_long_session_honours_rows_per_page():
+    buffer = io.BytesIO()
+    build_presence_sheet(
+        buffer, "ACME", "Alice Martin", "40", "Paris", "Vente", _dates(10), long_session=True, rows_per_page=4
+    )
+    pages = _page_texts(buffer.getvalue())
+
+    rows_per_page = [text.count("9h-13h00") + text.count("14h-18h00") for text in pages]
+    assert sum(rows_per_page) == 20
+    assert max(rows_per_page[1:]) == 4
+
+
+def test_reproducible_presence_sheet_is_byte_identical():
+    args = ("ACME", "Alice Martin", "14", "Paris", "Vente", ["01/12/2025", "02/12/2025"])
+
+    first = presence_sheet_bytes(*args, reproducible=True)
+
+    assert presence_sheet_bytes(*args, reproducible=True) == first
+    assert b"D:20000101000000" in first
@@ -0,0 +1,96 @@
+import hashlib
+import io
+
+import pytest
+
+from multipart_form import MultipartError, PayloadTooLarge, UploadLimits, parse_multipart
+
+BOUNDARY = "----testboundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+class TrickleStream(io.BytesIO):
+    """Returns at most `step` bytes per read, to exercise chunk boundaries."""
+
+    def __init__(self, data: bytes, step: int):
+        super().__init__(data)
+        self.step = step
+
+    def read(self, size=-1):
+        return super().read(min(self.step, size if size >= 0 else self.step))
+
+
+def _body(*parts: tuple[str, bytes, str | None]) -> bytes:
+    chunks = []
+    for name, value, filename in parts:
+        disposition = f'form-data; name="{name}"'
+        headers = f"Content-Disposition: {disposition}"
+        if filename is not None:
+            headers += f'; filename="{filename}"\r\nContent-Type: image/png'
+        chunks.append(f"--{BOUNDARY}\r\n{headers}\r\n\r\n".encode() + value + b"\r\n")
+    chunks.append(f"--{BOUNDARY}--\r\n".encode())
+    return b"".join(chunks)
+
+
+@pytest.mark.parametrize("step", [1, 7, 64 * 1024])
+def test_parses_fields_and_streams_files_to_disk(tmp_path, step):
+    logo = bytes(range(256)) * 40 + b"\r\n--not-the-boundary\r\n"
+    body = _body(("data", '{"company": "Société"}'.encode(), None), ("logo", logo, "../../evil.PNG"))
+
+    fields, files = parse_multipart(TrickleStream(body, step), CONTENT_TYPE, len(body), tmp_path)
+
+    assert fields == {"data": '{"company": "Société"}'}
+    upload = files["logo"]
+    assert upload.filename == "../../evil.PNG"
+    assert upload.path.parent == tmp_path
+    assert upload.path.suffix == ".png"
+    assert upload.path.read_bytes() == logo
+    assert upload.size == len(logo)
+    assert upload.sha256 == hashlib.sha256(logo).hexdigest()
+
+
+def test_empty_file_input_is_ignored(tmp_path):
+    body = _body(("data", b"{}", None), ("logo", b"", ""))
+
+    fields, files = parse_multipart(io.BytesIO(body), CONTENT_TYPE, len(body), tmp_path)
+
+    assert fields == {"data": "{}"}
+    assert files == {}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rejects_body_larger_than_total_limit_before_reading(tmp_path):
+    stream = io.BytesIO(b"x" * 100)
+    with pytest.raises(PayloadTooLarge):
+        parse_multipart(stream, CONTENT_TYPE, 100, tmp_path, UploadLimits(max_total_bytes=50))
+    assert stream.tell() == 0
+
+
+def test_rejects_oversized_field(tmp_path):
+    body = _body(("data", b"x" * 100, None))
+    with pytest.raises(PayloadTooLarge, match="data"):
+        parse_multipart(io.BytesIO(body), CONTENT_TYPE, len(body), tmp_path, UploadLimits(max_field_bytes=10))
+
+
+def test_rejects_oversized_file_and_removes_partial_upload(tmp_path):
+    body = _body(("logo", b"x" * 200_000, "logo.png"))
+    with pytest.raises(PayloadTooLarge, match="logo"):
+        parse_multipart(io.BytesIO(body), CONTENT_TYPE, len(body), tmp_path, UploadLimits(max_file_bytes=1000))
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "content_type",
+    ["application/json", "multipart/form-data", f'multipart/form-data; boundary="{"b" * 71}"'],
+)
+def test_rejects_invalid_content_type(tmp_path, content_type):
+    with pytest.raises(MultipartError):
+        parse_multipart(io.BytesIO(b""), content_type, 0, tmp_path)
+
+
+def test_rejects_truncated_body(tmp_path):
+    body = _body(("data", b"{}", None))
+    with pytest.raises(MultipartError):
+        parse_multipart(io.BytesIO(body[:-10]), CONTENT_TYPE, len(body), tmp_path)
+    with pytest.raises(MultipartError, match="incomplete"):
+        parse_multipart(io.BytesIO(body[:-10]), CONTENT_TYPE, len(body) - 10, tmp_path)
@@ -0,0 +1,117 @@
+import io
+import json
+import zipfile
+from datetime import date, datetime
+
+import pytest
+
+import generate
+import pregeneration
+from artefact_store import PregeneratedArchives
+from pregeneration import in_window, load_sessions, parse_window, pregenerate, select_upcoming
+from test_api_generate import _multipart, _post, api_server, fresh_flight  # noqa: F401
+
+SESSIONS = [
+    {
+        "company": "ACME",
+        "training": "Vente",
+        "duration": "14",
+        "location": "Paris",
+        "dates": ["03/12/2025", "04/12/2025"],
+        "participants": "Alice Martin, Bob Durand",
+        "documents": ["presence"],
+    },
+    {
+        "company": "Globex",
+        "training": "Management",
+        "duration": "7",
+        "location": "Lyon",
+        "dates": "20/12/2025",
+        "participants": "Chloé Petit",
+    },
+]
+
+
+def test_load_sessions_from_json_and_csv(tmp_path):
+    json_path = tmp_path / "sessions.json"
+    json_path.write_text(json.dumps(SESSIONS), encoding="utf-8")
+    csv_path = tmp_path / "sessions.csv"
+    csv_path.write_text(
+        "societe;formation;duree;lieu;dates;participants;documents\n"
+        'ACME;Vente;14;Paris;03/12/2025,04/12/2025;"Alice Martin\nBob Durand";presence\n',
+        encoding="utf-8-sig",
+    )
+
+    from_json = load_sessions(json_path)
+    from_csv = load_sessions(csv_path)
+
+    assert [item.start for item in from_json] == [date(2025, 12, 3), date(2025, 12, 20)]
+    assert from_json[0].documents == ("presence",)
+    assert from_json[1].documents == ("presence", "questionnaire", "attestation")
+    assert from_csv[0].session == from_json[0].session
+    assert from_csv[0].fingerprint == from_json[0].fingerprint
+
+
+def test_load_sessions_reports_the_invalid_session(tmp_path):
+    path = tmp_path / "sessions.json"
+    path.write_text(json.dumps([SESSIONS[0], {**SESSIONS[1], "location": ""}]), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="session 2"):
+        load_sessions(path)
+
+
+def test_only_sessions_starting_within_the_horizon_are_selected(tmp_path):
+    path = tmp_path / "sessions.json"
+    path.write_text(json.dumps(SESSIONS), encoding="utf-8")
+    planned = load_sessions(path)
+
+    assert [item.session.company for item in select_upcoming(planned, date(2025, 12, 1), 7)] == ["ACME"]
+    assert select_upcoming(planned, date(2025, 12, 4), 30)[0].session.company == "Globex"
+
+
+def test_off_peak_window_can_span_midnight():
+    night = parse_window("20:00-07:00")
+    day = parse_window("12:00-14:00")
+
+    assert in_window(datetime(2025, 12, 1, 23, 30), night)
+    assert in_window(datetime(2025, 12, 1, 6, 59), night)
+    assert not in_window(datetime(2025, 12, 1, 7, 0), night)
+    assert in_window(datetime(2025, 12, 1, 13, 0), day)
+    assert not in_window(datetime(2025, 12, 1, 20, 0), day)
+    assert in_window(datetime(2025, 12, 1, 13, 0), None)
+    with pytest.raises(ValueError):
+        parse_window("20h-7h")
+
+
+def test_api_serves_pregenerated_archive_without_rendering(tmp_path, monkeypatch, api_server):
+    monkeypatch.setenv("PREGENERATED_DIR", str(tmp_path / "pregenerated"))
+    path = tmp_path / "sessions.json"
+    path.write_text(json.dumps(SESSIONS[:1]), encoding="utf-8")
+    archives = PregeneratedArchives()
+
+    written = pregenerate(load_sessions(path), archives, log=lambda message: None)
+    assert pregenerate(load_sessions(path), archives, log=lambda message: None) == []
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the archive should not be rendered again")
+
+    monkeypatch.setattr(generate, "_build_parts", fail)
+    response = _post(api_server, _multipart({**SESSIONS[0], "dates": "03/12/2025\n04/12/2025"}))
+
+    assert response.status == 200
+    assert response.body == written[0].read_bytes()
+    assert zipfile.ZipFile(io.BytesIO(response.body)).namelist() == [
+        "feuilles_presence/Feuille_de_presence_Alice_Martin.pdf",
+        "feuilles_presence/Feuille_de_presence_Bob_Durand.pdf",
+    ]
+
+
+def test_main_skips_generation_outside_the_window(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "sessions.json"
+    path.write_text(json.dumps(SESSIONS), encoding="utf-8")
+    monkeypatch.setattr(pregeneration, "in_window", lambda moment, window: False)
+
+    pregeneration.main([str(path), "--creneau", "20:00-07:00", "--dossier", str(tmp_path / "out")])
+
+    assert "hors du créneau" in capsys.readouterr().out
+    assert not (tmp_path / "out").exists()
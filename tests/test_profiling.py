@@ -0,0 +1,97 @@
+import pstats
+import threading
+import time
+
+import pytest
+
+from profiling import Profile, profiled, profiled_from_env
+
+
+def _busy(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+def test_profile_writes_pstats_and_collapsed_stacks(tmp_path):
+    with Profile(interval=0.001) as profile:
+        _busy(0.1)
+
+    stats_path, collapsed_path = profile.write(tmp_path, "run")
+
+    assert "_busy" in profile.top(5)
+    assert any(function == "_busy" for _, _, function in pstats.Stats(str(stats_path)).stats)
+    lines = collapsed_path.read_text(encoding="utf-8").splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) >= 1
+    assert any("test_profile_writes_pstats_and_collapsed_stacks (tests/test_profiling.py" in line and ";_busy (" in line for line in lines)
+
+
+def test_profiled_logs_the_top_functions(tmp_path):
+    messages = []
+
+    with profiled("cli", tmp_path, limit=5, log=messages.append) as profile:
+        _busy(0.02)
+
+    assert profile is not None
+    assert len(messages) == 1 and "_busy" in messages[0]
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == [".collapsed", ".pstats"]
+
+
+def test_profiled_still_writes_the_profile_of_a_failing_run(tmp_path):
+    with pytest.raises(RuntimeError):
+        with profiled("cli", tmp_path, log=lambda text: None):
+            raise RuntimeError("boom")
+
+    assert len(list(tmp_path.glob("cli-*.pstats"))) == 1
+
+
+def test_profiled_without_directory_does_nothing(tmp_path):
+    with profiled("cli", None) as profile:
+        pass
+
+    assert profile is None
+
+
+def test_concurrent_block_runs_unprofiled(tmp_path):
+    messages = []
+    entered, release = threading.Event(), threading.Event()
+
+    def first():
+        with profiled("first", tmp_path, log=messages.append):
+            entered.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    entered.wait(5)
+    with profiled("second", tmp_path, log=messages.append) as profile:
+        pass
+    release.set()
+    thread.join()
+
+    assert profile is None
+    assert "second not profiled" in messages[0]
+    assert [path.name.split("-")[0] for path in tmp_path.glob("*.pstats")] == ["first"]
+    with profiled("third", tmp_path, log=messages.append) as profile:
+        pass
+    assert profile is not None
+
+
+def test_profiled_from_env_uses_profile_dir(tmp_path, monkeypatch, capsys):
+    monkeypatch.delenv("PROFILE_DIR", raising=False)
+    with profiled_from_env("web") as profile:
+        pass
+    assert profile is None
+
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    with profiled_from_env("web") as profile:
+        _busy(0.01)
+
+    assert profile is not None
+    assert "Profile of web" in capsys.readouterr().err
+    assert len(list(tmp_path.glob("web-*.collapsed"))) == 1
@@ -0,0 +1,164 @@
+import http.client
+import socket
+import threading
+import time
+
+import pytest
+
+from serveur_local import LocalServer
+
+
+@pytest.fixture
+def local_server():
+    servers = []
+
+    def start(**options):
+        server = LocalServer(("127.0.0.1", 0), **options)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.drain(5)
+        server.server_close()
+
+
+def test_page_and_api_share_one_keep_alive_connection(local_server):
+    server = local_server(workers=2)
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+
+    connection.request("GET", "/")
+    page = connection.getresponse()
+    body = page.read()
+    first_socket = connection.sock
+    connection.request("GET", "/api/generate")
+    health = connection.getresponse()
+
+    assert page.status == 200 and b"<html" in body.lower()
+    assert page.getheader("Content-Type") == "text/html; charset=utf-8"
+    assert (health.status, health.read()) == (200, b"OK")
+    assert connection.sock is first_socket
+    connection.close()
+
+
+def test_idle_keep_alive_connections_do_not_hold_a_worker(local_server):
+    server = local_server(workers=1, idle_timeout=3)
+    idle = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+    idle.request("GET", "/api/generate")
+    assert idle.getresponse().read() == b"OK"
+    idle_socket = idle.sock
+
+    other = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+    began = time.monotonic()
+    other.request("GET", "/api/generate", headers={"Connection": "close"})
+    assert other.getresponse().read() == b"OK"
+    assert time.monotonic() - began < 1
+
+    idle.request("GET", "/api/generate")
+    assert idle.getresponse().read() == b"OK"
+    assert idle.sock is idle_socket
+    other.close()
+    idle.close()
+
+
+def test_idle_connections_are_closed_after_the_timeout(local_server):
+    server = local_server(idle_timeout=0.3)
+    sock = socket.create_connection(("127.0.0.1", server.server_port), timeout=5)
+    sock.sendall(b"GET /api/generate HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    response = b""
+    while not response.endswith(b"OK"):
+        response += sock.recv(4096)
+
+    assert sock.recv(4096) == b""
+    sock.close()
+
+
+@pytest.mark.parametrize("path", ["/missing.js", "/../README.md", "/%2e%2e/README.md", "/api/other"])
+def test_unknown_paths_are_not_found(local_server, path):
+    server = local_server()
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+
+    connection.request("GET", path)
+
+    assert connection.getresponse().status == 404
+    connection.close()
+
+
+def test_connections_beyond_the_queue_are_rejected(local_server):
+    server = local_server(workers=1, queue_size=1, idle_timeout=2)
+    # The first connection holds the only worker, the second fills the queue.
+    held = []
+    for _ in range(2):
+        held.append(socket.create_connection(("127.0.0.1", server.server_port)))
+        time.sleep(0.2)
+
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+    connection.request("GET", "/api/generate")
+    response = connection.getresponse()
+
+    assert response.status == 503
+    assert response.getheader("Retry-After") == "1"
+    for sock in held:
+        sock.close()
+    connection.close()
+
+
+def test_shutdown_lets_the_running_request_finish(local_server, monkeypatch):
+    server = local_server(workers=1)
+    started = threading.Event()
+    original = server.RequestHandlerClass._send_static
+
+    def slow_static(handler, path):
+        started.set()
+        time.sleep(0.5)
+        original(handler, path)
+
+    monkeypatch.setattr(server.RequestHandlerClass, "_send_static", slow_static)
+    results = []
+
+    def fetch():
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+        connection.request("GET", "/", headers={"Connection": "close"})
+        results.append(connection.getresponse().status)
+
+    client = threading.Thread(target=fetch)
+    client.start()
+    assert started.wait(5)
+    server.shutdown()
+
+    assert server.drain(5)
+    client.join(5)
+    assert results == [200]
+
+
+def test_drain_gives_up_at_the_deadline_when_the_queue_is_full(local_server, monkeypatch):
+    server = local_server(workers=1, queue_size=1)
+    started = threading.Event()
+    release = threading.Event()
+    original = server.RequestHandlerClass._send_static
+
+    def stuck_static(handler, path):
+        started.set()
+        release.wait(10)
+        original(handler, path)
+
+    monkeypatch.setattr(server.RequestHandlerClass, "_send_static", stuck_static)
+    connections = []
+    for _ in range(2):
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+        connection.request("GET", "/", headers={"Connection": "close"})
+        connections.append(connection)
+        assert started.wait(5)
+        time.sleep(0.2)
+    server.shutdown()
+
+    began = time.monotonic()
+    assert server.drain(0.3) is False
+    assert time.monotonic() - began < 2
+    release.set()
+    for connection in connections:
+        connection.getresponse().read()
+        connection.close()
@@ -0,0 +1,76 @@
+import hashlib
+from dataclasses import replace
+
+import pytest
+
+import shared_assets
+from documents_formation import TrainingSession, build_archive
+from shared_assets import SharedAssets, attach, detach, open_asset, shared_layout
+
+SESSION = TrainingSession(
+    company="ACME",
+    training="Vente",
+    duration="14",
+    location="Paris",
+    dates=("01/12/2025", "02/12/2025"),
+    participants=("Alice Martin", "Bob Durand", "Chloé Petit"),
+)
+
+
+@pytest.fixture(autouse=True)
+def detached():
+    yield
+    detach()
+
+
+def test_attached_assets_are_read_from_the_shared_file(tmp_path):
+    logo = tmp_path / "logo.png"
+    logo.write_bytes(b"PNG-logo")
+
+    with SharedAssets({"logo": logo, "signature": b"PNG-signature"}, directory=tmp_path) as assets:
+        attach(assets.handle)
+        stream = open_asset("signature")
+
+        assert stream.read() == b"PNG-signature"
+        assert stream.seek(4) == 4 and stream.read(3) == b"sig"
+        assert open_asset("logo").read() == b"PNG-logo"
+        assert open_asset("template") is None
+        assert shared_layout() is None
+    assert not list(tmp_path.glob("*.assets"))
+
+
+def test_open_asset_outside_a_worker_returns_none():
+    assert shared_assets.open_asset("signature") is None
+
+
+def test_shared_layout_reads_its_template_from_shared_memory(tmp_path):
+    from app.config import get_settings
+
+    layout = get_settings().compiled_attestation_layout
+
+    with SharedAssets({}, layout=layout, directory=tmp_path) as assets:
+        attach(assets.handle)
+
+        assert shared_layout().template_source().read() == open(layout.template_pdf, "rb").read()
+
+
+@pytest.mark.parametrize("documents", [["presence", "attestation"], ["questionnaire"]])
+def test_worker_pool_builds_the_same_archive(documents):
+    sequential = build_archive(SESSION, documents)
+    parallel = build_archive(SESSION, documents, workers=2)
+
+    assert hashlib.sha256(parallel).hexdigest() == hashlib.sha256(sequential).hexdigest()
+
+
+def test_worker_pool_reports_every_document():
+    events = []
+
+    build_archive(replace(SESSION, participants=SESSION.participants[:2]), ["presence"], events.append, workers=2)
+
+    assert [(event["event"], event.get("participant")) for event in events] == [
+        ("start", None),
+        ("document", "Alice Martin"),
+        ("participant", "Alice Martin"),
+        ("document", "Bob Durand"),
+        ("participant", "Bob Durand"),
+    ]
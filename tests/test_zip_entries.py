@@ -0,0 +1,25 @@
+import io
+import zipfile
+
+from zip_entries import ZIP_DATE_TIME, write_zip_entry
+
+
+def _archive(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries:
+            write_zip_entry(archive, name, data)
+    return buffer.getvalue()
+
+
+def test_write_zip_entry_is_reproducible():
+    entries = [("b.pdf", b"%PDF-b"), ("a.pdf", b"%PDF-a")]
+
+    first = _archive(entries)
+
+    assert _archive(entries) == first
+    infos = zipfile.ZipFile(io.BytesIO(first)).infolist()
+    assert [info.filename for info in infos] == ["b.pdf", "a.pdf"]
+    assert {info.date_time for info in infos} == {ZIP_DATE_TIME}
+    assert {info.compress_type for info in infos} == {zipfile.ZIP_DEFLATED}
+    assert {info.external_attr >> 16 for info in infos} == {0o644}
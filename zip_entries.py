@@ -0,0 +1,21 @@
+"""
+Entrées ZIP reproductibles, partagées par les générateurs du dépôt.
+
+Date et droits fixes : les mêmes fichiers dans le même ordre donnent une
+archive identique octet pour octet. Le module ne dépend que de la
+bibliothèque standard, pour qu'une archive sans attestation n'ait pas besoin
+du module `attestations_formation`.
+"""
+from __future__ import annotations
+
+import zipfile
+
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def write_zip_entry(archive: zipfile.ZipFile, name: str, data: bytes) -> None:
+    """Ajoute `data` sous `name` avec une date et des droits fixes."""
+    info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+    info.compress_type = archive.compression
+    info.external_attr = 0o644 << 16
+    archive.writestr(info, data)